@@ -0,0 +1,5 @@
+"""
+Benchmarks for the portfolio app; run from the repo root, e.g.
+
+    python -m benchmarks.bench_http_pool
+"""
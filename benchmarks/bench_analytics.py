@@ -0,0 +1,106 @@
+"""
+Per-event cost of analytics recording, against writing each event to SQLite
+
+- record: analytics.record() into the ring buffer, enabled and disabled,
+  from one thread and from --threads threads at once
+- allocations: net memory blocks left per event once the buffer has wrapped
+- flush: time to drain a full buffer into SQLite in one transaction
+- naive: one autocommitted INSERT per event (WAL, synchronous=NORMAL), i.e.
+  what logging every event as it happens would add to a rerun
+
+    python -m benchmarks.bench_analytics [--events 200000] [--threads 8] [--out results/analytics.json]
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.common import compare, write_results
+from portfolio import analytics
+
+
+def per_event_ns(events, fn):
+    start = time.perf_counter()
+    for _ in range(events):
+        fn(analytics.SECTION_VIEW, "Featured Projects", "5f0c7a3e-session")
+    return (time.perf_counter() - start) / events * 1e9
+
+
+def threaded_ns(events, threads, fn):
+    barrier = threading.Barrier(threads + 1)
+
+    def worker():
+        barrier.wait()
+        per_event_ns(events // threads, fn)
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    return (time.perf_counter() - start) / events * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=200000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--buffer", type=int, default=analytics.BUFFER_SIZE)
+    parser.add_argument("--out")
+    parser.add_argument("--compare")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        store = analytics.Store(os.path.join(directory, "analytics.db"))
+        # Never flushes on its own: the flush is timed separately below
+        recorder = analytics.Recorder(store, size=args.buffer, interval=3600)
+        analytics._recorder, analytics.ENABLED = recorder, True
+
+        per_event_ns(args.buffer, analytics.record)  # wrap the buffer once
+        results["record_ns"] = round(per_event_ns(args.events, analytics.record), 1)
+        results["record_threaded_ns"] = round(threaded_ns(args.events, args.threads, analytics.record), 1)
+
+        blocks = sys.getallocatedblocks()
+        per_event_ns(args.events, analytics.record)
+        results["blocks_per_event"] = round((sys.getallocatedblocks() - blocks) / args.events, 4)
+
+        recorder.buffer.drain()
+        per_event_ns(args.buffer, analytics.record)
+        start = time.perf_counter()
+        flushed = recorder.flush()
+        results["flush_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        results["flush_events"] = flushed
+        results["flush_ns_per_event"] = round((time.perf_counter() - start) / max(flushed, 1) * 1e9, 1)
+
+        analytics.ENABLED = False
+        results["disabled_ns"] = round(per_event_ns(args.events, analytics.record), 1)
+
+        db = sqlite3.connect(os.path.join(directory, "naive.db"), isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.executescript(analytics.SCHEMA)
+
+        def naive(kind, name, session):
+            db.execute("INSERT INTO events (at, kind, name, session) VALUES (?, ?, ?, ?)",
+                       (time.time(), kind, name, session))
+
+        results["naive_sqlite_ns"] = round(per_event_ns(min(args.events, 20000), naive), 1)
+        db.close()
+        store.close()
+
+    data = write_results(args.out, "analytics", {k: v for k, v in vars(args).items() if k not in ("out", "compare")},
+                         results)
+    print(json.dumps(results, indent=2))
+    if args.compare:
+        compare(args.compare, data)
+
+
+if __name__ == "__main__":
+    main()
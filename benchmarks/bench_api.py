@@ -0,0 +1,89 @@
+"""
+Concurrent POST /contact load against the async contact API
+
+Runs the ASGI app under uvicorn with a throwaway outbox and a local stub
+webhook, then keeps --concurrency keep-alive connections busy for
+--seconds.
+
+    python -m benchmarks.bench_api [--concurrency 50] [--seconds 5]
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+
+from benchmarks.stub_webhook import StubWebhook
+
+BODY = json.dumps({
+    "name": "Ada Lovelace", "email": "ada@example.com", "subject": "Job Opportunity", "message": "Hello! " * 40,
+}).encode()
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def client(port, stop, timings, statuses):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    request = (
+        f"POST /contact HTTP/1.1\r\nHost: 127.0.0.1\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(BODY)}\r\n\r\n"
+    ).encode() + BODY
+    while time.perf_counter() < stop:
+        start = time.perf_counter()
+        writer.write(request)
+        status_line = await reader.readline()
+        length = 0
+        while (line := await reader.readline()) != b"\r\n":
+            if line.lower().startswith(b"content-length:"):
+                length = int(line.split(b":")[1])
+        await reader.readexactly(length)
+        timings.append((time.perf_counter() - start) * 1000)
+        statuses[int(status_line.split()[1])] = statuses.get(int(status_line.split()[1]), 0) + 1
+    writer.close()
+
+
+async def load(port, concurrency, seconds):
+    timings, statuses = [], {}
+    stop = time.perf_counter() + seconds
+    await asyncio.gather(*(client(port, stop, timings, statuses) for _ in range(concurrency)))
+    return timings, statuses
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory, StubWebhook() as stub:
+        os.environ["OUTBOX_PATH"] = os.path.join(directory, "outbox.db")
+        os.environ["DISCORD_WEBHOOK_URL"] = stub.url
+        # Every request comes from one address with the same body; measure the
+        # accept path rather than the abuse shield turning them away
+        os.environ.update(SHIELD_CLIENT_LIMIT="0", SHIELD_DUPLICATE_SECONDS="0")
+        import uvicorn
+        from portfolio.api import app
+
+        port = free_port()
+        server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+        threading.Thread(target=server.run, daemon=True).start()
+        while not server.started:
+            time.sleep(0.05)
+
+        timings, statuses = asyncio.run(load(port, args.concurrency, args.seconds))
+        server.should_exit = True
+        timings.sort()
+        print(f"{len(timings) / args.seconds:7.0f} req/s  p50 {timings[len(timings) // 2]:6.2f} ms  "
+              f"p99 {timings[int(len(timings) * 0.99)]:6.2f} ms  statuses {statuses}  "
+              f"stub posts so far {stub.stats['requests']}")
+
+
+if __name__ == "__main__":
+    main()
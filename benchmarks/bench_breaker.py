@@ -0,0 +1,43 @@
+"""
+Delivery latency while Discord is down, with the circuit breaker opening
+
+The stub answers every post with 500 after --latency seconds. The first
+deliveries pay for the embed + plain attempts; once the breaker opens they
+fail in microseconds until the reset timeout lets a probe through.
+
+    python -m benchmarks.bench_breaker [--latency 0.5] [--messages 12]
+"""
+import argparse
+import json
+import os
+import time
+
+from benchmarks.stub_webhook import StubWebhook
+from portfolio.contact import Submission
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--messages", type=int, default=12)
+    args = parser.parse_args()
+
+    with StubWebhook(latency=args.latency, error_rate=1.0) as stub:
+        os.environ["DISCORD_WEBHOOK_URL"] = stub.url
+        from portfolio.resilience import get_breaker
+        from portfolio.sinks import build_sink
+
+        sink = build_sink("discord")
+        breaker = get_breaker("discord")
+        for i in range(args.messages):
+            submission = Submission(f"Visitor {i}", f"visitor{i}@example.com", "General Inquiry", "Hello!")
+            start = time.perf_counter()
+            success, msg = sink.send(submission)
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"#{i:<3} {breaker.state:<9} {elapsed:9.3f} ms  {msg[:70]}")
+        print(f"stub posts: {stub.stats['requests']}")
+        print(json.dumps(breaker.snapshot(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
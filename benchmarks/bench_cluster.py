@@ -0,0 +1,241 @@
+"""
+Horizontal scaling: page reruns per second by replica count, and shared state
+
+throughput: for each replica count in --workers, `python -m portfolio.cluster`
+is started and --viewers websocket sessions rerun the script through the
+sticky proxy for --seconds. Scaling is reruns/s against the one-replica run
+times the replica count; it can only be near-linear with that many free
+cores (this host has os.cpu_count() of them, recorded in the results).
+
+shared: --processes processes hit the same limits at once, in memory (each
+process its own) and through one SHARED_STATE_PATH file:
+
+- shield: every process submits for one client address with a client
+  limit of 5; in memory lets 5 per process through, shared lets 5 in total
+- rate limit: every process posts as fast as a 5-per-2-seconds bucket lets
+  it for 3 seconds
+- outbox: every process claims rows from one 500-row outbox until it's
+  empty; no row may be claimed twice
+
+forwarding: requests through StickyProxy to a keep-alive backend that
+records each request's X-Forwarded-For must arrive with only the caller's
+address (what the per-client shield limit keys on behind the proxy):
+without one, with a forged one, and with a forged second request sent on
+the same connection.
+
+    python -m benchmarks.bench_cluster [--workers 1,2,4] [--viewers 16] [--seconds 10]
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from datetime import datetime
+
+from benchmarks.bench_sessions import ws_run
+from benchmarks.common import ROOT, compare, free_port, summarize, write_results
+from portfolio.contact import Submission
+
+LIMIT = 5
+
+
+# throughput
+
+async def viewer(url, stop, timings):
+    import websockets
+
+    async with websockets.connect(url, max_size=None) as ws:
+        await ws_run(ws)
+        while time.perf_counter() < stop:
+            elapsed, _, _ = await ws_run(ws)
+            timings.append(elapsed)
+
+
+async def load(port, viewers, seconds):
+    url = f"ws://127.0.0.1:{port}/_stcore/stream"
+    timings = []
+    stop = time.perf_counter() + seconds
+    await asyncio.gather(*(viewer(url, stop, timings) for _ in range(viewers)))
+    return timings
+
+
+def throughput(workers, viewers, seconds, directory):
+    port, base = free_port(), free_port()
+    env = dict(os.environ, REPO_METADATA="0", ANALYTICS_ENABLED="0", SHARED_STATE_PATH=os.path.join(directory, "shared.db"),
+               OUTBOX_PATH=os.path.join(directory, "outbox.db"))
+    cluster = subprocess.Popen(
+        [sys.executable, "-m", "portfolio.cluster", "--workers", str(workers), "--port", str(port),
+         "--base-port", str(base)],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        for _ in range(600):
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1)
+                break
+            except OSError:
+                time.sleep(0.1)
+        # One pass per replica first, so imports and caches aren't measured
+        asyncio.run(load(port, workers, 0))
+        timings = asyncio.run(load(port, viewers, seconds))
+    finally:
+        cluster.terminate()
+        cluster.wait()
+    return {"reruns_per_second": round(len(timings) / seconds, 1), "rerun_ms": summarize(timings)}
+
+
+# shared state
+
+def shield_worker(path, submissions, results):
+    from portfolio.shared import SharedState
+    from portfolio.shield import Shield, SharedShield
+
+    shield = SharedShield(SharedState(path), client_limit=LIMIT) if path else Shield(client_limit=LIMIT)
+    allowed = 0
+    for i in range(submissions):
+        submission = Submission("Ada", "ada@example.com", "Other", f"message {os.getpid()} {i}", datetime.now())
+        allowed += shield.check(submission, client="203.0.113.7") is None
+    results.put(allowed)
+
+
+def limiter_worker(path, seconds, results):
+    from portfolio.ratelimit import SharedRateLimiter, WebhookRateLimiter
+    from portfolio.shared import SharedState
+
+    if path:
+        limiter = SharedRateLimiter("bench", SharedState(path), burst=LIMIT, window=2.0)
+    else:
+        limiter = WebhookRateLimiter(burst=LIMIT, window=2.0)
+    stop, sent = time.monotonic() + seconds, 0
+    while limiter.acquire(timeout=stop - time.monotonic()) is not None:
+        sent += 1
+    results.put(sent)
+
+
+def claim_worker(path, results):
+    from portfolio.outbox import Outbox
+
+    outbox, claimed = Outbox(path), []
+    while True:
+        rows = outbox.claim(10)
+        if not rows:
+            break
+        claimed.extend(row_id for row_id, _ in rows)
+    results.put(claimed)
+
+
+def fan_out(target, processes, *args):
+    results = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=target, args=(*args, results)) for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    values = [results.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+    return values
+
+
+def shared(processes, directory):
+    from portfolio.outbox import Outbox
+
+    results = {}
+    for mode in ("memory", "shared"):
+        path = os.path.join(directory, f"{mode}-state.db") if mode == "shared" else ""
+        results[mode] = {
+            "shield_allowed": sum(fan_out(shield_worker, processes, path, 20)),
+            "rate_limited_posts": sum(fan_out(limiter_worker, processes, path, 3.0)),
+        }
+    results["limits"] = {"shield_allowed": LIMIT, "rate_limited_posts": LIMIT + int(3.0 * LIMIT / 2.0)}
+
+    path = os.path.join(directory, "claim-outbox.db")
+    outbox = Outbox(path)
+    for i in range(500):
+        outbox.add(Submission("Ada", "ada@example.com", "Other", f"message {i}", datetime.now()))
+    outbox.close()
+    claimed = [row for rows in fan_out(claim_worker, processes, path) for row in rows]
+    results["outbox"] = {"rows": 500, "claimed": len(claimed), "claimed_twice": len(claimed) - len(set(claimed))}
+    return results
+
+
+# forwarding
+
+async def _record_heads(seen, reader, writer):
+    # Keep-alive like a replica, until a request asks to close
+    try:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            forwarded = [line.partition(b":")[2].strip().decode() for line in head.split(b"\r\n")
+                         if line.lower().startswith(b"x-forwarded-for:")]
+            seen.append(", ".join(forwarded) or None)
+            writer.write(b"HTTP/1.1 204 No Content\r\n\r\n")
+            await writer.drain()
+            if b"connection: close" in head.lower():
+                break
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    writer.close()
+
+
+async def _send(port, *requests):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(b"".join(b"GET / HTTP/1.1\r\nHost: x\r\n" + headers + b"\r\n" for headers in requests))
+    await writer.drain()
+    await reader.read()
+    writer.close()
+
+
+async def _forwarding():
+    from portfolio.cluster import StickyProxy
+
+    seen = []
+    backend = await asyncio.start_server(lambda r, w: _record_heads(seen, r, w), "127.0.0.1", 0)
+    proxy = await asyncio.start_server(StickyProxy([backend.sockets[0].getsockname()]).handle, "127.0.0.1", 0)
+    port = proxy.sockets[0].getsockname()[1]
+    forged = b"X-Forwarded-For: 203.0.113.7\r\n"
+    results = {}
+    async with backend, proxy:
+        for name, requests in (("plain", [b""]), ("forged", [forged]), ("keep_alive", [b"", forged])):
+            seen.clear()
+            await _send(port, *requests)
+            results[name] = list(seen)
+    return results
+
+
+def forwarding():
+    return asyncio.run(_forwarding())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--viewers", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--out")
+    parser.add_argument("--compare")
+    args = parser.parse_args()
+
+    results = {"cpu_count": os.cpu_count(), "throughput": {}}
+    with tempfile.TemporaryDirectory() as directory:
+        for workers in map(int, args.workers.split(",")):
+            results["throughput"][workers] = throughput(workers, args.viewers, args.seconds, directory)
+        single = results["throughput"][min(results["throughput"])]["reruns_per_second"]
+        for workers, run in results["throughput"].items():
+            run["scaling"] = round(run["reruns_per_second"] / (single * workers), 2) if single else None
+        results["shared"] = shared(args.processes, directory)
+    results["forwarding"] = forwarding()
+
+    data = write_results(args.out, "cluster", {k: v for k, v in vars(args).items() if k not in ("out", "compare")},
+                         results)
+    print(json.dumps(results, indent=2))
+    if args.compare:
+        compare(args.compare, data)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Webhook posts needed to deliver a burst of submissions, per message vs digest mode
+
+    python -m benchmarks.bench_digest [--messages 50] [--limit 5/2]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.stub_webhook import StubWebhook
+from portfolio import config
+from portfolio.contact import Submission
+
+
+def run(stub, messages, digest):
+    # Imported late so DISCORD_WEBHOOK_URL points at the stub
+    from portfolio.delivery import DeliveryWorker
+    from portfolio.outbox import Outbox
+    from portfolio.ratelimit import get_rate_limiter
+
+    with tempfile.TemporaryDirectory() as directory:
+        outbox = Outbox(os.path.join(directory, "outbox.db"))
+        for i in range(messages):
+            outbox.add(Submission(f"Visitor {i}", f"visitor{i}@example.com", "General Inquiry", "Hello! " * 40))
+        worker = DeliveryWorker(outbox, digest=digest)
+        start = time.perf_counter()
+        worker.drain()
+        elapsed = time.perf_counter() - start
+        outbox.close()
+    limiter = get_rate_limiter(stub.url).snapshot()
+    print(f"{'digest' if digest else 'per message':<12} delivered {worker.stats['delivered']:3d}  "
+          f"posts {stub.stats['requests']:3d}  held for rate limit {limiter['waits']:3d}x  "
+          f"429s {stub.stats['rejected']:2d}  {elapsed:6.2f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=50)
+    parser.add_argument("--limit", default="5/2", help="stub rate limit LIMIT/SECONDS")
+    args = parser.parse_args()
+    limit, window = args.limit.split("/")
+
+    for digest in (False, True):
+        with StubWebhook(rate_limit=(int(limit), float(window))) as stub:
+            os.environ["DISCORD_WEBHOOK_URL"] = stub.url
+            config.reload()
+            run(stub, args.messages, digest)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Delivery latency with one slow sink: sequential chain vs concurrent fan-out
+
+Discord is a stub that answers after --slow seconds; the generic webhook and
+SMTP relay answer at once.
+
+    python -m benchmarks.bench_fanout [--slow 2] [--messages 5]
+"""
+import argparse
+import os
+import time
+
+from benchmarks.stub_smtp import StubSmtp
+from benchmarks.stub_webhook import StubWebhook
+from portfolio.contact import Submission
+
+
+def timed(label, notify, messages):
+    timings, delivered = [], 0
+    for i in range(messages):
+        submission = Submission(f"Visitor {i}", f"visitor{i}@example.com", "General Inquiry", "Hello!")
+        start = time.perf_counter()
+        success, _ = notify(submission)
+        timings.append(time.perf_counter() - start)
+        delivered += success
+    print(f"{label:<28} delivered {delivered}/{messages}  mean {sum(timings) / messages * 1000:8.1f} ms  "
+          f"max {max(timings) * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--slow", type=float, default=2.0, help="seconds the Discord stub takes to answer")
+    parser.add_argument("--messages", type=int, default=5)
+    args = parser.parse_args()
+
+    with StubWebhook(latency=args.slow) as discord, StubWebhook() as webhook, StubSmtp() as smtp:
+        os.environ["DISCORD_WEBHOOK_URL"] = discord.url
+        from portfolio.sinks import DiscordEmbedSink, DiscordPlainSink, FallbackSink, Notifier, SmtpSink, WebhookSink
+
+        sinks = [
+            FallbackSink(DiscordEmbedSink(), DiscordPlainSink(), name="discord"),
+            WebhookSink(webhook.url),
+            SmtpSink("127.0.0.1", smtp.port),
+        ]
+
+        def sequential(submission):
+            # The old chain: each sink only after the previous one has answered
+            for sink in sinks:
+                success, msg = sink.send(submission)
+                if success:
+                    return success, msg
+            return False, msg
+
+        timed("sequential", sequential, args.messages)
+        timed("fan-out first_success", Notifier(sinks, "first_success").notify, args.messages)
+        timed("fan-out all", Notifier(sinks, "all").notify, args.messages)
+        time.sleep(args.slow)
+        print(f"stub traffic: discord {discord.stats['requests']}  webhook {webhook.stats['requests']}  "
+              f"smtp {len(smtp.messages)}")
+
+
+if __name__ == "__main__":
+    main()
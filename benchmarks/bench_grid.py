@@ -0,0 +1,99 @@
+"""
+Project grid cost as the catalogue grows: whole section vs paged window
+
+For each catalogue size in --sizes, the real projects are repeated (with
+distinct titles) up to that many, and:
+
+- section: render_section over every project, as the grid used to,
+  cached (what a rerun costs) and the HTML it sends
+- window: render_window for the first page plus prefetch, from cached
+  cards, and the HTML it sends
+- app: a full headless run of app.py with that catalogue, then reruns,
+  and the markdown bytes the page carries
+
+    python -m benchmarks.bench_grid [--sizes 8,200,2000] [--out results/grid.json]
+"""
+import argparse
+import dataclasses
+import json
+import os
+import time
+
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.common import compare, summarize, write_results
+from portfolio import content as content_module
+from portfolio import render, repos
+from portfolio.content import load_content
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def catalogue(size):
+    base = load_content().projects
+    return tuple(
+        dataclasses.replace(base[i % len(base)], slug=f"p{i}", title=f"{base[i % len(base)].title} #{i}")
+        for i in range(size)
+    )
+
+
+def timed_ms(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return summarize(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="8,200,2000")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--reruns", type=int, default=10)
+    parser.add_argument("--out")
+    parser.add_argument("--compare")
+    args = parser.parse_args()
+
+    # Rendering only; the metadata cache has its own benchmark
+    repos.ENABLED = False
+    original = content_module.PORTFOLIO
+    results = {}
+    for size in map(int, args.sizes.split(",")):
+        projects = catalogue(size)
+        page = render.PAGE_SIZE
+        results[size] = {
+            "section": dict(timed_ms(lambda: render.render_section("projects", projects), args.repeat),
+                            bytes=len(render.render_section("projects", projects))),
+            "window": dict(timed_ms(lambda: render.render_window("projects", projects[:2 * page], page), args.repeat),
+                           bytes=len(render.render_window("projects", projects[:2 * page], page))),
+        }
+
+        content_module.PORTFOLIO = dataclasses.replace(original, projects=projects)
+        try:
+            start = time.perf_counter()
+            at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=120).run()
+            first_ms = (time.perf_counter() - start) * 1000
+            reruns = []
+            for _ in range(args.reruns):
+                start = time.perf_counter()
+                at.run()
+                reruns.append((time.perf_counter() - start) * 1000)
+            results[size]["app"] = {
+                "first_run_ms": round(first_ms, 1),
+                "rerun_ms": summarize(reruns),
+                "page_bytes": sum(len(element.value) for element in at.markdown),
+                "cards": sum(element.value.count("data-project") for element in at.markdown),
+            }
+        finally:
+            content_module.PORTFOLIO = original
+
+    data = write_results(args.out, "grid", {k: v for k, v in vars(args).items() if k not in ("out", "compare")},
+                         results)
+    print(json.dumps(results, indent=2))
+    if args.compare:
+        compare(args.compare, data)
+
+
+if __name__ == "__main__":
+    main()
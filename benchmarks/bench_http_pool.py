@@ -0,0 +1,57 @@
+"""
+Fresh requests.post vs the shared pooled session against a local stub webhook
+
+    python -m benchmarks.bench_http_pool [--requests 200] [--no-tls]
+"""
+import argparse
+import shutil
+import statistics
+import time
+import warnings
+
+import requests
+import urllib3
+
+from benchmarks.stub_webhook import StubWebhook
+from portfolio.http import build_session
+
+PAYLOAD = {"username": "Portfolio Bot", "content": "benchmark"}
+
+
+def run(post, url, count):
+    timings = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = post(url, json=PAYLOAD, verify=False)
+        timings.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 204, response.status_code
+    timings.sort()
+    return {
+        "mean_ms": statistics.mean(timings),
+        "p50_ms": timings[len(timings) // 2],
+        "p99_ms": timings[int(len(timings) * 0.99) - 1],
+    }
+
+
+def report(label, result, stub):
+    print(f"{label:<22} mean {result['mean_ms']:7.2f} ms  p50 {result['p50_ms']:7.2f} ms  "
+          f"p99 {result['p99_ms']:7.2f} ms  connections {stub.stats['connections']}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--no-tls", action="store_true", help="plain HTTP (no handshake cost to remove)")
+    args = parser.parse_args()
+    tls = not args.no_tls and shutil.which("openssl") is not None
+    warnings.simplefilter("ignore", urllib3.exceptions.InsecureRequestWarning)
+
+    print(f"{args.requests} posts over {'HTTPS' if tls else 'HTTP'}")
+    with StubWebhook(tls=tls) as stub:
+        report("requests.post", run(requests.post, stub.url, args.requests), stub)
+    with StubWebhook(tls=tls) as stub:
+        report("pooled session", run(build_session().post, stub.url, args.requests), stub)
+
+
+if __name__ == "__main__":
+    main()
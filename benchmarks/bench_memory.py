@@ -0,0 +1,275 @@
+"""
+Memory per session: server RSS and live allocations, attributed to app.py
+
+`streamlit run app.py` is started twice (this script, run with --serve, is
+the server), once plain and once under tracemalloc. Each time, after
+--warmup sessions have run the page and closed, --sessions more websocket
+sessions connect, run the page, and stay open. Between those two points,
+per open session:
+
+- rss_kib: growth of the plain server's resident set
+- traced_kib: growth of what tracemalloc sees allocated, from snapshots
+  the traced server takes after a full collection
+- sections: traced_kib by where it was allocated. Anything allocated while
+  app.py was on the stack counts against the metrics.section() block (or
+  the fragment called from one) that was running. "runtime" is everything
+  else, mostly Streamlit's per-session objects, with its largest modules
+  listed under "runtime_modules"
+
+--budget-kib makes the run fail (exit status 1) when rss_kib or traced_kib
+is over it. --tolerance does the same against the run given to --compare,
+failing when traced_kib grows by more than that percentage (rss_kib is too
+noisy for that).
+
+    python -m benchmarks.bench_memory [--sessions 50] [--budget-kib 100] [--out results/memory.json]
+"""
+import argparse
+import ast
+import asyncio
+import collections
+import gc
+import json
+import os
+import signal
+import subprocess
+import sys
+import sysconfig
+import tempfile
+import time
+import tracemalloc
+import urllib.request
+
+from benchmarks.bench_sessions import ws_run
+from benchmarks.common import ROOT, compare, free_port, rss_kib, write_results
+
+APP = os.path.join(ROOT, "app.py")
+BUDGETED = ("rss_kib", "traced_kib")
+# RSS moves with the allocator's arenas from run to run; only traced bytes are steady enough for a percentage
+COMPARED = ("traced_kib",)
+
+
+# server side
+
+def serve(port, snapshot, frames):
+    """
+    Run app.py, under tracemalloc when frames > 0; each SIGUSR1 writes snapshot.N (N = 0, 1, ...)
+    """
+    if frames:
+        tracemalloc.start(frames)
+    taken = []
+
+    def dump(signum, frame):
+        gc.collect()
+        path = f"{snapshot}.{len(taken)}"
+        tracemalloc.take_snapshot().dump(path + ".tmp")
+        os.replace(path + ".tmp", path)
+        taken.append(path)
+
+    signal.signal(signal.SIGUSR1, dump)
+    from streamlit.web.cli import main
+
+    sys.argv = ["streamlit", "run", APP, "--server.headless", "true", "--server.port", str(port),
+                "--browser.gatherUsageStats", "false"]
+    main()
+
+
+def take_snapshot(server, path, timeout=120.0):
+    server.send_signal(signal.SIGUSR1)
+    deadline = time.monotonic() + timeout
+    while not os.path.exists(path):
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"no snapshot at {path}")
+        time.sleep(0.1)
+    return tracemalloc.Snapshot.load(path)
+
+
+# attribution
+
+def app_sections(path=APP):
+    """
+    (first line, last line, name) for every metrics.section() block in app.py
+
+    A function called from inside a section (the fragments) is attributed to
+    that section too, since a fragment rerun starts from its own body.
+    """
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    spans, calls = [], {}
+    for node in tree.body:
+        if not isinstance(node, ast.With):
+            continue
+        for item in node.items:
+            call = item.context_expr
+            if (isinstance(call, ast.Call) and isinstance(call.func, ast.Attribute)
+                    and call.func.attr == "section" and call.args and isinstance(call.args[0], ast.Constant)):
+                name = call.args[0].value
+                spans.append((node.lineno, node.end_lineno, name))
+                for inner in ast.walk(node):
+                    if isinstance(inner, ast.Call) and isinstance(inner.func, ast.Name):
+                        calls.setdefault(inner.func.id, name)
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and node.name in calls:
+            spans.append((node.lineno, node.end_lineno, calls[node.name]))
+    return spans
+
+
+def attribute(stat, spans):
+    """
+    (section, module): the app.py section running when stat's memory was allocated, or "runtime"
+    """
+    for frame in stat.traceback:
+        # Oldest frame first, so this is the outermost app.py line
+        if frame.filename == APP:
+            for first, last, name in spans:
+                if first <= frame.lineno <= last:
+                    return name, None
+            return "app.py (top level)", None
+    return "runtime", _module(stat.traceback[-1].filename)
+
+
+def _module(filename):
+    paths = sysconfig.get_paths()
+    for prefix in (ROOT, paths["purelib"], paths["stdlib"]):
+        if filename.startswith(prefix + os.sep):
+            return os.path.relpath(filename, prefix)
+    return filename
+
+
+def per_session(before, after, sessions, top=10):
+    spans = app_sections()
+    sections, modules = collections.Counter(), collections.Counter()
+    for stat in after.compare_to(before, "traceback"):
+        section, module = attribute(stat, spans)
+        sections[section] += stat.size_diff
+        if module:
+            modules[module] += stat.size_diff
+    return {
+        "traced_kib": round(sum(sections.values()) / sessions / 1024, 1),
+        "sections": {name: round(size / sessions / 1024, 2) for name, size in sections.most_common()},
+        "runtime_modules": {name: round(size / sessions / 1024, 2) for name, size in modules.most_common(top)},
+    }
+
+
+# load
+
+async def open_sessions(port, warmup, sessions, on_warm):
+    import websockets
+
+    url = f"ws://127.0.0.1:{port}/_stcore/stream"
+    for _ in range(warmup):
+        async with websockets.connect(url, max_size=None) as ws:
+            await ws_run(ws)
+    # Closed sessions are dropped asynchronously; let that finish
+    await asyncio.sleep(2)
+    on_warm()
+    connections = []
+    for _ in range(sessions):
+        ws = await websockets.connect(url, max_size=None)
+        await ws_run(ws)
+        connections.append(ws)
+    return connections
+
+
+def with_sessions(args, directory, frames, on_warm, on_open):
+    """
+    Start the server (traced when frames > 0), warm it up, open the sessions and call back around them
+    """
+    port, snapshot = free_port(), os.path.join(directory, f"snapshot-{frames}")
+    env = dict(os.environ, REPO_METADATA="0", ANALYTICS_ENABLED="0", OUTBOX_PATH=os.path.join(directory, "outbox.db"))
+    server = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.bench_memory", "--serve", "--port", str(port), "--snapshot", snapshot,
+         "--frames", str(frames)],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        for _ in range(1200):
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1)
+                break
+            except OSError:
+                time.sleep(0.1)
+        else:
+            raise TimeoutError("server did not come up")
+        loop = asyncio.new_event_loop()
+        try:
+            connections = loop.run_until_complete(
+                open_sessions(port, args.warmup, args.sessions, lambda: on_warm(server, snapshot)))
+            on_open(server, snapshot)
+            for ws in connections:
+                loop.run_until_complete(ws.close())
+        finally:
+            loop.close()
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def measure(args, directory):
+    # Resident set from an untraced server: tracemalloc's own records would dwarf a session
+    rss = []
+    with_sessions(args, directory, 0, lambda server, _: rss.append(rss_kib(server.pid)),
+                  lambda server, _: rss.append(rss_kib(server.pid)))
+    snapshots = []
+    with_sessions(args, directory, args.frames, lambda server, path: snapshots.append(take_snapshot(server, path + ".0")),
+                  lambda server, path: snapshots.append(take_snapshot(server, path + ".1")))
+    results = {"rss_kib": round((rss[1] - rss[0]) / args.sessions, 1)}
+    results.update(per_session(*snapshots, args.sessions))
+    return results
+
+
+# budget
+
+def over_budget(results, budget_kib, baseline=None, tolerance=None):
+    """
+    Messages for every figure over budget_kib, or over baseline by more than tolerance percent
+    """
+    failures = []
+    for key in BUDGETED:
+        if budget_kib and results[key] > budget_kib:
+            failures.append(f"{key} {results[key]} KiB per session is over the {budget_kib} KiB budget")
+    for key in COMPARED:
+        if baseline and tolerance is not None and baseline.get(key):
+            limit = baseline[key] * (1 + tolerance / 100)
+            if results[key] > limit:
+                failures.append(f"{key} {results[key]} KiB per session is more than {tolerance}% over "
+                                f"the baseline's {baseline[key]} KiB")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--frames", type=int, default=64, help="tracemalloc frames kept per allocation")
+    parser.add_argument("--budget-kib", type=float, help="fail when rss_kib or traced_kib per session is over this")
+    parser.add_argument("--tolerance", type=float, help="fail when traced_kib grows more than this %% over --compare")
+    parser.add_argument("--out")
+    parser.add_argument("--compare")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--snapshot", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        serve(args.port, args.snapshot, args.frames)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = measure(args, directory)
+
+    params = {k: v for k, v in vars(args).items() if k not in ("out", "compare", "serve", "port", "snapshot")}
+    data = write_results(args.out, "memory", params, results)
+    print(json.dumps(results, indent=2))
+    baseline = None
+    if args.compare:
+        compare(args.compare, data)
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+    failures = over_budget(results, args.budget_kib, baseline, args.tolerance)
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
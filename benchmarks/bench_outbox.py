@@ -0,0 +1,36 @@
+"""
+Latency of the contact form's single outbox INSERT
+
+    python -m benchmarks.bench_outbox [--inserts 5000]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from portfolio.contact import Submission
+from portfolio.outbox import Outbox
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--inserts", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        outbox = Outbox(os.path.join(directory, "outbox.db"))
+        submission = Submission("Ada Lovelace", "ada@example.com", "Job Opportunity", "Hello! " * 60)
+        timings = []
+        for _ in range(args.inserts):
+            start = time.perf_counter()
+            outbox.add(submission)
+            timings.append((time.perf_counter() - start) * 1e6)
+        outbox.close()
+
+    timings.sort()
+    print(f"{args.inserts} inserts: p50 {timings[len(timings) // 2]:.0f} us  "
+          f"p99 {timings[int(len(timings) * 0.99)]:.0f} us  max {timings[-1]:.0f} us")
+
+
+if __name__ == "__main__":
+    main()
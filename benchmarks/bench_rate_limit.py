@@ -0,0 +1,51 @@
+"""
+Burst of webhook posts against a rate-limited stub, with and without the limiter
+
+    python -m benchmarks.bench_rate_limit [--posts 30] [--threads 10]
+"""
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.stub_webhook import StubWebhook
+from portfolio.http import build_session
+from portfolio.ratelimit import WebhookRateLimiter
+
+PAYLOAD = {"username": "Portfolio Bot", "content": "benchmark"}
+
+
+def burst(post, posts, threads):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        statuses = list(pool.map(lambda _: post().status_code, range(posts)))
+    return statuses, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--posts", type=int, default=30)
+    parser.add_argument("--threads", type=int, default=10)
+    parser.add_argument("--limit", default="5/2", help="stub rate limit LIMIT/SECONDS")
+    args = parser.parse_args()
+    limit, window = args.limit.split("/")
+    rate_limit = (int(limit), float(window))
+
+    with StubWebhook(rate_limit=rate_limit) as stub:
+        session = build_session()
+        statuses, elapsed = burst(lambda: session.post(stub.url, json=PAYLOAD), args.posts, args.threads)
+        print(f"unscheduled  delivered {statuses.count(204):3d}/{args.posts}  "
+              f"429s {stub.stats['rejected']:3d}  {elapsed:6.2f} s")
+
+    with StubWebhook(rate_limit=rate_limit) as stub:
+        session = build_session()
+        limiter = WebhookRateLimiter(burst=rate_limit[0], window=rate_limit[1])
+        statuses, elapsed = burst(lambda: limiter.send(lambda: session.post(stub.url, json=PAYLOAD)),
+                                  args.posts, args.threads)
+        print(f"scheduled    delivered {statuses.count(204):3d}/{args.posts}  "
+              f"429s {stub.stats['rejected']:3d}  {elapsed:6.2f} s")
+        print(json.dumps(limiter.snapshot(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Content hot reload: one edited bullet against throwing every cache away
+
+In-process, with a CONTENT_PATH file of --projects projects (the real ones
+repeated) and every section rendered:
+
+- incremental: reload_content() after editing one bullet (read, diff,
+  invalidate, index update), then what a session's rerun renders
+- full: what a restart amounted to, minus the imports: read the file,
+  clear the fragment cache, rebuild the skill index, render again
+
+Over websockets: `streamlit run app.py` on the same file with --viewers
+open sessions; after the edit, the time until every session has rerun
+unprompted and received the new text.
+
+    python -m benchmarks.bench_reload [--projects 500] [--viewers 10] [--out results/reload.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from benchmarks.bench_sessions import ws_run
+from benchmarks.common import ROOT, compare, free_port, write_results
+from portfolio import content, render, skill_index
+
+SECTIONS = ("metrics", "experience", "projects", "skills", "education")
+
+
+def write_catalogue(path, projects):
+    data = content.to_data(content.PORTFOLIO)
+    base = data["projects"]
+    data["projects"] = [dict(base[i % len(base)], slug=f"p{i}", title=f"{base[i % len(base)]['title']} #{i}")
+                        for i in range(projects)]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    return data
+
+
+def edit(path, data, text):
+    # The first card, so it's on every session's first page
+    project = data["projects"][0]
+    project["bullets"] = [text, *project["bullets"][1:]]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+def render_page():
+    # What a session's rerun renders: every section, and the first page of projects
+    portfolio = content.load_content()
+    for kind in SECTIONS:
+        if kind == "projects":
+            render.render_window(kind, portfolio.projects[:2 * render.PAGE_SIZE], render.PAGE_SIZE)
+        else:
+            render.render_section(kind, getattr(portfolio, kind))
+
+
+def timed(function):
+    misses = render.fragment_cache.stats["misses"]
+    start = time.perf_counter()
+    function()
+    return {"ms": round((time.perf_counter() - start) * 1000, 2),
+            "renders": render.fragment_cache.stats["misses"] - misses}
+
+
+def in_process(path, data):
+    # Loaded by the app anyway; keep its import out of the first reload
+    import streamlit.runtime  # noqa: F401
+
+    content.CONTENT_PATH, content.WATCH_SECONDS = path, 0
+    render_page()
+    skill_index.get_skill_index()
+    results = {}
+
+    edit(path, data, "Edited once, reloaded incrementally")
+
+    def incremental():
+        content.reload_content()
+        skill_index.get_skill_index()
+        render_page()
+
+    results["incremental"] = timed(incremental)
+
+    def full():
+        render.fragment_cache.clear()
+        content.content_hash.cache_clear()
+        content.read_content(path)
+        skill_index.build_index(content.load_content())
+        render_page()
+
+    results["full"] = timed(full)
+    return results
+
+
+async def sessions(port, viewers, path, data):
+    import websockets
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+    url = f"ws://127.0.0.1:{port}/_stcore/stream"
+    connections = [await websockets.connect(url, max_size=None) for _ in range(viewers)]
+    for ws in connections:
+        await ws_run(ws)
+    text = f"Pushed edit {time.time()}"
+
+    async def updated(ws):
+        seen = False
+        while True:
+            forward = ForwardMsg()
+            forward.ParseFromString(await ws.recv())
+            seen = seen or text.encode() in forward.SerializeToString()
+            if forward.WhichOneof("type") == "script_finished":
+                return seen, (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    edit(path, data, text)
+    results = await asyncio.wait_for(asyncio.gather(*(updated(ws) for ws in connections)), 30)
+    for ws in connections:
+        await ws.close()
+    return {
+        "sessions_updated": sum(seen for seen, _ in results),
+        "last_update_ms": round(max(elapsed for _, elapsed in results), 1),
+    }
+
+
+def over_websockets(path, data, viewers, watch_seconds):
+    port = free_port()
+    env = dict(os.environ, CONTENT_PATH=path, CONTENT_WATCH_SECONDS=str(watch_seconds), REPO_METADATA="0")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", os.path.join(ROOT, "app.py"), "--server.headless", "true",
+         "--server.port", str(port), "--browser.gatherUsageStats", "false"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        for _ in range(200):
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1)
+                break
+            except OSError:
+                time.sleep(0.1)
+        result = asyncio.run(sessions(port, viewers, path, data))
+        result["watch_seconds"] = watch_seconds
+        return result
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=500)
+    parser.add_argument("--viewers", type=int, default=10)
+    parser.add_argument("--watch-seconds", type=float, default=0.5)
+    parser.add_argument("--out")
+    parser.add_argument("--compare")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "content.json")
+        data = write_catalogue(path, args.projects)
+        results = in_process(path, data)
+        data = write_catalogue(path, args.projects)
+        results["push"] = over_websockets(path, data, args.viewers, args.watch_seconds)
+
+    data = write_results(args.out, "reload", {k: v for k, v in vars(args).items() if k not in ("out", "compare")},
+                         results)
+    print(json.dumps(results, indent=2))
+    if args.compare:
+        compare(args.compare, data)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Repository metadata cache against a slow local GitHub stub
+
+- render: enrich() + render_section("projects") while the upstream takes
+  --latency seconds per call, cold and warm, against fetching inline
+- single flight: --threads renders at once on a cold cache; upstream
+  requests per repository should stay at 1
+- revalidate: once entries go stale, renders keep serving them and each
+  repository is refreshed once (a 304 thanks to its ETag)
+- outage: every upstream call fails; renders stay fast and retries are
+  spaced by the retry interval
+
+    python -m benchmarks.bench_repos [--latency 0.5] [--threads 32] [--out results/repos.json]
+"""
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import compare, summarize, write_results
+from benchmarks.stub_github import StubGitHub
+from portfolio import render, repos
+from portfolio.content import load_content
+
+
+def render_ms(projects):
+    start = time.perf_counter()
+    render.render_section("projects", repos.enrich(projects))
+    return (time.perf_counter() - start) * 1000
+
+
+def settle(cache, timeout=30):
+    deadline = time.monotonic() + timeout
+    while cache.snapshot()["inflight"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--renders", type=int, default=200)
+    parser.add_argument("--out")
+    parser.add_argument("--compare")
+    args = parser.parse_args()
+
+    projects = load_content().projects
+    keys = [key for key in map(repos.repo_key, (p.url for p in projects)) if key]
+    results = {}
+    repos.ENABLED = True
+
+    with StubGitHub(latency=args.latency) as stub:
+        fetcher = repos.GitHubFetcher(stub.url)
+        start = time.perf_counter()
+        for key in keys:
+            fetcher(key)
+        results["inline_fetch_render_ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+        # Cold: the first render finds nothing and must not wait for the fetches it starts
+        repos._cache = cache = repos.StaleWhileRevalidateCache(repos.GitHubFetcher(stub.url), fresh=2.0, stale=60.0)
+        results["cold_render_ms"] = round(render_ms(projects), 3)
+        settle(cache)
+        results["warm_render_ms"] = summarize([render_ms(projects) for _ in range(args.renders)])
+
+    with StubGitHub(latency=args.latency) as stub:
+        repos._cache = cache = repos.StaleWhileRevalidateCache(repos.GitHubFetcher(stub.url), fresh=2.0, stale=60.0)
+        with ThreadPoolExecutor(args.threads) as pool:
+            timings = list(pool.map(lambda _: render_ms(projects), range(args.threads)))
+        settle(cache)
+        results["single_flight"] = {
+            "concurrent_render_ms": summarize(timings),
+            "upstream_requests": stub.stats["requests"],
+            "max_requests_per_repo": max(stub.requests_by_repo.values()),
+        }
+
+        time.sleep(2.1)  # every entry is now stale
+        before = dict(stub.stats)
+        with ThreadPoolExecutor(args.threads) as pool:
+            timings = list(pool.map(lambda _: render_ms(projects), range(args.threads)))
+        stale_served = cache.snapshot()["stale"]
+        settle(cache)
+        results["revalidate"] = {
+            "stale_render_ms": summarize(timings),
+            "stale_served": stale_served,
+            "upstream_requests": stub.stats["requests"] - before["requests"],
+            "not_modified": stub.stats["not_modified"] - before["not_modified"],
+        }
+
+    with StubGitHub(latency=args.latency, error_rate=1.0) as stub:
+        repos._cache = cache = repos.StaleWhileRevalidateCache(repos.GitHubFetcher(stub.url), retry=1.0)
+        timings = []
+        stop = time.monotonic() + 3
+        while time.monotonic() < stop:
+            timings.append(render_ms(projects))
+            time.sleep(0.01)
+        settle(cache)
+        results["outage"] = {
+            "render_ms": summarize(timings),
+            "upstream_requests": stub.stats["requests"],
+            "errors": cache.snapshot()["errors"],
+        }
+
+    data = write_results(args.out, "repos", {k: v for k, v in vars(args).items() if k not in ("out", "compare")},
+                         results)
+    print(json.dumps(results, indent=2))
+    if args.compare:
+        compare(args.compare, data)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Script run time of app.py under Streamlit's headless AppTest
+
+    python -m benchmarks.bench_rerun [--runs 30] [--script path/to/app.py]
+
+Pass an older copy of app.py (e.g. `git show HEAD~1:app.py > /tmp/app_old.py`)
+as --script to get a before/after comparison.
+"""
+import argparse
+import os
+import statistics
+import time
+
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(script, runs):
+    at = AppTest.from_file(os.path.abspath(script), default_timeout=60)
+    at.run()  # first run imports modules and warms caches
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        at.run()
+        timings.append((time.perf_counter() - start) * 1000)
+    if at.exception:
+        raise SystemExit(f"{script} raised: {at.exception[0].message}")
+    timings.sort()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--script", action="append", help="script(s) to time (default: app.py)")
+    args = parser.parse_args()
+    os.environ.setdefault("DISCORD_WEBHOOK_URL", "http://127.0.0.1:9/stub")
+
+    for script in args.script or [os.path.join(ROOT, "app.py")]:
+        timings = measure(script, args.runs)
+        print(f"{script}: rerun mean {statistics.mean(timings):6.1f} ms  p50 {timings[len(timings) // 2]:6.1f} ms  "
+              f"p99 {timings[int(len(timings) * 0.99) - 1]:6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Resume PDF serving: full downloads, ranges and revalidations
+
+Serves a generated PDF of --size-kib through portfolio.resume and times
+--requests sequential keep-alive requests of each kind, with the bytes on
+the wire per request:
+
+- full: a plain GET, identity and then gzip (the browser's first open)
+- range: a --chunk-kib Range request, as a PDF viewer makes while paging
+- revalidate: If-None-Match with the ETag from the first response (304)
+- naive: the same full GET from a handler that re-reads the file each time
+
+    python -m benchmarks.bench_resume [--size-kib 512] [--requests 500] [--out results/resume.json]
+"""
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from benchmarks.common import compare, summarize, write_results
+from portfolio import resume
+
+
+def make_pdf(path, size):
+    # Half random (like embedded fonts and images), half repetitive text streams
+    with open(path, "wb") as f:
+        f.write(b"%PDF-1.4\n")
+        f.write(os.urandom(size // 2))
+        text = b"BT /F1 11 Tf 72 720 Td (Data scientist and machine learning engineer) Tj ET\n"
+        f.write((text * (size // 2 // len(text) + 1))[:size - size // 2 - 15])
+        f.write(b"\n%%EOF\n")
+
+
+def serve(handler):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/resume.pdf"
+
+
+def mapped_handler(resume_file):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            resume.send(self, resume_file)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def naive_handler(path):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            with open(path, "rb") as f:
+                body = f.read()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/pdf")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def run(url, count, headers=None):
+    session = requests.Session()
+    timings, transferred = [], 0
+    for _ in range(count):
+        start = time.perf_counter()
+        response = session.get(url, headers=headers or {})
+        timings.append((time.perf_counter() - start) * 1000)
+        transferred += int(response.headers.get("Content-Length", 0))
+    result = summarize(timings)
+    result["status"] = response.status_code
+    result["bytes_per_request"] = transferred // count
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-kib", type=int, default=512)
+    parser.add_argument("--chunk-kib", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--out")
+    parser.add_argument("--compare")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "resume.pdf")
+        make_pdf(path, args.size_kib * 1024)
+        start = time.perf_counter()
+        resume_file = resume.ResumeFile(path)
+        results["load_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        results["variants"] = {encoding: len(data) for encoding, data in resume_file.variants.items()}
+
+        server, url = serve(mapped_handler(resume_file))
+        results["full"] = run(url, args.requests, {"Accept-Encoding": "identity"})
+        results["full_compressed"] = run(url, args.requests)
+        chunk = args.chunk_kib * 1024
+        results["range"] = run(url, args.requests, {"Range": f"bytes={chunk}-{2 * chunk - 1}"})
+        results["revalidate"] = run(url, args.requests, {"If-None-Match": resume_file.etag})
+        server.shutdown()
+
+        server, url = serve(naive_handler(path))
+        results["naive"] = run(url, args.requests)
+        server.shutdown()
+
+    data = write_results(args.out, "resume", {k: v for k, v in vars(args).items() if k not in ("out", "compare")},
+                         results)
+    print(json.dumps(results, indent=2))
+    if args.compare:
+        compare(args.compare, data)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""
+Concurrent viewers and form submissions against the real app
+
+websocket mode starts `streamlit run app.py` and drives it the way browsers
+do: each viewer opens the session websocket, runs the script and reruns it;
+some viewers also submit the contact form. CPU and RSS are read from the
+server process. apptest mode runs the same load in-process through
+Streamlit's headless AppTest (no server or websocket), one session at a time.
+
+Discord is a local stub with configurable latency, 500 and 429 injection.
+Results are printed and saved as JSON; --compare prints the change against
+an earlier run.
+
+    python -m benchmarks.bench_sessions --viewers 50 --submissions 20 --out results/sessions.json
+    python -m benchmarks.bench_sessions --mode apptest --viewers 20
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from benchmarks.common import ROOT, compare, cpu_seconds, free_port, rss_kib, summarize, write_results
+from benchmarks.stub_webhook import StubWebhook
+
+FORM = {
+    "Your Name *": "Ada Lovelace",
+    "Your Email *": "ada@example.com",
+    "Subject": "Job Opportunity",
+    "Message *": "Hello! " * 40,
+}
+SUBMIT_LABEL = "Send Message 💬"
+
+
+# websocket mode
+
+async def ws_run(ws, widget_states=(), fragment_id=""):
+    """
+    One script run over the session websocket: (elapsed ms, widgets, bytes received)
+
+    widgets maps each widget label to its (id, fragment id). A fragment_id
+    reruns just that fragment, as the browser does for widgets inside one.
+    """
+    from streamlit.proto.BackMsg_pb2 import BackMsg
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+    message = BackMsg()
+    message.rerun_script.query_string = ""
+    message.rerun_script.page_script_hash = ""
+    message.rerun_script.fragment_id = fragment_id
+    message.rerun_script.widget_states.widgets.extend(widget_states)
+    start = time.perf_counter()
+    await ws.send(message.SerializeToString())
+    ids, received = {}, 0
+    while True:
+        raw = await ws.recv()
+        received += len(raw)
+        forward = ForwardMsg()
+        forward.ParseFromString(raw)
+        kind = forward.WhichOneof("type")
+        if kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+            element = forward.delta.new_element
+            widget = element.WhichOneof("type")
+            if widget in ("text_input", "text_area", "selectbox", "button"):
+                ids[getattr(element, widget).label] = (getattr(element, widget).id, forward.delta.fragment_id)
+        elif kind == "script_finished":
+            return (time.perf_counter() - start) * 1000, ids, received
+
+
+def form_states(ids):
+    from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+    states = [WidgetState(id=ids[label][0], string_value=value) for label, value in FORM.items()]
+    states.append(WidgetState(id=ids[SUBMIT_LABEL][0], trigger_value=True))
+    return states, ids[SUBMIT_LABEL][1]
+
+
+async def ws_viewer(url, reruns, submit, results, hold):
+    import websockets
+
+    async with websockets.connect(url, max_size=None) as ws:
+        elapsed, ids, received = await ws_run(ws)
+        results["first_run_ms"].append(elapsed)
+        results["bytes"].append(received)
+        for _ in range(reruns):
+            elapsed, ids, received = await ws_run(ws)
+            results["rerun_ms"].append(elapsed)
+        if submit:
+            elapsed, ids, received = await ws_run(ws, *form_states(ids))
+            results["submit_ms"].append(elapsed)
+            results["submit_bytes"].append(received)
+        # Keep the session open until every viewer has connected
+        await hold.wait()
+
+
+async def ws_load(port, viewers, submissions, reruns, on_connected):
+    url = f"ws://127.0.0.1:{port}/_stcore/stream"
+    results = {"first_run_ms": [], "rerun_ms": [], "submit_ms": [], "bytes": [], "submit_bytes": []}
+    hold = asyncio.Event()
+    tasks = [asyncio.create_task(ws_viewer(url, reruns, i < submissions, results, hold)) for i in range(viewers)]
+    while len(results["first_run_ms"]) < viewers and not any(t.done() for t in tasks):
+        await asyncio.sleep(0.05)
+    while sum(len(v) for k, v in results.items() if k.endswith("_ms")) < viewers * (1 + reruns) + submissions:
+        if any(t.done() and t.exception() for t in tasks):
+            break
+        await asyncio.sleep(0.05)
+    on_connected()
+    hold.set()
+    await asyncio.gather(*tasks)
+    return results
+
+
+def run_websocket(args, env):
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", os.path.join(ROOT, "app.py"), "--server.headless", "true",
+         "--server.port", str(port), "--browser.gatherUsageStats", "false"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        for _ in range(200):
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1)
+                break
+            except OSError:
+                time.sleep(0.1)
+        # A warm-up session (one submit included) so imports, caches and the
+        # delivery worker's start-up are not billed to the viewers
+        asyncio.run(ws_load(port, 1, 1, 0, lambda: None))
+        rss_before, cpu_before = rss_kib(server.pid), cpu_seconds(server.pid)
+        peak = {}
+
+        def on_connected():
+            peak["rss"] = rss_kib(server.pid)
+
+        results = asyncio.run(ws_load(port, args.viewers, args.submissions, args.reruns, on_connected))
+        cpu_used = cpu_seconds(server.pid) - cpu_before
+        return results, {
+            "server_rss_kib_before": rss_before,
+            "server_rss_kib_with_sessions": peak["rss"],
+            "rss_kib_per_session": round((peak["rss"] - rss_before) / args.viewers, 1),
+            "cpu_ms_per_session": round(cpu_used * 1000 / args.viewers, 2),
+        }
+    finally:
+        server.terminate()
+        server.wait()
+
+
+# apptest mode
+
+def apptest_viewer(reruns, submit):
+    from streamlit.testing.v1 import AppTest
+
+    results = {"first_run_ms": [], "rerun_ms": [], "submit_ms": []}
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=120)
+    start = time.perf_counter()
+    at.run()
+    results["first_run_ms"].append((time.perf_counter() - start) * 1000)
+    for _ in range(reruns):
+        start = time.perf_counter()
+        at.run()
+        results["rerun_ms"].append((time.perf_counter() - start) * 1000)
+    if submit:
+        at.text_input[0].input(FORM["Your Name *"])
+        at.text_input[1].input(FORM["Your Email *"])
+        at.selectbox[0].select(FORM["Subject"])
+        at.text_area[0].input(FORM["Message *"])
+        at.button[0].click()
+        start = time.perf_counter()
+        at.run()
+        results["submit_ms"].append((time.perf_counter() - start) * 1000)
+    return at, results
+
+
+def run_apptest(args, env):
+    os.environ.update(env)
+    apptest_viewer(0, True)  # warm-up
+    rss_before, cpu_before = rss_kib(), cpu_seconds()
+    # AppTest shares one process-wide runtime, so sessions run one after another;
+    # they are all kept alive until RSS is read
+    outcomes = [apptest_viewer(args.reruns, i < args.submissions) for i in range(args.viewers)]
+    rss_after = rss_kib()
+    results = {"first_run_ms": [], "rerun_ms": [], "submit_ms": []}
+    for _, outcome in outcomes:
+        for key, values in outcome.items():
+            results[key].extend(values)
+    return results, {
+        "process_rss_kib_before": rss_before,
+        "process_rss_kib_with_sessions": rss_after,
+        "rss_kib_per_session": round((rss_after - rss_before) / args.viewers, 1),
+        "cpu_ms_per_session": round((cpu_seconds() - cpu_before) * 1000 / args.viewers, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=("websocket", "apptest"), default="websocket")
+    parser.add_argument("--viewers", type=int, default=20)
+    parser.add_argument("--submissions", type=int, default=5)
+    parser.add_argument("--reruns", type=int, default=2, help="extra reruns per viewer")
+    parser.add_argument("--stub-latency", type=float, default=0.1)
+    parser.add_argument("--stub-error-rate", type=float, default=0.0)
+    parser.add_argument("--stub-throttle-rate", type=float, default=0.0)
+    parser.add_argument("--settle", type=float, default=3.0, help="seconds to let deliveries finish")
+    parser.add_argument("--out", help="write results JSON here")
+    parser.add_argument("--compare", help="earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory, StubWebhook(
+        latency=args.stub_latency, error_rate=args.stub_error_rate, throttle_rate=args.stub_throttle_rate
+    ) as stub:
+        outbox_path = os.path.join(directory, "outbox.db")
+        # Every viewer submits the same form; don't let the abuse shield drop the repeats
+        env = dict(os.environ, DISCORD_WEBHOOK_URL=stub.url, OUTBOX_PATH=outbox_path, SHIELD_DUPLICATE_SECONDS="0")
+        runner = run_websocket if args.mode == "websocket" else run_apptest
+        timings, resources = runner(args, env)
+        time.sleep(args.settle)
+
+        import sqlite3
+        with sqlite3.connect(outbox_path) as db:
+            outbox = dict(db.execute("SELECT status, COUNT(*) FROM messages GROUP BY status").fetchall())
+
+    results = {
+        "first_run_ms": summarize(timings["first_run_ms"]),
+        "rerun_ms": summarize(timings["rerun_ms"]),
+        "submit_ms": summarize(timings["submit_ms"]),
+        **resources,
+        "stub": dict(stub.stats),
+        "outbox": outbox,
+    }
+    if timings.get("bytes"):
+        results["bytes_per_run"] = round(sum(timings["bytes"]) / len(timings["bytes"]))
+    if timings.get("submit_bytes"):
+        results["bytes_per_submit"] = round(sum(timings["submit_bytes"]) / len(timings["submit_bytes"]))
+    params = {k: v for k, v in vars(args).items() if k not in ("out", "compare")}
+    data = write_results(args.out, f"sessions-{args.mode}", params, results)
+    print(json.dumps(data["results"], indent=2))
+    if args.compare:
+        compare(args.compare, data)
+
+
+if __name__ == "__main__":
+    main()
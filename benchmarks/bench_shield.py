@@ -0,0 +1,118 @@
+"""
+Abuse shield: cost per check, memory under a flood of distinct clients, and
+webhook posts saved when one client hammers the contact form
+
+- flood: --clients distinct addresses each send one unique message straight
+  to Shield.check(); reports the time per check and the memory the tables
+  hold at the end (tracemalloc), which stays flat once SHIELD_MAX_KEYS is hit
+- hammer: one session and address send --submissions messages (cycling
+  through --distinct texts) through handle_contact(), with and without the
+  shield, against a stub webhook; reports what reached the outbox (every
+  row is a webhook post owed) and what Discord got within --settle seconds
+
+    python -m benchmarks.bench_shield [--clients 1000000] [--max-keys 10000] [--out results/shield.json]
+"""
+import argparse
+import json
+import os
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.common import compare, write_results
+from benchmarks.stub_webhook import StubWebhook
+from portfolio import config
+from portfolio.contact import Submission
+
+
+def flood(clients, max_keys):
+    from portfolio.shield import Shield
+
+    submissions = [Submission("Visitor", f"v{i}@example.com", "Other", f"Hello {i}") for i in range(min(clients, 100000))]
+    keys = [(f"session-{i}", f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}") for i in range(min(clients, 100000))]
+
+    def run(shield):
+        for i in range(clients):
+            session, client = keys[i % len(keys)]
+            shield.check(submissions[i % len(submissions)], session=f"{session}-{i}", client=f"{client}:{i}")
+
+    shield = Shield(max_keys=max_keys)
+    start = time.perf_counter()
+    run(shield)
+    elapsed = time.perf_counter() - start
+    # Again under tracemalloc (which slows it down) for the memory the tables hold
+    shield = Shield(max_keys=max_keys)
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    run(shield)
+    held, peak = (n - base for n in tracemalloc.get_traced_memory())
+    tracemalloc.stop()
+    snapshot = shield.snapshot()
+    return {
+        "us_per_check": round(elapsed / clients * 1e6, 2),
+        "table_kib": round(held / 1024, 1),
+        "peak_kib": round(peak / 1024, 1),
+        "bytes_per_key": round(held / max(sum(snapshot["entries"].values()), 1)),
+        "entries": snapshot["entries"],
+        "evicted": snapshot["evicted"],
+    }
+
+
+def hammer(submissions, distinct, shielded):
+    from portfolio import shield
+    from portfolio.api import handle_contact
+
+    shield._shield = shield.Shield() if shielded else shield.Shield(0, 0, duplicate_seconds=0)
+    statuses = {}
+    start = time.perf_counter()
+    for i in range(submissions):
+        fields = {"name": "Mallory", "email": "mallory@example.com", "message": f"Buy now! offer #{i % distinct}"}
+        status, _ = handle_contact(fields, session="hammer", client="203.0.113.7")
+        statuses[status] = statuses.get(status, 0) + 1
+    elapsed = time.perf_counter() - start
+    return {"ms_per_submit": round(elapsed / submissions * 1000, 3), "statuses": statuses,
+            "shield": shield._shield.snapshot()}
+
+
+def outbox_rows(path):
+    if not os.path.exists(path):
+        return 0
+    with sqlite3.connect(path) as db:
+        return db.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=1000000)
+    parser.add_argument("--max-keys", type=int, default=config.get_settings().shield_max_keys)
+    parser.add_argument("--submissions", type=int, default=200)
+    parser.add_argument("--distinct", type=int, default=5, help="distinct message texts in the hammer run")
+    parser.add_argument("--settle", type=float, default=3.0, help="seconds to let deliveries go out")
+    parser.add_argument("--out")
+    parser.add_argument("--compare")
+    args = parser.parse_args()
+
+    results = {"flood": flood(args.clients, args.max_keys)}
+    with tempfile.TemporaryDirectory() as directory, StubWebhook() as stub:
+        outbox_path = os.path.join(directory, "outbox.db")
+        os.environ.update(DISCORD_WEBHOOK_URL=stub.url, OUTBOX_PATH=outbox_path)
+        config.reload()
+        # Shielded first: the unshielded backlog keeps draining long after its run
+        for shielded in (True, False):
+            rows, posts = outbox_rows(outbox_path), stub.stats["requests"]
+            run = hammer(args.submissions, args.distinct, shielded)
+            time.sleep(args.settle)
+            run["outbox_rows"] = outbox_rows(outbox_path) - rows
+            run["webhook_posts"] = stub.stats["requests"] - posts
+            results["hammer_shielded" if shielded else "hammer_unshielded"] = run
+
+    data = write_results(args.out, "shield", {k: v for k, v in vars(args).items() if k not in ("out", "compare")},
+                         results)
+    print(json.dumps(results, indent=2))
+    if args.compare:
+        compare(args.compare, data)
+
+
+if __name__ == "__main__":
+    main()
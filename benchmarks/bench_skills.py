@@ -0,0 +1,97 @@
+"""
+Skill filter: inverted index against scanning every entry
+
+Builds a synthetic catalogue of --entries experience and project entries
+over a --vocabulary of skills (Zipf-like popularity, 3-8 tags each, so a
+few skills are on most entries and most are rare), then answers the same
+random 1-3 skill AND and OR queries two ways:
+
+- index: SkillIndex.query (microseconds) plus positions() for the matches
+- scan: a list comprehension over every entry's skills, the obvious way
+
+    python -m benchmarks.bench_skills [--entries 5000] [--queries 2000] [--out results/skills.json]
+"""
+import argparse
+import json
+import random
+import time
+
+from benchmarks.common import compare, summarize, write_results
+from portfolio.content import Experience, Project
+from portfolio.skill_index import SkillIndex
+
+
+def catalogue(entries, vocabulary, rng):
+    skills = [f"Skill {i}" for i in range(vocabulary)]
+    weights = [1 / (rank + 1) for rank in range(vocabulary)]
+
+    def tags():
+        return tuple(dict.fromkeys(rng.choices(skills, weights, k=rng.randint(3, 8))))
+
+    experience = tuple(Experience("💼", f"Role {i}", "Org", "2024", (), tags()) for i in range(entries // 5))
+    projects = tuple(Project(f"p{i}", "🚀", f"Project {i}", "", (), "", tags()) for i in range(entries - len(experience)))
+    return {"experience": experience, "projects": projects}, skills, weights
+
+
+def scan(sections, skills, match_any):
+    wanted = {skill.casefold() for skill in skills}
+
+    def matches(item):
+        tags = {tag.casefold() for tag in item.skills}
+        return not wanted.isdisjoint(tags) if match_any else wanted <= tags
+
+    return {kind: [i for i, item in enumerate(items) if matches(item)] for kind, items in sections.items()}
+
+
+def timed_us(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return (time.perf_counter() - start) * 1e6, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=5000)
+    parser.add_argument("--vocabulary", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out")
+    parser.add_argument("--compare")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    sections, skills, weights = catalogue(args.entries, args.vocabulary, rng)
+    build_us, index = timed_us(SkillIndex, sections)
+    queries = [(rng.choices(skills, weights, k=rng.randint(1, 3)), rng.random() < 0.5) for _ in range(args.queries)]
+
+    results = {"build_ms": round(build_us / 1000, 2), "postings": len(index.postings)}
+    for match_any in (False, True):
+        mode = "or" if match_any else "and"
+        batch = [skills for skills, any_ in queries if any_ is match_any]
+        query_us, select_us, scan_us, matches = [], [], [], []
+        for query in batch:
+            elapsed, bits = timed_us(index.query, query, match_any)
+            query_us.append(elapsed)
+            elapsed, found = timed_us(lambda: {kind: index.positions(bits, kind) for kind in sections})
+            select_us.append(elapsed)
+            elapsed, expected = timed_us(scan, sections, query, match_any)
+            scan_us.append(elapsed)
+            if found != expected:
+                raise SystemExit(f"index and scan disagree on {mode} {query}")
+            matches.append(index.count(bits))
+        results[mode] = {
+            "query_us": summarize(query_us),
+            "query_and_positions_us": summarize([q + s for q, s in zip(query_us, select_us)]),
+            "scan_us": summarize(scan_us),
+            "matches": summarize(matches),
+        }
+
+    data = write_results(args.out, "skills", {k: v for k, v in vars(args).items() if k not in ("out", "compare")},
+                         results)
+    print(json.dumps(results, indent=2))
+    if args.compare:
+        compare(args.compare, data)
+
+
+if __name__ == "__main__":
+    main()
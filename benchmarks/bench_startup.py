@@ -0,0 +1,159 @@
+"""
+Cold start: process start to first paint, broken down by import and section
+
+Each run starts `streamlit run app.py` in a fresh process and times
+- ready: until /_stcore/health answers
+- first paint: until the first element of the page arrives on a new
+  session's websocket
+- page: until that first script run finishes
+One extra run under `python -X importtime` attributes import time to the
+server's start-up and to the first script run, and PORTFOLIO_METRICS gives
+the per-section times of that run.
+
+With --warmup, `python -m portfolio.warmup` visits the server as soon as
+it is ready; the visitor measured afterwards then lands on a warm process.
+
+    python -m benchmarks.bench_startup [--runs 5] [--warmup] [--out results/startup.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from benchmarks.common import ROOT, compare, free_port, write_results
+
+SECTION_RE = re.compile(r'portfolio_section_seconds_sum\{section="([^"]+)"\} ([0-9.]+)')
+
+
+async def first_visit(port):
+    """
+    (ms to the first element, ms to script_finished) for a new session
+    """
+    import websockets
+    from streamlit.proto.BackMsg_pb2 import BackMsg
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+    start = time.perf_counter()
+    first = None
+    async with websockets.connect(f"ws://127.0.0.1:{port}/_stcore/stream", max_size=None) as ws:
+        message = BackMsg()
+        message.rerun_script.query_string = ""
+        message.rerun_script.page_script_hash = ""
+        await ws.send(message.SerializeToString())
+        while True:
+            forward = ForwardMsg()
+            forward.ParseFromString(await ws.recv())
+            kind = forward.WhichOneof("type")
+            if kind == "delta" and first is None:
+                first = (time.perf_counter() - start) * 1000
+            elif kind == "script_finished":
+                return first, (time.perf_counter() - start) * 1000
+
+
+def start_once(warmup, importtime=False, metrics_port=None):
+    port = free_port()
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(os.environ, OUTBOX_PATH=os.path.join(directory, "outbox.db"), CONFIG_WATCH_SECONDS="0")
+        if metrics_port:
+            env.update(PORTFOLIO_METRICS="1", METRICS_PORT=str(metrics_port))
+        command = [sys.executable] + (["-X", "importtime"] if importtime else []) + [
+            "-m", "streamlit", "run", os.path.join(ROOT, "app.py"), "--server.headless", "true",
+            "--server.port", str(port), "--browser.gatherUsageStats", "false",
+        ]
+        log_path = os.path.join(directory, "stderr.log")
+        with open(log_path, "w") as log:
+            start = time.perf_counter()
+            server = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=log)
+            try:
+                while True:
+                    try:
+                        urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1)
+                        break
+                    except OSError:
+                        time.sleep(0.01)
+                ready = (time.perf_counter() - start) * 1000
+                log.flush()
+                startup_lines = sum(1 for _ in open(log_path))
+                if warmup:
+                    from portfolio.warmup import visit
+                    visit(f"http://127.0.0.1:{port}")
+                    time.sleep(1)  # let the background warm-up finish
+                paint, page = asyncio.run(first_visit(port))
+                result = {"ready_ms": ready, "visit_first_element_ms": paint, "visit_page_ms": page}
+                if not warmup:
+                    # The visitor arrived as soon as the server could take them
+                    result["first_paint_ms"] = ready + paint
+                    result["page_ms"] = ready + page
+                sections = {}
+                if metrics_port:
+                    text = urllib.request.urlopen(f"http://127.0.0.1:{metrics_port}/metrics").read().decode()
+                    sections = {name: float(value) * 1000 for name, value in SECTION_RE.findall(text)}
+            finally:
+                server.terminate()
+                server.wait()
+        with open(log_path) as f:
+            lines = f.read().splitlines()
+    return result, sections, lines[:startup_lines], lines[startup_lines:]
+
+
+def parse_importtime(lines):
+    """
+    Top-level imports as (module, cumulative ms), largest first
+    """
+    imports = []
+    for line in lines:
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nested imports are indented under their parent; the header row isn't a number
+        if name[1:].startswith(" ") or not cumulative.strip().isdigit():
+            continue
+        imports.append((name.strip(), int(cumulative) / 1000))
+    return sorted(imports, key=lambda item: -item[1])
+
+
+def group(imports):
+    totals = {}
+    for name, ms in imports:
+        top = name.split(".")[0]
+        totals[top] = totals.get(top, 0.0) + ms
+    return dict(sorted(((k, round(v, 1)) for k, v in totals.items()), key=lambda item: -item[1]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--warmup", action="store_true", help="visit with portfolio.warmup before measuring")
+    parser.add_argument("--top", type=int, default=12)
+    parser.add_argument("--out")
+    parser.add_argument("--compare")
+    args = parser.parse_args()
+
+    runs = [start_once(args.warmup)[0] for _ in range(args.runs)]
+    timings = {key: round(statistics.median(run[key] for run in runs), 1) for key in runs[0]}
+
+    _, sections, startup, first_run = start_once(args.warmup, importtime=True, metrics_port=free_port())
+    startup_imports, first_run_imports = parse_importtime(startup), parse_importtime(first_run)
+    results = {
+        "median_ms": timings,
+        "sections_ms": {name: round(ms, 2) for name, ms in sorted(sections.items(), key=lambda item: -item[1])},
+        "startup_imports_ms": group(startup_imports),
+        "first_run_imports_ms": dict((name, round(ms, 1)) for name, ms in first_run_imports[:args.top]),
+        "first_run_imports_total_ms": round(sum(ms for _, ms in first_run_imports), 1),
+    }
+    data = write_results(args.out, "startup", {k: v for k, v in vars(args).items() if k not in ("out", "compare")},
+                         results)
+    print(json.dumps(results, indent=2))
+    if args.compare:
+        compare(args.compare, data)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Page views per second: static export vs a Streamlit script run per view
+
+Static mode: --clients keep-alive clients fetch / (gzip) from
+portfolio.static_server for --seconds. Streamlit mode: the least a viewer
+costs there, one full headless script run of app.py (no websocket or
+browser rendering counted), repeated for --seconds.
+
+    python -m benchmarks.bench_static [--clients 8] [--seconds 5]
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+import requests
+from streamlit.testing.v1 import AppTest
+
+from portfolio import config
+from portfolio.export import build
+from portfolio.static_server import make_server
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def static_throughput(clients, seconds):
+    with tempfile.TemporaryDirectory() as directory:
+        build(directory)
+        server = make_server(directory, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/"
+        counts = [0] * clients
+        stop = time.perf_counter() + seconds
+
+        def client(i):
+            session = requests.Session()
+            while time.perf_counter() < stop:
+                session.get(url, headers={"Accept-Encoding": "gzip"}).raise_for_status()
+                counts[i] += 1
+
+        threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        server.shutdown()
+    return sum(counts) / seconds
+
+
+def streamlit_throughput(seconds):
+    os.environ.setdefault("DISCORD_WEBHOOK_URL", "http://127.0.0.1:9/stub")
+    config.reload()
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=60)
+    at.run()
+    runs, stop = 0, time.perf_counter() + seconds
+    while time.perf_counter() < stop:
+        at.run()
+        runs += 1
+    return runs / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+    static = static_throughput(args.clients, args.seconds)
+    streamlit = streamlit_throughput(args.seconds)
+    print(f"static export   {static:8.0f} page views/s ({args.clients} clients)")
+    print(f"streamlit       {streamlit:8.0f} script runs/s (upper bound on page views)")
+    print(f"ratio           {static / streamlit:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
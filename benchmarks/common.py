@@ -0,0 +1,91 @@
+"""
+Helpers shared by the benchmark scripts
+"""
+import json
+import os
+import socket
+import subprocess
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def summarize(timings_ms):
+    """
+    mean / p50 / p99 / max of a list of millisecond timings
+    """
+    if not timings_ms:
+        return {}
+    ordered = sorted(timings_ms)
+    return {
+        "count": len(ordered),
+        "mean": round(sum(ordered) / len(ordered), 3),
+        "p50": round(ordered[len(ordered) // 2], 3),
+        "p99": round(ordered[min(int(len(ordered) * 0.99), len(ordered) - 1)], 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+def rss_kib(pid="self"):
+    """
+    Resident set size of a process from /proc (Linux)
+    """
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def cpu_seconds(pid="self"):
+    """
+    User + system CPU time of a process from /proc (Linux)
+    """
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(path, name, params, results):
+    """
+    Save a run as JSON (tagged with the commit) so runs can be compared later
+    """
+    data = {"benchmark": name, "commit": git_commit(), "timestamp": time.time(), "params": params, "results": results}
+    if path:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+    return data
+
+
+def compare(old_path, new):
+    """
+    Print numeric differences between a saved run and this one
+    """
+    with open(old_path) as f:
+        old = json.load(f)
+
+    def walk(prefix, a, b):
+        for key, value in b.items():
+            if isinstance(value, dict) and isinstance(a.get(key), dict):
+                walk(f"{prefix}{key}.", a[key], value)
+            elif isinstance(value, (int, float)) and isinstance(a.get(key), (int, float)) and a[key]:
+                change = (value - a[key]) / a[key] * 100
+                print(f"{prefix + key:<36} {a[key]:>12.3f} -> {value:>12.3f}  ({change:+.1f}%)")
+
+    print(f"compared with {old.get('commit')} ({old_path})")
+    walk("", old["results"], new["results"])
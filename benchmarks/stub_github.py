@@ -0,0 +1,128 @@
+"""
+Local stand-in for the GitHub REST API's GET /repos/{owner}/{repo}
+
+Serves fixed repository records for the portfolio's projects (404 for
+anything else), with ETags so revalidation answers 304, an optional delay
+and an optional failure rate. Point the app at it for offline runs:
+
+    python -m benchmarks.stub_github --port 8766 [--latency 0.5]
+    GITHUB_API_URL=http://127.0.0.1:8766 streamlit run app.py
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES = {
+    "dbhasin4123/news-summarizer": (14, "Python", "2025-06-18T09:12:44Z"),
+    "dbhasin4123/ai-recruiter": (9, "Python", "2025-05-02T14:03:10Z"),
+    "dbhasin4123/doc-assistant": (6, "Python", "2025-04-11T22:47:31Z"),
+    "dbhasin4123/Elderly-Immigrant-Integration": (3, "Dart", "2024-11-05T05:30:00Z"),
+    "dbhasin4123/PatternAnalysis-2023": (2, "Python", "2023-11-16T12:00:09Z"),
+    "dbhasin4123/REIT4842_Thesis": (4, "Jupyter Notebook", "2025-02-20T08:15:52Z"),
+    "dbhasin4123/Blockchain-Embedded-system": (5, "C", "2024-10-28T03:41:17Z"),
+}
+
+
+def repo_record(key):
+    stars, language, pushed_at = FIXTURES[key]
+    return {"full_name": key, "stargazers_count": stars, "language": language, "pushed_at": pushed_at}
+
+
+class StubGitHub:
+    """
+    Threaded HTTP server on a free local port
+    """
+
+    def __init__(self, port=0, latency=0.0, error_rate=0.0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.stats = {"requests": 0, "not_modified": 0, "errors": 0}
+        self.requests_by_repo = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def count(self, key, repo=None):
+        with self._lock:
+            self.stats[key] += 1
+            if repo:
+                self.requests_by_repo[repo] = self.requests_by_repo.get(repo, 0) + 1
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                repo = self.path.split("?")[0].removeprefix("/repos/")
+                stub.count("requests", repo)
+                if stub.latency:
+                    time.sleep(stub.latency)
+                if stub.error_rate and random.random() < stub.error_rate:
+                    stub.count("errors")
+                    return self._reply(502, b"{}")
+                if repo not in FIXTURES:
+                    return self._reply(404, b'{"message": "Not Found"}')
+                body = json.dumps(repo_record(repo)).encode()
+                etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    stub.count("not_modified")
+                    return self._reply(304, b"", etag)
+                self._reply(200, body, etag)
+
+            def _reply(self, status, body, etag=None):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                if etag:
+                    self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with 502")
+    args = parser.parse_args()
+    stub = StubGitHub(args.port, latency=args.latency, error_rate=args.error_rate)
+    print(f"Stub GitHub API listening on {stub.url}")
+    try:
+        stub._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
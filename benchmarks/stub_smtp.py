@@ -0,0 +1,93 @@
+"""
+Minimal local SMTP relay that accepts and keeps every message
+
+Speaks just enough SMTP for smtplib (EHLO/HELO, MAIL, RCPT, DATA, RSET,
+NOOP, QUIT), with optional latency per message.
+
+    python -m benchmarks.stub_smtp --port 8025
+"""
+import argparse
+import socketserver
+import threading
+import time
+
+
+class StubSmtp:
+    def __init__(self, port=0, latency=0.0):
+        self.latency = latency
+        self.messages = []
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def reply(self, line):
+                self.wfile.write(line.encode() + b"\r\n")
+
+            def handle(self):
+                self.reply("220 stub-smtp ready")
+                while True:
+                    line = self.rfile.readline()
+                    if not line:
+                        return
+                    command = line.decode(errors="replace").strip().upper()
+                    if command.startswith("EHLO"):
+                        self.reply("250-stub-smtp")
+                        self.reply("250 8BITMIME")
+                    elif command.startswith("DATA"):
+                        self.reply("354 end data with <CR><LF>.<CR><LF>")
+                        data = []
+                        for body_line in self.rfile:
+                            if body_line in (b".\r\n", b".\n"):
+                                break
+                            data.append(body_line)
+                        if stub.latency:
+                            time.sleep(stub.latency)
+                        stub.messages.append(b"".join(data))
+                        self.reply("250 OK queued")
+                    elif command.startswith("QUIT"):
+                        self.reply("221 bye")
+                        return
+                    else:
+                        self.reply("250 OK")
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8025)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+    stub = StubSmtp(args.port, latency=args.latency)
+    print(f"Stub SMTP relay listening on 127.0.0.1:{stub.port}")
+    try:
+        stub._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Local stand-in for a Discord webhook
+
+Accepts JSON posts and answers 204 like Discord does, counting requests and
+new TCP connections so benchmarks can show what the client actually did.
+An error rate makes that share of posts fail with 500 and a throttle rate
+answers that share with a random 429. With a rate limit it also sends Discord-style X-RateLimit-* headers and
+rejects over-limit posts with 429 + Retry-After.
+
+    python -m benchmarks.stub_webhook --port 8765 [--tls] [--rate-limit 5/2]
+"""
+import argparse
+import os
+import random
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def make_self_signed_cert(directory):
+    """
+    Throwaway certificate for 127.0.0.1 (needs the openssl binary)
+    """
+    cert = os.path.join(directory, "stub.crt")
+    key = os.path.join(directory, "stub.key")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=127.0.0.1", "-keyout", key, "-out", cert],
+        check=True, capture_output=True,
+    )
+    return cert, key
+
+
+class StubWebhook:
+    """
+    Threaded HTTP(S) server on a free local port
+    """
+
+    def __init__(self, port=0, latency=0.0, tls=False, rate_limit=None, error_rate=0.0, throttle_rate=0.0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.rate_limit = rate_limit
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self.stats = {"requests": 0, "connections": 0, "rejected": 0, "errors": 0}
+        self.bodies = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self._server.daemon_threads = True
+        self.scheme = "http"
+        if tls:
+            self._certdir = tempfile.mkdtemp()
+            cert, key = make_self_signed_cert(self._certdir)
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(cert, key)
+            self._server.socket = context.wrap_socket(self._server.socket, server_side=True)
+            self.scheme = "https"
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"{self.scheme}://127.0.0.1:{self._server.server_address[1]}/api/webhooks/stub"
+
+    def count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def respond(self, handler, body):
+        """
+        Decide the reply for one request; returns (status, headers)
+        """
+        if self.latency:
+            time.sleep(self.latency)
+        if self.error_rate and random.random() < self.error_rate:
+            self.count("errors")
+            return 500, {}
+        if self.throttle_rate and random.random() < self.throttle_rate:
+            self.count("rejected")
+            return 429, {"Retry-After": "1", "X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": "1"}
+        if not self.rate_limit:
+            return 204, {}
+        limit, window = self.rate_limit
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= window:
+                self._window_start, self._window_count = now, 0
+            reset_after = window - (now - self._window_start)
+            if self._window_count >= limit:
+                self.stats["rejected"] += 1
+                return 429, {"Retry-After": f"{reset_after:.3f}", "X-RateLimit-Limit": str(limit),
+                             "X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": f"{reset_after:.3f}"}
+            self._window_count += 1
+            remaining = limit - self._window_count
+        return 204, {"X-RateLimit-Limit": str(limit), "X-RateLimit-Remaining": str(remaining),
+                     "X-RateLimit-Reset-After": f"{reset_after:.3f}"}
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                stub.count("connections")
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                stub.count("requests")
+                with stub._lock:
+                    stub.bodies.append(body)
+                status, headers = stub.respond(self, body)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--tls", action="store_true")
+    parser.add_argument("--rate-limit", help="LIMIT/SECONDS, e.g. 5/2 like Discord")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of posts answered with 500")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="share of posts answered with 429")
+    args = parser.parse_args()
+    rate_limit = None
+    if args.rate_limit:
+        limit, window = args.rate_limit.split("/")
+        rate_limit = (int(limit), float(window))
+    stub = StubWebhook(args.port, latency=args.latency, tls=args.tls, rate_limit=rate_limit,
+                      error_rate=args.error_rate, throttle_rate=args.throttle_rate)
+    print(f"Stub webhook listening on {stub.url}")
+    try:
+        stub._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+"""
+Support code for the portfolio Streamlit app (notifications, delivery, content)
+"""
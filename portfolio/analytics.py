@@ -0,0 +1,235 @@
+"""
+Visitor analytics off the request path
+
+Recording an event is a few stores into preallocated columns of a
+fixed-size ring buffer: no I/O, no per-event tuple or dict. A daemon
+thread drains the buffer every ANALYTICS_FLUSH_SECONDS and writes the batch
+to SQLite in one transaction. If visitors outrun the flusher, the oldest
+unflushed events are overwritten and counted as dropped.
+
+Events (kind, name):
+- page_view       first script run of a Streamlit session
+- section_view    a section header scrolled into view (portfolio.beacon)
+- project_click   a project link clicked, named after the project
+- form            contact outcome: accepted, invalid, limited, duplicate
+                  or unavailable (every front end, via handle_contact)
+
+    python -m portfolio.analytics report [--since 2026-10-01]
+
+ANALYTICS_ENABLED=0 turns recording into a no-op.
+"""
+import argparse
+import atexit
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from portfolio.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+ENABLED = get_settings().analytics_enabled
+ANALYTICS_PATH = get_settings().analytics_path
+# Events held in memory between flushes
+BUFFER_SIZE = get_settings().analytics_buffer_size
+FLUSH_SECONDS = get_settings().analytics_flush_seconds
+
+PAGE_VIEW = "page_view"
+SECTION_VIEW = "section_view"
+PROJECT_CLICK = "project_click"
+FORM = "form"
+KINDS = (PAGE_VIEW, SECTION_VIEW, PROJECT_CLICK, FORM)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    at REAL NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    session TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_at ON events (at);
+"""
+
+
+class RingBuffer:
+    """
+    Fixed-size event buffer stored column by column
+    """
+
+    def __init__(self, size=BUFFER_SIZE):
+        self.size = size
+        self.at = [0.0] * size
+        self.kind = [""] * size
+        self.name = [""] * size
+        self.session = [""] * size
+        self.written = 0
+        self.drained = 0
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def append(self, kind, name, session):
+        with self._lock:
+            i = self.written % self.size
+            self.at[i] = time.time()
+            self.kind[i] = kind
+            self.name[i] = name
+            self.session[i] = session
+            self.written += 1
+
+    def drain(self):
+        """
+        Unflushed events as rows, oldest first
+        """
+        with self._lock:
+            start, end = self.drained, self.written
+            if end - start > self.size:
+                self.dropped += end - start - self.size
+                start = end - self.size
+            self.drained = end
+            indices = [j % self.size for j in range(start, end)]
+            at, kind, name, session = self.at, self.kind, self.name, self.session
+            return [(at[i], kind[i], name[i], session[i]) for i in indices]
+
+
+class Store:
+    """
+    The SQLite file events are flushed to
+    """
+
+    def __init__(self, path=ANALYTICS_PATH):
+        self.path = path
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+
+    def write(self, rows):
+        self._db.execute("BEGIN")
+        try:
+            self._db.executemany("INSERT INTO events (at, kind, name, session) VALUES (?, ?, ?, ?)", rows)
+            self._db.execute("COMMIT")
+        except BaseException:
+            # Left open, the transaction would fail every later flush
+            if self._db.in_transaction:
+                self._db.execute("ROLLBACK")
+            raise
+
+    def report(self, since=0.0):
+        """
+        {kind: [(name, events, sessions)]}, most frequent first
+        """
+        rows = self._db.execute(
+            "SELECT kind, name, COUNT(*), COUNT(DISTINCT session) FROM events WHERE at >= ?"
+            " GROUP BY kind, name ORDER BY kind, COUNT(*) DESC",
+            (since,),
+        ).fetchall()
+        report = {}
+        for kind, name, events, sessions in rows:
+            report.setdefault(kind, []).append((name, events, sessions))
+        return report
+
+    def close(self):
+        self._db.close()
+
+
+class Recorder:
+    """
+    A ring buffer plus the thread that flushes it
+    """
+
+    def __init__(self, store, size=BUFFER_SIZE, interval=FLUSH_SECONDS):
+        self.store = store
+        self.buffer = RingBuffer(size)
+        self.interval = interval
+        self.stats = {"flushed": 0, "flushes": 0, "flush_errors": 0}
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="analytics-flush", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def flush(self):
+        """
+        Write everything buffered so far; returns the number of events
+        """
+        with self._flush_lock:
+            rows = self.buffer.drain()
+            if not rows:
+                return 0
+            try:
+                self.store.write(rows)
+            except sqlite3.Error:
+                # Analytics never gets in a visitor's way; the batch is lost
+                self.stats["flush_errors"] += 1
+                logger.exception("Could not flush %d analytics events", len(rows))
+                return 0
+            self.stats["flushed"] += len(rows)
+            self.stats["flushes"] += 1
+            return len(rows)
+
+    def snapshot(self):
+        buffer = self.buffer
+        return dict(self.stats, recorded=buffer.written, dropped=buffer.dropped,
+                    buffered=min(buffer.written - buffer.drained, buffer.size))
+
+
+_recorder = None
+_recorder_lock = threading.Lock()
+
+
+def get_recorder():
+    """
+    The process-wide recorder, started on first use
+    """
+    global _recorder
+    if _recorder is None:
+        with _recorder_lock:
+            if _recorder is None:
+                _recorder = Recorder(Store()).start()
+                atexit.register(_recorder.stop)
+    return _recorder
+
+
+def record(kind, name="", session=""):
+    """
+    Buffer one event (a no-op when ANALYTICS_ENABLED=0)
+    """
+    if not ENABLED:
+        return
+    (_recorder or get_recorder()).buffer.append(kind, name, session)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarise recorded visitor analytics")
+    parser.add_argument("--path", default=ANALYTICS_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+    report_parser = commands.add_parser("report", help="events and distinct sessions by kind and name")
+    report_parser.add_argument("--since", type=datetime.fromisoformat)
+    args = parser.parse_args()
+
+    store = Store(args.path)
+    since = args.since.timestamp() if args.since else 0.0
+    for kind, rows in sorted(store.report(since).items()):
+        print(kind)
+        for name, events, sessions in rows:
+            print(f"  {name or '-':<40} {events:>8} events {sessions:>8} sessions")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
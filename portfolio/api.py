@@ -0,0 +1,211 @@
+"""
+Async HTTP contact API
+
+A dependency-free ASGI app exposing the contact pipeline to any front end:
+
+    POST /contact   JSON or form-encoded {name, email, subject, message}
+                    -> 202 accepted | 400 invalid | 413 too large
+                       | 429 + Retry-After (portfolio.shield) | 503 + mailto
+    GET  /health    -> delivery queue and outbox counts
+    GET  /metrics   -> Prometheus text (when PORTFOLIO_METRICS=1)
+
+Handlers never wait on Discord: accepting a message is the outbox insert,
+run off the event loop, and the background worker delivers it with the
+same payloads as the Streamlit form. The Streamlit form and the static
+server call handle_contact() too, so every front end shares one path.
+
+    python -m portfolio.api --port 8001      (served by uvicorn)
+"""
+import argparse
+import asyncio
+import json
+import math
+from urllib.parse import parse_qs
+
+from portfolio import analytics, metrics
+from portfolio.config import get_settings
+from portfolio.contact import Submission, mailto_link, validate
+from portfolio.layout import SUBJECTS
+from portfolio.shield import DUPLICATE, get_shield
+
+# Largest contact request body accepted, in bytes
+MAX_BODY_BYTES = get_settings().contact_max_body_bytes
+# Comma-separated origins allowed to call the API from a browser ("*" for any)
+ALLOWED_ORIGINS = get_settings().contact_allowed_origins
+
+
+# The fields handle_contact() reads
+FIELDS = ("name", "email", "subject", "message")
+
+
+class RequestTooLarge(Exception):
+    pass
+
+
+def parse_fields(raw, content_type):
+    """
+    Form fields from a JSON or urlencoded body; ValueError when malformed
+    """
+    if content_type.startswith("application/json"):
+        data = json.loads(raw or b"{}")
+        if not isinstance(data, dict):
+            raise ValueError("expected a JSON object")
+        # null, numbers and lists would otherwise pass validation as "None", "1", "['a']";
+        # fields the form doesn't use are ignored whatever their type
+        if not all(isinstance(data[k], str) for k in FIELDS if k in data):
+            raise ValueError("expected string values")
+        return {k: data[k] for k in FIELDS if k in data}
+    return {k: v[0] for k, v in parse_qs(raw.decode()).items()}
+
+
+def handle_contact(fields, session=None, client=None):
+    """
+    Validate and accept a submission; returns (status, result dict)
+
+    `session` and `client` (a Streamlit session id, a client address) key
+    the abuse shield's limits. A duplicate is answered like a success so a
+    double-click doesn't look like an error, but nothing is sent.
+    Acceptance failures unmark the message so the visitor can retry.
+    """
+    name = fields.get("name", "").strip()
+    email = fields.get("email", "").strip()
+    subject = fields.get("subject", SUBJECTS[0])
+    message = fields.get("message", "").strip()
+    error = validate(name, email, message)
+    if error:
+        analytics.record(analytics.FORM, "invalid", session or "")
+        return 400, {"ok": False, "error": error}
+    if subject not in SUBJECTS:
+        subject = "Other"
+    submission = Submission(name, email, subject, message)
+    verdict = get_shield().check(submission, session, client)
+    if verdict is not None:
+        kind, wait = verdict
+        if kind == DUPLICATE:
+            analytics.record(analytics.FORM, "duplicate", session or "")
+            return 202, {"ok": True, "duplicate": True}
+        analytics.record(analytics.FORM, "limited", session or "")
+        return 429, {"ok": False, "error": "Too many messages, please try again later", "retry_after": math.ceil(wait)}
+    from portfolio.delivery import accept
+    delivery_error = accept(submission)
+    if delivery_error:
+        # Not queued, so a retry must not be answered as a duplicate
+        get_shield().forget(submission)
+        analytics.record(analytics.FORM, "unavailable", session or "")
+        return 503, {"ok": False, "error": delivery_error, "mailto": mailto_link(submission)}
+    analytics.record(analytics.FORM, "accepted", session or "")
+    return 202, {"ok": True}
+
+
+async def read_body(receive, limit):
+    chunks, size = [], 0
+    while True:
+        event = await receive()
+        if event["type"] == "http.disconnect":
+            break
+        chunk = event.get("body", b"")
+        size += len(chunk)
+        if size > limit:
+            raise RequestTooLarge
+        chunks.append(chunk)
+        if not event.get("more_body"):
+            break
+    return b"".join(chunks)
+
+
+async def send_json(send, status, data, headers=()):
+    body = b"" if status == 204 else json.dumps(data).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()), *headers],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+def cors_headers(origin):
+    if origin and ("*" in ALLOWED_ORIGINS or origin in ALLOWED_ORIGINS):
+        return [
+            (b"access-control-allow-origin", origin.encode()),
+            (b"access-control-allow-methods", b"POST, OPTIONS"),
+            (b"access-control-allow-headers", b"content-type"),
+            (b"vary", b"Origin"),
+        ]
+    return []
+
+
+async def app(scope, receive, send):
+    """
+    The ASGI application
+    """
+    if scope["type"] == "lifespan":
+        while True:
+            event = await receive()
+            if event["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif event["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    if scope["type"] != "http":
+        return
+
+    headers = {k.decode().lower(): v.decode() for k, v in scope["headers"]}
+    cors = cors_headers(headers.get("origin", ""))
+    method, path = scope["method"], scope["path"]
+
+    if path == "/health" and method == "GET":
+        from portfolio.delivery import get_delivery_worker
+        from portfolio.outbox import get_outbox
+        worker = get_delivery_worker()
+        counts = await asyncio.to_thread(get_outbox().counts)
+        return await send_json(send, 200, {"queue_depth": worker.depth(), "outbox": counts, "worker": worker.stats})
+    if path == "/metrics" and method == "GET" and metrics.ENABLED:
+        body = metrics.render().encode()
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"text/plain; version=0.0.4; charset=utf-8"),
+                        (b"content-length", str(len(body)).encode())],
+        })
+        return await send({"type": "http.response.body", "body": body})
+    if path != "/contact":
+        return await send_json(send, 404, {"ok": False, "error": "Not found"})
+    if method == "OPTIONS":
+        return await send_json(send, 204 if cors else 403, {}, cors)
+    if method != "POST":
+        return await send_json(send, 405, {"ok": False, "error": "Method not allowed"}, [(b"allow", b"POST")])
+
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        length = -1
+    if length < 0:
+        return await send_json(send, 400, {"ok": False, "error": "Malformed Content-Length"}, cors)
+    if length > MAX_BODY_BYTES:
+        return await send_json(send, 413, {"ok": False, "error": "Request body too large"}, cors)
+    try:
+        raw = await read_body(receive, MAX_BODY_BYTES)
+    except RequestTooLarge:
+        return await send_json(send, 413, {"ok": False, "error": "Request body too large"}, cors)
+    try:
+        fields = parse_fields(raw, headers.get("content-type", ""))
+    except (ValueError, UnicodeDecodeError):
+        return await send_json(send, 400, {"ok": False, "error": "Malformed request body"}, cors)
+    client = (scope.get("client") or (None,))[0]
+    status, result = await asyncio.to_thread(handle_contact, fields, None, client)
+    if status == 429:
+        cors = cors + [(b"retry-after", str(result["retry_after"]).encode())]
+    await send_json(send, status, result, cors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the contact API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    args = parser.parse_args()
+    import uvicorn
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Static assets shared by the Streamlit app and the static export
+
+The stylesheet is minified and written under a content-hashed name to
+static/, which Streamlit serves at app/static/ (server.enableStaticServing).
+Pages link to it instead of inlining it, so a rerun sends one <link> tag
+and browsers keep the file until its content, and so its name, changes:
+
+    python -m portfolio.assets          (the app also builds it on first run)
+
+STYLESHEET_URL_PREFIX points the link somewhere else, e.g. a CDN or the
+static export's /assets/ (same file name) where it is served immutable.
+"""
+import argparse
+import glob
+import hashlib
+import os
+import re
+from functools import lru_cache
+
+from portfolio.config import get_settings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ASSETS_DIR = os.path.join(ROOT, "assets")
+STATIC_DIR = os.path.join(ROOT, "static")
+STYLESHEET = os.path.join(ASSETS_DIR, "style.css")
+STYLESHEET_URL_PREFIX = get_settings().stylesheet_url_prefix
+
+
+@lru_cache(maxsize=None)
+def stylesheet():
+    """
+    The site stylesheet, read once per process
+    """
+    with open(STYLESHEET, encoding="utf-8") as f:
+        return f.read()
+
+
+def fingerprint(data, length=10):
+    """
+    Short content hash used in asset file names and ETags
+    """
+    if isinstance(data, str):
+        data = data.encode()
+    return hashlib.sha256(data).hexdigest()[:length]
+
+
+def choose_encoding(accept_encoding, available):
+    """
+    Best precompressed variant the client accepts ("identity" if none)
+    """
+    accepted = {part.split(";")[0].strip() for part in accept_encoding.split(",")}
+    for encoding in ("br", "gzip"):
+        if encoding in accepted and encoding in available:
+            return encoding
+    return "identity"
+
+
+def minify_css(css):
+    """
+    Drop comments and the whitespace CSS doesn't need
+    """
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    # Not around ":" in general: ".a :hover" and ".a:hover" differ
+    css = re.sub(r"([{;])([-a-z]+)\s*:\s*", r"\1\2:", css)
+    return css.replace(";}", "}").strip()
+
+
+@lru_cache(maxsize=None)
+def minified_stylesheet():
+    return minify_css(stylesheet())
+
+
+def stylesheet_name():
+    """
+    Content-hashed file name of the minified stylesheet
+    """
+    return f"style.{fingerprint(minified_stylesheet())}.css"
+
+
+def build(directory=STATIC_DIR):
+    """
+    Write the minified stylesheet into `directory`, removing older builds
+    """
+    name = stylesheet_name()
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, name)
+    if not os.path.exists(path):
+        # Write then rename so a concurrent reader never sees a partial file
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(minified_stylesheet())
+        os.replace(tmp, path)
+    for old in glob.glob(os.path.join(directory, "style.*.css")):
+        if os.path.basename(old) != name:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+    return path
+
+
+@lru_cache(maxsize=None)
+def stylesheet_href():
+    """
+    URL the page links the stylesheet from, building it once per process
+    """
+    build()
+    return STYLESHEET_URL_PREFIX + stylesheet_name()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the minified, fingerprinted stylesheet")
+    parser.add_argument("--out", default=STATIC_DIR)
+    args = parser.parse_args()
+    path = build(args.out)
+    print(f"{path}: {len(stylesheet().encode())} B -> {os.path.getsize(path)} B")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Browser-side analytics beacon
+
+The server can't see scrolling or clicks on external links, so a hidden
+custom component (assets/beacon/index.html, plain JS with no build step)
+watches the page around it for section headers scrolled into view and
+clicks on project links. It sends what it saw every few seconds; each
+batch reruns only the beacon's fragment, which hands the events to
+portfolio.analytics.
+"""
+import os
+
+import streamlit as st
+import streamlit.components.v1 as components
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from portfolio import analytics
+from portfolio.assets import ASSETS_DIR
+from portfolio.config import get_settings
+
+# A batch is whatever the browser says it is; only this much of it is kept
+MAX_EVENTS = 50
+MAX_NAME_LENGTH = 100
+KINDS = (analytics.SECTION_VIEW, analytics.PROJECT_CLICK)
+# Behind portfolio.cluster every connection comes from the proxy on localhost
+TRUST_FORWARDED_FOR = get_settings().trust_forwarded_for
+
+_component = components.declare_component("beacon", path=os.path.join(ASSETS_DIR, "beacon"))
+
+
+def session_id():
+    """
+    The current Streamlit session's id (None outside a script run)
+    """
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx else None
+
+
+def client_address():
+    """
+    The visitor's address: the last X-Forwarded-For entry when behind the
+    cluster proxy, else Streamlit's (None for localhost)
+    """
+    if TRUST_FORWARDED_FOR:
+        forwarded = st.context.headers.get("X-Forwarded-For", "")
+        if forwarded:
+            return forwarded.rsplit(",", 1)[-1].strip() or None
+    return st.context.ip_address
+
+
+@st.fragment
+def beacon():
+    """
+    Mount the beacon and record the batch it last sent, once
+    """
+    batch = _component(key="analytics-beacon", default=None)
+    if not isinstance(batch, dict) or batch.get("seq") == st.session_state.get("_beacon_seq"):
+        return
+    st.session_state["_beacon_seq"] = batch.get("seq")
+    session = session_id()
+    for event in (batch.get("events") or [])[:MAX_EVENTS]:
+        if isinstance(event, list) and len(event) == 2 and event[0] in KINDS and isinstance(event[1], str):
+            analytics.record(event[0], event[1][:MAX_NAME_LENGTH], session)
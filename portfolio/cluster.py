@@ -0,0 +1,333 @@
+"""
+Multi-process deployment: N Streamlit replicas behind a sticky proxy
+
+One Streamlit process runs every session's script on one interpreter, so
+it tops out at one core. This launcher starts --workers copies of app.py on
+consecutive ports and fronts them with a small asyncio TCP proxy:
+
+- a new visitor's connection goes to the replica with the fewest open
+  connections (taking turns on a tie), and the first response carries a
+  `portfolio_worker` cookie
+- requests that carry the cookie (including the session websocket, which
+  the browser opens with the page's cookies) go back to that replica, so a
+  reconnecting session finds its state where it left it
+- each request's X-Forwarded-For is replaced by the visitor's address; the
+  replicas only ever see the proxy at 127.0.0.1, so without it the abuse
+  shield's per-client limit would never apply (replicas run with
+  TRUST_FORWARDED_FOR=1)
+- a connection carries one request: plain requests go upstream with
+  `Connection: close`, and a websocket upgrade is piped through untouched
+  only once the replica answers 101. Anything after the first request
+  would otherwise reach the replica with whatever X-Forwarded-For the
+  client chose
+
+Replicas get SHARED_STATE_PATH (default shared.db), so the abuse shield and
+the webhook rate limit hold across all of them (portfolio.shared), and they
+share the outbox file, whose rows are leased to one worker at a time. Each
+replica gets its own METRICS_PORT (base + index). A replica that exits is
+restarted.
+
+    python -m portfolio.cluster --workers 4 --port 8501
+"""
+import argparse
+import asyncio
+import logging
+import os
+import re
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+
+logger = logging.getLogger(__name__)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COOKIE = "portfolio_worker"
+COOKIE_PATTERN = re.compile(rb"(?:^|;)\s*" + COOKIE.encode() + rb"=(\d+)")
+# Largest request or response head read before piping
+MAX_HEAD_BYTES = 65536
+BUFFER_BYTES = 65536
+
+
+async def _read_head(reader):
+    """
+    Bytes up to and including the blank line ending an HTTP head (b"" on EOF or oversize)
+    """
+    try:
+        return await reader.readuntil(b"\r\n\r\n")
+    except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+        return b""
+
+
+def sticky_worker(head, count):
+    """
+    The replica index a request's cookie names, or None
+    """
+    for line in head.split(b"\r\n")[1:]:
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"cookie":
+            match = COOKIE_PATTERN.search(value)
+            if match and int(match.group(1)) < count:
+                return int(match.group(1))
+    return None
+
+
+def _header(head, name):
+    """
+    A header's value in an HTTP head (b"" when absent)
+    """
+    for line in head.split(b"\r\n")[1:]:
+        key, _, value = line.partition(b":")
+        if key.strip().lower() == name:
+            return value.strip()
+    return b""
+
+
+def set_header(head, name, value):
+    """
+    The head with every `name` header replaced by one `name: value` line
+    """
+    lines = [line for line in head[:-4].split(b"\r\n")
+             if line.partition(b":")[0].strip().lower() != name.lower()]
+    lines.append(name + b": " + value)
+    return b"\r\n".join(lines) + b"\r\n\r\n"
+
+
+def forward_for(head, peer):
+    """
+    The request head with X-Forwarded-For set to `peer` alone
+
+    Whatever the client sent is dropped, so the entry the replica trusts
+    is always the address the proxy saw.
+    """
+    return set_header(head, b"X-Forwarded-For", (peer or "unknown").encode())
+
+
+def is_upgrade(head):
+    return b"upgrade" in _header(head, b"connection").lower() and bool(_header(head, b"upgrade"))
+
+
+async def _pipe(reader, writer):
+    try:
+        while True:
+            data = await reader.read(BUFFER_BYTES)
+            if not data:
+                break
+            writer.write(data)
+            await writer.drain()
+    except (ConnectionError, asyncio.CancelledError):
+        pass
+    finally:
+        try:
+            writer.close()
+        except Exception:
+            pass
+
+
+class StickyProxy:
+    """
+    Cookie-sticky, least-connections TCP proxy for HTTP and websocket traffic
+    """
+
+    def __init__(self, backends):
+        self.backends = backends
+        self.active = [0] * len(backends)
+        self._next = 0
+        self.stats = {"connections": 0, "sticky": 0, "assigned": 0, "errors": 0}
+
+    def _pick(self, excluded=()):
+        # Fewest open connections; ties rotate, so visitors arriving one at a time still spread out
+        count = len(self.backends)
+        candidates = [i for i in range(count) if i not in excluded]
+        if not candidates:
+            return None
+        index = min(candidates, key=lambda i: (self.active[i], (i - self._next) % count))
+        self._next = index + 1
+        return index
+
+    async def handle(self, client_reader, client_writer):
+        self.stats["connections"] += 1
+        head = await _read_head(client_reader)
+        if not head:
+            client_writer.close()
+            return
+        peer = client_writer.get_extra_info("peername")
+        head = forward_for(head, peer[0] if peer else None)
+        index = sticky_worker(head, len(self.backends))
+        assign = index is None
+        self.stats["assigned" if assign else "sticky"] += 1
+        tried = set()
+        while True:
+            if index is None:
+                index = self._pick(tried)
+                if index is None:
+                    self.stats["errors"] += 1
+                    client_writer.write(b"HTTP/1.1 502 Bad Gateway\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+                    client_writer.close()
+                    return
+            try:
+                upstream_reader, upstream_writer = await asyncio.open_connection(*self.backends[index])
+                break
+            except OSError:
+                # Down or restarting; a new assignment goes elsewhere, a sticky one too
+                tried.add(index)
+                index, assign = None, True
+        self.active[index] += 1
+        upgrade = is_upgrade(head)
+        if not upgrade:
+            # The replica closes after answering, so the client can't slip a second request in
+            head = set_header(head, b"Connection", b"close")
+        upstream = None
+        try:
+            upstream_writer.write(head)
+            await upstream_writer.drain()
+            if not upgrade:
+                # The request body; nothing after it gets a reply
+                upstream = asyncio.ensure_future(_pipe(client_reader, upstream_writer))
+            response = await _read_head(upstream_reader)
+            switched = response.split(b" ", 2)[1:2] == [b"101"]
+            if response and not switched:
+                response = set_header(response, b"Connection", b"close")
+            if response and assign:
+                status, _, rest = response.partition(b"\r\n")
+                cookie = f"Set-Cookie: {COOKIE}={index}; Path=/; HttpOnly; SameSite=Lax\r\n".encode()
+                response = status + b"\r\n" + cookie + rest
+            client_writer.write(response)
+            if not response:
+                client_writer.close()
+            elif switched:
+                await client_writer.drain()
+                upstream = asyncio.ensure_future(_pipe(client_reader, upstream_writer))
+                await _pipe(upstream_reader, client_writer)
+            elif upgrade:
+                # A refused upgrade may leave the replica's side open: relay its body and stop
+                await client_writer.drain()
+                length = _header(response, b"content-length")
+                body = await upstream_reader.readexactly(int(length)) if length.isdigit() else b""
+                client_writer.write(body)
+                await client_writer.drain()
+                client_writer.close()
+            else:
+                await client_writer.drain()
+                await _pipe(upstream_reader, client_writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            if upstream is not None:
+                upstream.cancel()
+            self.active[index] -= 1
+            upstream_writer.close()
+
+
+async def serve(backends, host, port):
+    proxy = StickyProxy(backends)
+    server = await asyncio.start_server(proxy.handle, host, port, limit=MAX_HEAD_BYTES)
+    async with server:
+        await server.serve_forever()
+
+
+class Cluster:
+    """
+    The replica processes: started, health-checked and restarted when they exit
+    """
+
+    def __init__(self, workers, base_port, host="127.0.0.1", shared_state_path="shared.db", extra_args=()):
+        self.ports = [base_port + i for i in range(workers)]
+        self.host = host
+        self.shared_state_path = shared_state_path
+        self.extra_args = list(extra_args)
+        self.processes = [None] * workers
+
+    def _environment(self, index):
+        env = dict(os.environ)
+        env.setdefault("SHARED_STATE_PATH", self.shared_state_path)
+        # Only the proxy can reach the replicas, so its X-Forwarded-For is the visitor
+        env["TRUST_FORWARDED_FOR"] = "1"
+        env["METRICS_PORT"] = str(int(env.get("METRICS_PORT", "9108")) + index)
+        return env
+
+    def start(self, index):
+        command = [
+            sys.executable, "-m", "streamlit", "run", os.path.join(ROOT, "app.py"),
+            "--server.headless", "true", "--server.address", self.host, "--server.port", str(self.ports[index]),
+            "--browser.gatherUsageStats", "false", *self.extra_args,
+        ]
+        self.processes[index] = subprocess.Popen(command, cwd=ROOT, env=self._environment(index))
+
+    def start_all(self):
+        for index in range(len(self.ports)):
+            self.start(index)
+
+    def wait_healthy(self, timeout=60.0):
+        deadline = time.monotonic() + timeout
+        for port in self.ports:
+            while True:
+                try:
+                    urllib.request.urlopen(f"http://{self.host}:{port}/_stcore/health", timeout=2)
+                    break
+                except OSError:
+                    if time.monotonic() > deadline:
+                        raise TimeoutError(f"replica on port {port} did not come up")
+                    time.sleep(0.1)
+
+    def supervise(self):
+        """
+        Restart replicas that exited; call periodically
+        """
+        for index, process in enumerate(self.processes):
+            if process is not None and process.poll() is not None:
+                logger.warning("Replica %s exited with %s; restarting", index, process.returncode)
+                self.start(index)
+
+    def stop(self):
+        for process in self.processes:
+            if process is not None and process.poll() is None:
+                process.terminate()
+        for process in self.processes:
+            if process is not None:
+                try:
+                    process.wait(10)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+
+
+async def _run(cluster, host, port):
+    proxy = asyncio.ensure_future(serve([(cluster.host, p) for p in cluster.ports], host, port))
+    while not proxy.done():
+        await asyncio.sleep(1)
+        cluster.supervise()
+    proxy.result()
+
+
+def _interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run app.py on several processes behind a sticky proxy")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--host", default="127.0.0.1", help="address the proxy listens on")
+    parser.add_argument("--port", type=int, default=8501, help="port the proxy listens on")
+    parser.add_argument("--base-port", type=int, default=8510, help="first replica port")
+    parser.add_argument("--shared-state", default="shared.db", help="SHARED_STATE_PATH unless already set")
+    args, extra = parser.parse_known_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+
+    cluster = Cluster(args.workers, args.base_port, shared_state_path=args.shared_state, extra_args=extra)
+    # SIGTERM (e.g. from a process manager) shuts the replicas down like Ctrl-C
+    signal.signal(signal.SIGTERM, _interrupt)
+    cluster.start_all()
+    try:
+        cluster.wait_healthy()
+        print(f"{args.workers} replicas on ports {cluster.ports[0]}-{cluster.ports[-1]}; "
+              f"proxy on http://{args.host}:{args.port}", flush=True)
+        asyncio.run(_run(cluster, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        cluster.stop()
+
+
+if __name__ == "__main__":
+    main()
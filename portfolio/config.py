@@ -0,0 +1,264 @@
+"""
+Typed settings, resolved once per process
+
+Every setting is named after its environment variable (field
+discord_webhook_url <- DISCORD_WEBHOOK_URL). Values come from the
+environment first (an empty variable counts as unset), then from the top level of Streamlit's secrets.toml
+(~/.streamlit/secrets.toml, then .streamlit/secrets.toml; SECRETS_FILES
+overrides the list, os.pathsep-separated), then the defaults below.
+
+get_settings() is a plain attribute read after the first call. A daemon
+thread polls the secrets files' mtimes and swaps in a fresh Settings when
+one changes, so a new webhook URL or SMTP relay applies without a restart.
+Fields marked "startup" size pools, queues and limiters that are built
+once; changing those needs a restart.
+
+    python -m portfolio.config          (effective settings, URLs and secrets redacted)
+"""
+import argparse
+import dataclasses
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+SECRETS_FILES = os.getenv("SECRETS_FILES", os.pathsep.join([
+    os.path.expanduser("~/.streamlit/secrets.toml"),
+    os.path.join(os.getcwd(), ".streamlit", "secrets.toml"),
+])).split(os.pathsep)
+# Seconds between secrets file checks (0 disables hot reload)
+WATCH_SECONDS = float(os.getenv("CONFIG_WATCH_SECONDS", "2"))
+
+TRUE = ("1", "true", "yes", "on")
+# Fields printed redacted by `python -m portfolio.config`
+SECRET_SUFFIXES = ("_token", "_secret", "_password", "_key")
+
+
+@dataclass(frozen=True)
+class Settings:
+    # Notification targets (reloaded)
+    discord_webhook_url: str = ""
+    notify_webhook_url: str = ""
+    notify_sinks: tuple = ("discord",)
+    notify_policy: str = "first_success"
+    smtp_host: str = "localhost"
+    smtp_port: int = 25
+    smtp_from: str = "portfolio@localhost"
+    smtp_to: str = "devenbhasin4123@gmail.com"
+    smtp_timeout: float = 10.0
+    notify_deadline_seconds: float = 15.0
+    # HTTP client (startup)
+    http_pool_size: int = 10
+    http_connect_timeout: float = 3.05
+    http_read_timeout: float = 10.0
+    http_retries: int = 2
+    notify_threads: int = 8
+    # Webhook rate limiting and circuit breaking (startup)
+    webhook_burst: int = 5
+    webhook_window_seconds: float = 2.0
+    webhook_max_wait_seconds: float = 60.0
+    breaker_failures: int = 5
+    breaker_reset_seconds: float = 30.0
+    # Outbox and delivery worker (startup)
+    outbox_path: str = "outbox.db"
+    outbox_retry_base_seconds: float = 30.0
+    outbox_retry_max_seconds: float = 3600.0
+    outbox_max_attempts: int = 12
+    outbox_lease_seconds: float = 600.0
+    outbox_batch_size: int = 20
+    outbox_poll_seconds: float = 15.0
+    contact_queue_size: int = 100
+    digest_mode: bool = False
+    digest_window_seconds: float = 5.0
+    digest_max_messages: int = 10
+    # Contact abuse shield (startup)
+    shield_session_limit: int = 3
+    shield_client_limit: int = 10
+    shield_window_seconds: float = 600.0
+    shield_duplicate_seconds: float = 86400.0
+    shield_max_keys: int = 10000
+    # Visitor analytics (startup)
+    analytics_enabled: bool = True
+    analytics_path: str = "analytics.db"
+    analytics_buffer_size: int = 8192
+    analytics_flush_seconds: float = 10.0
+    # Project repository metadata (startup)
+    repo_metadata: bool = True
+    github_api_url: str = "https://api.github.com"
+    github_token: str = ""
+    repo_fresh_seconds: float = 3600.0
+    repo_stale_seconds: float = 86400.0
+    repo_retry_seconds: float = 300.0
+    repo_refresh_threads: int = 2
+    # SQLite file for state every replica must share (startup; see portfolio.cluster)
+    shared_state_path: str = ""
+    # Take the client address from the last X-Forwarded-For entry (startup; set behind portfolio.cluster)
+    trust_forwarded_for: bool = False
+    # Self-hosted resume (startup)
+    resume_path: str = ""
+    resume_host: str = "127.0.0.1"
+    resume_port: int = 8502
+    resume_url_prefix: str = ""
+    # Content data file and how often it's checked for edits (startup)
+    content_path: str = ""
+    content_watch_seconds: float = 2.0
+    # Project grid: cards per page, and per "Show more" (startup)
+    project_page_size: int = 8
+    # HTTP contact API (startup)
+    contact_max_body_bytes: int = 65536
+    contact_allowed_origins: tuple = ()
+    # Feature toggles and assets (startup)
+    portfolio_metrics: bool = False
+    metrics_host: str = "127.0.0.1"
+    metrics_port: int = 9108
+    stylesheet_url_prefix: str = "app/static/"
+    startup_warmup: bool = True
+
+    @classmethod
+    def load(cls, environ=None, secrets=None):
+        """
+        Settings from an environment mapping and parsed secrets
+        """
+        environ = os.environ if environ is None else environ
+        secrets = {} if secrets is None else secrets
+        values = {}
+        for f in dataclasses.fields(cls):
+            key = f.name.upper()
+            # Empty counts as unset, as with the old `os.getenv(...) or st.secrets...`
+            if environ.get(key):
+                raw = environ[key]
+            elif key in secrets and not isinstance(secrets[key], dict):
+                raw = secrets[key]
+            else:
+                continue
+            try:
+                values[f.name] = _coerce(raw, f.type)
+            except ValueError:
+                logger.warning("Ignoring invalid %s=%r", key, raw)
+        return cls(**values)
+
+
+def _coerce(raw, kind):
+    if kind is tuple:
+        if isinstance(raw, (list, tuple)):
+            return tuple(str(item).strip() for item in raw if str(item).strip())
+        return tuple(item.strip() for item in str(raw).split(",") if item.strip())
+    if kind is bool:
+        return raw if isinstance(raw, bool) else str(raw).strip().lower() in TRUE
+    return kind(raw)
+
+
+def read_secrets(paths=SECRETS_FILES):
+    """
+    Merged top-level keys of the secrets files (later files win)
+    """
+    secrets = {}
+    for path in paths:
+        try:
+            with open(path, "rb") as f:
+                # Imported only when a secrets file exists
+                import tomllib
+                secrets.update(tomllib.load(f))
+        except FileNotFoundError:
+            continue
+        except (OSError, ValueError):  # tomllib.TOMLDecodeError is a ValueError
+            logger.exception("Could not read secrets file %s", path)
+    return secrets
+
+
+def _mtimes(paths=SECRETS_FILES):
+    stamps = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            stamps.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            stamps.append(None)
+    return stamps
+
+
+_settings = None
+_settings_lock = threading.Lock()
+_listeners = []
+_watcher = None
+
+
+def get_settings():
+    """
+    The process-wide settings (hot-reloaded from the secrets files)
+    """
+    if _settings is None:
+        with _settings_lock:
+            if _settings is None:
+                stamps = _mtimes()
+                _reload()
+                _start_watcher(stamps)
+    return _settings
+
+
+def on_reload(callback):
+    """
+    Call callback(old, new) whenever the settings are reloaded
+    """
+    _listeners.append(callback)
+    return callback
+
+
+def _reload():
+    global _settings
+    old, _settings = _settings, Settings.load(secrets=read_secrets())
+    return old, _settings
+
+
+def reload():
+    """
+    Re-read the environment and secrets now; returns the new settings
+    """
+    with _settings_lock:
+        old, new = _reload()
+    if old is not None and old != new:
+        changed = [f.name for f in dataclasses.fields(Settings) if getattr(old, f.name) != getattr(new, f.name)]
+        logger.info("Settings reloaded: %s changed", ", ".join(changed))
+        for callback in list(_listeners):
+            try:
+                callback(old, new)
+            except Exception:
+                logger.exception("Settings reload listener failed")
+    return new
+
+
+def _watch(stamps):
+    while True:
+        time.sleep(WATCH_SECONDS)
+        current = _mtimes()
+        if current != stamps:
+            stamps = current
+            reload()
+
+
+def _start_watcher(stamps):
+    global _watcher
+    if _watcher is None and WATCH_SECONDS > 0:
+        _watcher = threading.Thread(target=_watch, args=(stamps,), name="config-watcher", daemon=True)
+        _watcher.start()
+
+
+def main():
+    argparse.ArgumentParser(description="Print the effective settings").parse_args()
+    settings, secrets = get_settings(), read_secrets()
+    for f in dataclasses.fields(Settings):
+        key, value = f.name.upper(), getattr(settings, f.name)
+        source = "env" if os.environ.get(key) else "secrets" if key in secrets else "default"
+        if f.name.endswith("_url") and value:
+            # Webhook URLs embed their token
+            value = value.split("://")[0] + "://…"
+        elif f.name.endswith(SECRET_SUFFIXES) and value:
+            value = "…"
+        print(f"{key:<28} {value!r:<40} {source}")
+
+
+if __name__ == "__main__":
+    main()
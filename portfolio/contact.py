@@ -0,0 +1,38 @@
+"""
+Contact form submissions
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+
+
+@dataclass(frozen=True)
+class Submission:
+    """
+    A validated message from the contact form
+    """
+    name: str
+    email: str
+    subject: str
+    message: str
+    submitted_at: datetime = field(default_factory=datetime.now)
+
+
+def validate(name, email, message):
+    """
+    Error message for the visitor, or None when the form is complete
+    """
+    if not name or not email or not message:
+        return "Please fill in all required fields (*)"
+    if "@" not in email:
+        return "Please enter a valid email address"
+    return None
+
+
+def mailto_link(submission):
+    """
+    Direct email link used when the message cannot be delivered for us
+    """
+    return (
+        f"mailto:devenbhasin4123@gmail.com?subject=Portfolio Contact: {submission.subject}"
+        f"&body=Name: {submission.name}%0D%0AEmail: {submission.email}%0D%0A%0D%0AMessage:%0D%0A{submission.message}"
+    )
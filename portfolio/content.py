@@ -0,0 +1,425 @@
+"""
+Typed portfolio content: experience, projects, education, skills
+
+Strings may contain inline HTML (e.g. <strong>) and are rendered as-is.
+
+The content below is built in. With CONTENT_PATH set, it comes from that
+JSON file instead (`python -m portfolio.content content.json` writes the
+built-in content as a starting point). The file is watched: on a change it
+is re-read and diffed against the current content, items that didn't
+change keep their objects (and so their cached fragments), on_change
+listeners get the changed positions to invalidate just those, and every
+connected session reruns to show the edit.
+"""
+import argparse
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+
+from portfolio.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+CONTENT_PATH = get_settings().content_path
+# Seconds between checks of CONTENT_PATH (0 disables hot reload)
+WATCH_SECONDS = get_settings().content_watch_seconds
+
+
+@dataclass(frozen=True)
+class Metric:
+    icon: str
+    title: str
+    lines: tuple
+    highlight: str
+
+
+@dataclass(frozen=True)
+class Experience:
+    icon: str
+    role: str
+    organisation: str
+    period: str
+    bullets: tuple
+    # Only from a content file: the built-in entries carry no tags
+    skills: tuple = ()
+
+
+@dataclass(frozen=True)
+class Project:
+    slug: str
+    icon: str
+    title: str
+    tagline: str
+    bullets: tuple
+    url: str
+    skills: tuple
+    link_label: str = "View Project"
+    # Live GitHub metadata, filled in per render by portfolio.repos
+    repo: object = None
+
+
+@dataclass(frozen=True)
+class SkillGroup:
+    icon: str
+    title: str
+    skills: tuple
+
+
+@dataclass(frozen=True)
+class Education:
+    icon: str
+    degree: str
+    field: str
+    institution: str
+    period: str
+    result: str
+
+
+@dataclass(frozen=True)
+class Portfolio:
+    metrics: tuple
+    experience: tuple
+    projects: tuple
+    skills: tuple
+    education: tuple
+
+
+# Items whose hashes are memoised; bounded so replaced items aren't kept alive
+HASH_MEMO_SIZE = 4096
+
+
+@lru_cache(maxsize=HASH_MEMO_SIZE)
+def content_hash(item):
+    """
+    Stable digest of a content item, used as its fragment cache key
+    """
+    return hashlib.sha1(repr(item).encode()).hexdigest()[:16]
+
+
+PORTFOLIO = Portfolio(
+    metrics=(
+        Metric("🎓", "Education", ("Software Engineering (Hons)", "University of Queensland"), "GPA: 5.5/7"),
+        Metric("💼", "Experience", ("Research Student at CSIRO", "Data Analyst Intern"), "93% Model Accuracy"),
+        Metric("🚀", "Projects", ("8+ Major Projects", "AI/ML & Full-Stack"), "30% Efficiency Gains"),
+    ),
+    experience=(
+        Experience("🔬", "Research Student", "CSIRO", "Nov 2024 – Feb 2025", (
+            "Developed image segmentation models to quantify blackleg disease in canola",
+            "Implemented UNet, ResUNet, and SegFormer architectures achieving <strong>93% mean IoU</strong>",
+            "Applied ViT and EfficientNet for disease quantification with expert correlation",
+        )),
+        Experience("📊", "Data Analyst Intern", "FutureXEnergy", "Sep 2023 – Dec 2023", (
+            "Automated Excel workflows using Python, increasing efficiency by <strong>30%</strong>",
+            "Created interactive dashboards for energy consumption analysis",
+            "Built data validation tools ensuring downstream analysis integrity",
+        )),
+    ),
+    projects=(
+        Project(
+            "later", "🛒", "Later - Chrome Extension", "Full-Stack Wishlist Application", (
+                "Full-stack app (Python API, Node.js frontend, Chrome Extension) on AWS",
+                "Layered Architecture for maintainability and rapid development",
+                "Load tested with k6 for <strong>50 concurrent users</strong>",
+                "Web-scraping service for <strong>8+ e-commerce sites</strong>",
+            ),
+            "https://github.com/dbhasin4123",
+            ("Python", "Node.js", "AWS", "Docker", "PostgreSQL"),
+        ),
+        Project(
+            "news-summarizer", "📰", "News Summarizer", "AI-Powered News Analysis", (
+                "Streamlit interface with personalized article delivery",
+                "Llama LLM integration for AI-powered summaries",
+                "Smart filtering by interests, location, and time range",
+                "NLTK preprocessing for enhanced text analysis",
+            ),
+            "https://github.com/dbhasin4123/news-summarizer",
+            ("Python", "Llama 3.2", "Streamlit", "OpenAI"),
+        ),
+        Project(
+            "ai-recruiter", "🤖", "AI Recruiter Platform", "Automated Recruitment System", (
+                "AI agents for resume analysis and candidate screening",
+                "PDF data extraction with confidence scoring",
+                "Intelligent job-to-candidate matching",
+                "OpenAI GPT integration for advanced analysis",
+            ),
+            "https://github.com/dbhasin4123/ai-recruiter",
+            ("Python", "OpenAI", "Streamlit", "PDF Processing"),
+        ),
+        Project(
+            "doc-assistant", "📄", "Doc Assistant", "RAG-based Document AI", (
+                "Local AI assistant using RAG pipeline",
+                "Offline document conversations",
+                "ChromaDB for semantic search",
+                "LangChain integration for advanced NLP",
+            ),
+            "https://github.com/dbhasin4123/doc-assistant",
+            ("Python", "LangChain", "ChromaDB", "RAG"),
+        ),
+        Project(
+            "translatify", "🌐", "Translatify", "Real-time Translation App", (
+                "React Native app for elderly immigrants",
+                "Real-time translation with WebSocket",
+                "Accessibility-focused design",
+                "Multi-language support",
+            ),
+            "https://github.com/dbhasin4123/Elderly-Immigrant-Integration",
+            ("React Native", "Node.js", "WebSocket", "Translation APIs"),
+        ),
+        Project(
+            "medical-image-segmentation", "🏥", "Medical Image Segmentation", "Enhanced U-Net Model", (
+                "Skin lesion segmentation from ISIC 2018 dataset",
+                "Enhanced U-Net architecture in TensorFlow",
+                "Achieved <strong>90% Dice coefficient</strong>",
+                "Medical AI with high precision requirements",
+            ),
+            "https://github.com/dbhasin4123/PatternAnalysis-2023/tree/topic-recognition/recognition/Improved%20UNet%20Model%20ISIC-48241328",
+            ("TensorFlow", "Medical AI", "Computer Vision"),
+        ),
+        Project(
+            "weather-energy", "🌦️", "Weather-Energy Correlation", "Research & Thesis Project", (
+                "Predictive models for NEM Australia",
+                "Weather uncertainty and energy dispatch analysis",
+                "Spatio-temporal correlation studies",
+            ),
+            "https://github.com/dbhasin4123/REIT4842_Thesis",
+            ("Python", "Machine Learning", "Statistical Analysis"),
+            link_label="View Research",
+        ),
+        Project(
+            "iot-blockchain", "🏭", "IoT Blockchain Monitoring", "Production Quality Control", (
+                "End-to-end IoT system with C firmware",
+                "nRF52 and STM32 platforms with Zephyr RTOS",
+                "Proof-of-Work blockchain for data integrity",
+            ),
+            "https://github.com/dbhasin4123/Blockchain-Embedded-system",
+            ("C", "Zephyr RTOS", "Blockchain", "IoT"),
+        ),
+    ),
+    skills=(
+        SkillGroup("🤖", "AI/ML & Data Science", (
+            "TensorFlow", "PyTorch", "Scikit-Learn", "LangChain", "RAG",
+            "OpenAI", "Ollama", "NumPy", "Pandas", "Matplotlib",
+        )),
+        SkillGroup("💻", "Programming Languages", (
+            "Python", "JavaScript", "C/C++", "Java", "Dart", "HTML/CSS", "R", "MATLAB",
+        )),
+        SkillGroup("🗄️", "Databases", ("MySQL", "PostgreSQL", "SQLite3", "ChromaDB")),
+        SkillGroup("☁️", "Cloud & DevOps", ("AWS", "Docker", "Kubernetes", "Terraform", "Git", "GitHub")),
+        SkillGroup("🌐", "Web & Mobile Development", (
+            "React", "React Native", "Flutter", "Streamlit", "Flask", "Express.js", "Node.js",
+        )),
+        SkillGroup("🛠️", "Tools & Environment", ("VS Code", "Google Colab", "Linux", "Windows", "WSL", "Poetry")),
+    ),
+    education=(
+        Education("🎓", "Bachelor of Engineering (Hons)", "Software Engineering w/ Computer Engineering",
+                  "University of Queensland, Australia", "July 2023 - July 2025", "GPA: 5.5/7"),
+        Education("🎓", "Bachelor of Engineering", "Computer Engineering",
+                  "TIET, Patiala, India", "Sep 2021 - June 2023", "CGPA: 8/10"),
+        Education("🏫", "12th Standard", "Maths, Physics, Chemistry",
+                  "GPS, Punjab, India", "Completed: June 2021", "94.6%"),
+    ),
+)
+
+
+# Item class per Portfolio field, for reading content files
+ITEM_CLASSES = {
+    "metrics": Metric,
+    "experience": Experience,
+    "projects": Project,
+    "skills": SkillGroup,
+    "education": Education,
+}
+
+
+def _item(cls, data):
+    values = {}
+    for f in dataclasses.fields(cls):
+        if f.name in data:
+            value = data[f.name]
+            values[f.name] = tuple(value) if f.type is tuple else value
+    return cls(**values)
+
+
+def from_data(data, previous=None, previous_data=None):
+    """
+    A Portfolio from parsed content-file JSON
+
+    Items whose JSON equals the same position in previous_data are taken
+    from `previous` as they are, so a reload builds only what was edited
+    and everything else keeps its object (and its cached hash and fragments).
+    """
+    sections = {}
+    for kind, cls in ITEM_CLASSES.items():
+        before = getattr(previous, kind) if previous_data is not None else ()
+        before_data = previous_data.get(kind, ()) if previous_data is not None else ()
+        sections[kind] = tuple(
+            before[position] if position < len(before_data) and before_data[position] == item else _item(cls, item)
+            for position, item in enumerate(data.get(kind, ()))
+        )
+    return Portfolio(**sections)
+
+
+def to_data(portfolio):
+    """
+    The JSON-ready form of a Portfolio, without per-render fields
+    """
+    return {kind: [{k: v for k, v in dataclasses.asdict(item).items() if k != "repo"}
+                   for item in getattr(portfolio, kind)]
+            for kind in ITEM_CLASSES}
+
+
+def read_data(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def read_content(path):
+    return from_data(read_data(path))
+
+
+def diff(old, new):
+    """
+    {section: [(position, old item or None, new item or None), ...]} for
+    every position whose item changed, was added or was removed
+    """
+    changes = {}
+    for kind in ITEM_CLASSES:
+        before, after = getattr(old, kind), getattr(new, kind)
+        changed = []
+        for position in range(max(len(before), len(after))):
+            previous = before[position] if position < len(before) else None
+            item = after[position] if position < len(after) else None
+            if previous is not item and previous != item:
+                changed.append((position, previous, item))
+        if changed:
+            changes[kind] = changed
+    return changes
+
+
+_content = None
+# The parsed file behind _content (None for the built-in content)
+_data = None
+_content_lock = threading.Lock()
+_listeners = []
+_watcher = None
+
+
+def load_content():
+    """
+    The portfolio content for this process
+    """
+    if not CONTENT_PATH:
+        return PORTFOLIO
+    if _content is None:
+        with _content_lock:
+            if _content is None:
+                _load(_mtime())
+    return _content
+
+
+def _load(stamp):
+    global _content, _data
+    try:
+        _data = read_data(CONTENT_PATH)
+        _content = from_data(_data)
+    except (OSError, ValueError, TypeError, AttributeError):
+        logger.exception("Could not read %s; using the built-in content", CONTENT_PATH)
+        _content, _data = PORTFOLIO, None
+    _start_watcher(stamp)
+
+
+def on_change(callback):
+    """
+    Call callback(old, new, changes) after the content file is reloaded
+    """
+    _listeners.append(callback)
+    return callback
+
+
+def reload_content():
+    """
+    Re-read CONTENT_PATH and apply whatever changed; returns diff(old, new)
+    """
+    global _content, _data
+    try:
+        data = read_data(CONTENT_PATH)
+        with _content_lock:
+            old = _content
+            new = from_data(data, old, _data)
+            changes = diff(old, new)
+            if changes:
+                _content = new
+            _data = data
+    except (OSError, ValueError, TypeError, AttributeError):
+        # Most likely saved half-way; keep serving what we have
+        logger.exception("Could not reload %s; keeping the current content", CONTENT_PATH)
+        return {}
+    if not changes:
+        return changes
+    logger.info("Content reloaded: %s", ", ".join(f"{len(items)} {kind}" for kind, items in changes.items()))
+    for callback in list(_listeners):
+        try:
+            callback(old, new, changes)
+        except Exception:
+            logger.exception("Content reload listener failed")
+    rerun_sessions()
+    return changes
+
+
+def rerun_sessions():
+    """
+    Rerun every connected Streamlit session, as a source file change would
+    """
+    from streamlit.runtime import Runtime
+
+    if not Runtime.exists():
+        return 0
+    # Streamlit has no public way to reach other sessions
+    sessions = Runtime.instance()._session_mgr.list_active_sessions()
+    for info in sessions:
+        info.session.request_rerun(None)
+    return len(sessions)
+
+
+def _mtime():
+    try:
+        stat = os.stat(CONTENT_PATH)
+        return stat.st_mtime_ns, stat.st_size
+    except OSError:
+        return None
+
+
+def _watch(stamp):
+    while True:
+        time.sleep(WATCH_SECONDS)
+        current = _mtime()
+        if current != stamp:
+            stamp = current
+            reload_content()
+
+
+def _start_watcher(stamp):
+    global _watcher
+    if _watcher is None and WATCH_SECONDS > 0:
+        _watcher = threading.Thread(target=_watch, args=(stamp,), name="content-watcher", daemon=True)
+        _watcher.start()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write the built-in content as a CONTENT_PATH file")
+    parser.add_argument("path")
+    args = parser.parse_args()
+    with open(args.path, "w", encoding="utf-8") as f:
+        json.dump(to_data(PORTFOLIO), f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    print(f"Wrote {args.path}; set CONTENT_PATH={args.path} to serve it")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Background delivery of contact submissions
+
+The contact form records each message in the outbox and nudges a single
+process-wide worker thread, which talks to Discord so a slow or failing
+webhook never holds up a visitor's rerun. The worker also polls the outbox,
+so messages that could not be queued or that failed earlier are retried.
+"""
+import logging
+import queue
+import threading
+import time
+
+from portfolio.config import get_settings
+from portfolio.discord import MAX_EMBEDS
+from portfolio.outbox import get_outbox
+from portfolio.sinks import get_notifier
+
+logger = logging.getLogger(__name__)
+
+# Wake-ups waiting for the worker; beyond this the row waits for the next poll
+QUEUE_SIZE = get_settings().contact_queue_size
+# Rows delivered per outbox query, and seconds between polls when idle
+BATCH_SIZE = get_settings().outbox_batch_size
+POLL_SECONDS = get_settings().outbox_poll_seconds
+# Digest mode: wait up to WINDOW seconds (or MAX messages) and send them together
+DIGEST_MODE = get_settings().digest_mode
+DIGEST_WINDOW_SECONDS = get_settings().digest_window_seconds
+DIGEST_MAX_MESSAGES = min(get_settings().digest_max_messages, MAX_EMBEDS)
+
+
+class DeliveryWorker:
+    """
+    Bounded wake-up queue plus a daemon thread that drains the outbox
+    """
+
+    def __init__(self, outbox, maxsize=QUEUE_SIZE, poll_seconds=POLL_SECONDS, digest=DIGEST_MODE,
+                 digest_window=DIGEST_WINDOW_SECONDS, digest_max=DIGEST_MAX_MESSAGES):
+        self.outbox = outbox
+        self.poll_seconds = poll_seconds
+        self.digest = digest
+        self.digest_window = digest_window
+        self.digest_max = digest_max
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._thread = None
+        self._lock = threading.Lock()
+        self.stats = {"enqueued": 0, "shed": 0, "delivered": 0, "failed": 0, "digests": 0}
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="contact-delivery", daemon=True)
+                self._thread.start()
+        return self
+
+    def submit(self, row_id):
+        """
+        Wake the worker for an outbox row without blocking
+
+        False means the queue is full; the row is already stored and will
+        go out on the next poll.
+        """
+        try:
+            self._queue.put_nowait(row_id)
+        except queue.Full:
+            self.stats["shed"] += 1
+            return False
+        self.stats["enqueued"] += 1
+        return True
+
+    def depth(self):
+        return self._queue.qsize()
+
+    def drain(self):
+        """
+        Deliver due outbox rows batch by batch until none are left
+        """
+        while True:
+            # Claimed, not just read: other replicas may be draining the same outbox
+            rows = self.outbox.claim(BATCH_SIZE)
+            if self.digest and len(rows) > 1:
+                self._deliver_digests(rows)
+            else:
+                for row_id, submission in rows:
+                    self._deliver_one(row_id, submission)
+            if len(rows) < BATCH_SIZE:
+                return
+
+    def _record(self, row_id, success, msg):
+        if success:
+            self.outbox.mark_delivered(row_id)
+            self.stats["delivered"] += 1
+        else:
+            self.outbox.mark_failed(row_id, msg)
+            self.stats["failed"] += 1
+            logger.warning("Contact message #%s not delivered: %s", row_id, msg)
+
+    def _deliver_one(self, row_id, submission):
+        try:
+            success, msg = deliver(submission)
+        except Exception as e:
+            success, msg = False, str(e)
+        self._record(row_id, success, msg)
+
+    def _deliver_digests(self, rows):
+        """
+        Hand rows to the sinks in digest-sized batches (multi-embed posts for Discord)
+        """
+        for start in range(0, len(rows), self.digest_max):
+            chunk = rows[start:start + self.digest_max]
+            self.stats["digests"] += 1
+            try:
+                results = get_notifier().notify_many([submission for _, submission in chunk])
+            except Exception as e:
+                results = [(False, str(e))] * len(chunk)
+            for (row_id, _), (success, msg) in zip(chunk, results):
+                self._record(row_id, success, msg)
+
+    def _wait_for_digest(self):
+        """
+        Hold the first wake-up for the digest window, or until digest_max arrive
+        """
+        deadline = time.monotonic() + self.digest_window
+        arrived = 1
+        while arrived < self.digest_max:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                self._queue.get(timeout=remaining)
+                arrived += 1
+            except queue.Empty:
+                return
+
+    def _run(self):
+        while True:
+            try:
+                self._queue.get(timeout=self.poll_seconds)
+                if self.digest:
+                    self._wait_for_digest()
+                while True:
+                    self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                self.drain()
+            except Exception:
+                logger.exception("Delivery worker error")
+
+
+def deliver(submission):
+    """
+    Send one submission through the configured sinks
+    """
+    return get_notifier().notify(submission)
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def get_delivery_worker():
+    """
+    The process-wide worker, started on first use
+    """
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = DeliveryWorker(get_outbox()).start()
+    return _worker
+
+
+def accept(submission):
+    """
+    Save a validated submission and wake the worker
+
+    Returns None when the message is on its way, otherwise the reason it
+    cannot be delivered for the visitor (who then gets the mailto link).
+    """
+    # Nothing stored when no sink could send it: the visitor emails instead
+    if not get_notifier().configured():
+        return "No notification sink configured"
+    # Saved to the outbox before any network I/O
+    try:
+        row_id = get_outbox().add(submission)
+    except Exception as e:
+        return f"could not save your message ({e})"
+    # A full queue is fine: the row stays pending until the next poll
+    get_delivery_worker().submit(row_id)
+    return None
@@ -0,0 +1,206 @@
+"""
+Discord webhook notifications for the contact form
+"""
+from datetime import datetime
+
+from portfolio.config import get_settings
+from portfolio.resilience import get_breaker
+
+# Discord's limits for a single webhook message
+MAX_EMBEDS = 10
+MAX_EMBED_CHARS = 6000
+
+
+def get_webhook_url():
+    """
+    Webhook URL from the environment or Streamlit secrets ("" when not configured)
+    """
+    return get_settings().discord_webhook_url
+
+
+def post_webhook(webhook_url, payload, deadline=None):
+    """
+    Post a payload through the Discord circuit breaker and the webhook's
+    rate limiter (waits out 429s), within the deadline if one is given
+    """
+    # Imported on first send: requests is the bulk of a cold start otherwise
+    from portfolio.http import CONNECT_TIMEOUT, READ_TIMEOUT, get_session
+    from portfolio.ratelimit import get_rate_limiter
+
+    session = get_session()
+    limiter = get_rate_limiter(webhook_url)
+
+    def attempt():
+        if deadline is None:
+            return session.post(webhook_url, json=payload)
+        return session.post(webhook_url, json=payload, timeout=deadline.timeout(CONNECT_TIMEOUT, READ_TIMEOUT))
+
+    # A 429, even one the limiter gave up waiting out, shows Discord is up, and
+    # our own deadline running out says nothing about it: neither opens the breaker
+    return get_breaker("discord").call(
+        lambda: limiter.send(attempt, deadline),
+        is_failure=lambda response: response.status_code >= 500,
+    )
+
+
+def build_embed(name, email, subject, message, sent_at=None):
+    """
+    Embed describing one contact message
+    """
+    sent_at = sent_at or datetime.now()
+    return {
+        "title": "🌟 New Portfolio Contact Message",
+        "description": f"**Subject:** {subject}",
+        "color": 6719530,
+        "fields": [
+            {
+                "name": "👤 Name",
+                "value": name,
+                "inline": True
+            },
+            {
+                "name": "📧 Email",
+                "value": email,
+                "inline": True
+            },
+            {
+                "name": "📝 Message",
+                "value": message[:1000] + ("..." if len(message) > 1000 else ""),
+                "inline": False
+            }
+        ],
+        "footer": {
+            "text": f"Portfolio Website • {sent_at.strftime('%Y-%m-%d %H:%M:%S')}"
+        },
+        "thumbnail": {
+            "url": "https://cdn-icons-png.flaticon.com/512/3682/3682321.png"
+        }
+    }
+
+
+def embed_size(embed):
+    """
+    Characters Discord counts towards the 6000-per-message embed limit
+    """
+    return (
+        len(embed["title"]) + len(embed["description"]) + len(embed["footer"]["text"])
+        + sum(len(field["name"]) + len(field["value"]) for field in embed["fields"])
+    )
+
+
+def pack_embeds(embeds):
+    """
+    Group embeds into as few webhook messages as Discord's limits allow
+    """
+    messages, current, size = [], [], 0
+    for embed in embeds:
+        n = embed_size(embed)
+        if current and (len(current) == MAX_EMBEDS or size + n > MAX_EMBED_CHARS):
+            messages.append(current)
+            current, size = [], 0
+        current.append(embed)
+        size += n
+    if current:
+        messages.append(current)
+    return messages
+
+
+def send_discord_notification(name, email, subject, message, sent_at=None, deadline=None):
+    """
+    Function to send notification to Discord using webhook
+    """
+    try:
+        webhook_url = get_webhook_url()
+
+        if not webhook_url:
+            return False, "Discord webhook URL not configured"
+
+        payload = {
+            "username": "Portfolio Bot",
+            "avatar_url": "https://cdn-icons-png.flaticon.com/512/3682/3682321.png",
+            "embeds": [build_embed(name, email, subject, message, sent_at)]
+        }
+
+        response = post_webhook(webhook_url, payload, deadline)
+
+        if response.status_code == 204:
+            return True, "Discord notification sent successfully!"
+        else:
+            return False, f"Discord API returned status code: {response.status_code}"
+
+    except Exception as e:
+        return False, f"Error sending Discord notification: {str(e)}"
+
+
+def send_discord_digest(submissions, deadline=None):
+    """
+    Several submissions as multi-embed messages (digest mode)
+
+    Returns one (submissions, success, message) tuple per webhook post.
+    """
+    webhook_url = get_webhook_url()
+    embeds = [build_embed(s.name, s.email, s.subject, s.message, s.submitted_at) for s in submissions]
+    results, offset = [], 0
+    for group in pack_embeds(embeds):
+        batch = submissions[offset:offset + len(group)]
+        offset += len(group)
+        if not webhook_url:
+            results.append((batch, False, "Discord webhook URL not configured"))
+            continue
+        payload = {
+            "username": "Portfolio Bot",
+            "avatar_url": "https://cdn-icons-png.flaticon.com/512/3682/3682321.png",
+            "embeds": group
+        }
+        if len(group) > 1:
+            payload["content"] = f"📬 {len(group)} new portfolio messages"
+        try:
+            response = post_webhook(webhook_url, payload, deadline)
+            if response.status_code == 204:
+                results.append((batch, True, "Discord notification sent successfully!"))
+            else:
+                results.append((batch, False, f"Discord API returned status code: {response.status_code}"))
+        except Exception as e:
+            results.append((batch, False, f"Error sending Discord notification: {str(e)}"))
+    return results
+
+
+def send_simple_discord_notification(name, email, subject, message, sent_at=None, deadline=None):
+    """
+    Simple Discord notification without embeds (fallback)
+    """
+    try:
+        webhook_url = get_webhook_url()
+
+        if not webhook_url:
+            return False, "Discord webhook URL not configured"
+        sent_at = sent_at or datetime.now()
+
+        content = f"""
+🌟 **New Portfolio Contact Message**
+
+👤 **Name:** {name}
+📧 **Email:** {email}
+📋 **Subject:** {subject}
+
+📝 **Message:**
+{message}
+
+---
+*Sent from Portfolio Website at {sent_at.strftime('%Y-%m-%d %H:%M:%S')}*
+        """
+
+        payload = {
+            "content": content,
+            "username": "Portfolio Bot"
+        }
+
+        response = post_webhook(webhook_url, payload, deadline)
+
+        if response.status_code == 204:
+            return True, "Discord notification sent successfully!"
+        else:
+            return False, f"Discord API returned status code: {response.status_code}"
+
+    except Exception as e:
+        return False, f"Error sending Discord notification: {str(e)}"
@@ -0,0 +1,167 @@
+"""
+Static site export
+
+Renders everything on the Streamlit page except the live form into a
+static bundle: index.html plus a fingerprinted stylesheet, each with
+gzip (and brotli, when the optional `brotli` package is installed)
+variants, the resume preview when RESUME_PATH is set, and a manifest of
+ETags and content types for the server.
+
+    python -m portfolio.export --out dist
+    python -m portfolio.static_server dist --port 8000
+
+The page's contact form posts to /contact on portfolio.static_server,
+which feeds the same outbox and notifiers as the Streamlit form.
+"""
+import argparse
+import gzip
+import html
+import json
+import os
+import shutil
+
+from portfolio.assets import STATIC_DIR, fingerprint, minified_stylesheet, stylesheet_name
+from portfolio.content import load_content
+from portfolio.layout import (
+    ABOUT_HTML,
+    CERTIFICATIONS_HTML,
+    CONTACT_INFO_HTML,
+    CONTACT_ROW_HTML,
+    FOOTER_HTML,
+    HEADER_HTML,
+    SUBJECTS,
+    section_header,
+)
+from portfolio.render import render_section
+from portfolio.repos import enrich, prefetch
+from portfolio.resume import preview_name, resume_html
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+CONTENT_TYPES = {
+    ".html": "text/html; charset=utf-8",
+    ".css": "text/css; charset=utf-8",
+    ".json": "application/json",
+    ".png": "image/png",
+}
+
+
+def contact_form_html(action="/contact"):
+    options = "".join(f"<option>{html.escape(subject)}</option>" for subject in SUBJECTS)
+    return (
+        f'<h3>💬 Send me a message</h3><form class="contact-form" method="post" action="{action}">'
+        '<label for="name">Your Name *</label>'
+        '<input id="name" name="name" required placeholder="Enter your full name">'
+        '<label for="email">Your Email *</label>'
+        '<input id="email" name="email" type="email" required placeholder="your.email@example.com">'
+        f'<label for="subject">Subject</label><select id="subject" name="subject">{options}</select>'
+        '<label for="message">Message *</label>'
+        '<textarea id="message" name="message" rows="6" required placeholder="Tell me about your inquiry..."></textarea>'
+        '<button type="submit">Send Message 💬</button></form>'
+    )
+
+
+def render_page(stylesheet_href, contact_action="/contact"):
+    """
+    The whole portfolio as one HTML document
+    """
+    content = load_content()
+    body = "".join([
+        HEADER_HTML,
+        CONTACT_ROW_HTML,
+        resume_html("/resume.pdf", "/assets/"),
+        render_section("metrics", content.metrics),
+        section_header("About Me"),
+        ABOUT_HTML,
+        section_header("Professional Experience"),
+        render_section("experience", content.experience),
+        section_header("Featured Projects"),
+        render_section("projects", enrich(content.projects)),
+        section_header("Technical Skills"),
+        render_section("skills", content.skills),
+        section_header("Education"),
+        render_section("education", content.education),
+        CERTIFICATIONS_HTML,
+        section_header("Get In Touch"),
+        f'<div class="card-grid"><div>{CONTACT_INFO_HTML}</div><div>{contact_form_html(contact_action)}</div></div>',
+        "<hr>",
+        FOOTER_HTML,
+    ])
+    return (
+        '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8">'
+        '<meta name="viewport" content="width=device-width, initial-scale=1">'
+        "<title>Deven Bhasin - Portfolio</title>"
+        '<link rel="icon" href="data:image/svg+xml,<svg xmlns=%22http://www.w3.org/2000/svg%22 viewBox=%220 0 100 100%22>'
+        '<text y=%22.9em%22 font-size=%2290%22>💻</text></svg>">'
+        f'<link rel="stylesheet" href="{stylesheet_href}">'
+        f'</head><body><main class="static-page">{body}</main></body></html>'
+    )
+
+
+def _write(out, path, data, immutable, compress=True):
+    """
+    Write a file with its compressed variants; returns its manifest entry
+    """
+    full = os.path.join(out, path.lstrip("/"))
+    os.makedirs(os.path.dirname(full), exist_ok=True)
+    variants = {"identity": data}
+    if compress:
+        variants["gzip"] = gzip.compress(data, compresslevel=9, mtime=0)
+        if brotli is not None:
+            variants["br"] = brotli.compress(data, quality=11)
+    suffixes = {"identity": "", "gzip": ".gz", "br": ".br"}
+    for encoding, payload in variants.items():
+        with open(full + suffixes[encoding], "wb") as f:
+            f.write(payload)
+    return {
+        "etag": f'"{fingerprint(data, 16)}"',
+        "content_type": CONTENT_TYPES[os.path.splitext(path)[1]],
+        "encodings": {encoding: path + suffixes[encoding] for encoding in variants},
+        "immutable": immutable,
+    }
+
+
+def build(out):
+    """
+    Export the site into `out` (replacing it); returns the manifest
+    """
+    shutil.rmtree(out, ignore_errors=True)
+    os.makedirs(out)
+    # A build can afford to wait for the repository metadata a live render wouldn't
+    prefetch(load_content().projects, timeout=10)
+    css = minified_stylesheet().encode()
+    css_path = f"/assets/{stylesheet_name()}"
+    manifest = {
+        css_path: _write(out, css_path, css, immutable=True),
+        "/index.html": _write(out, "/index.html", render_page(css_path).encode(), immutable=False),
+    }
+    preview = preview_name()
+    if preview:
+        # The PDF itself is served by portfolio.static_server from RESUME_PATH
+        with open(os.path.join(STATIC_DIR, preview), "rb") as f:
+            manifest[f"/assets/{preview}"] = _write(out, f"/assets/{preview}", f.read(), immutable=True, compress=False)
+    with open(os.path.join(out, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the portfolio as a static site")
+    parser.add_argument("--out", default="dist")
+    args = parser.parse_args()
+    manifest = build(args.out)
+    for path, entry in manifest.items():
+        sizes = ", ".join(
+            f"{encoding} {os.path.getsize(os.path.join(args.out, file.lstrip('/')))} B"
+            for encoding, file in entry["encodings"].items()
+        )
+        print(f"{path}: {sizes}")
+    if brotli is None:
+        print("(install `brotli` for .br variants)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Shared HTTP session for outbound webhook traffic
+
+Every notifier posts through one keep-alive connection pool per server
+process, so a submission reuses an open TCP/TLS connection to Discord instead
+of paying for a fresh handshake on each post.
+"""
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ReadTimeoutError
+from urllib3.util.retry import Retry
+
+from portfolio.config import get_settings
+
+# Connections kept open per host
+POOL_SIZE = get_settings().http_pool_size
+# Seconds to establish a connection / to wait for the response
+CONNECT_TIMEOUT = get_settings().http_connect_timeout
+READ_TIMEOUT = get_settings().http_read_timeout
+# Attempts after a refused, dropped or reset connection
+RETRIES = get_settings().http_retries
+
+
+class ResetRetry(Retry):
+    """
+    Retry connection failures and resets, but never a read timeout: by then
+    the webhook may already have accepted the post and a retry would duplicate it
+    """
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        if isinstance(error, ReadTimeoutError):
+            raise error
+        return super().increment(method, url, response, error, _pool, _stacktrace)
+
+
+class PooledSession(requests.Session):
+    """
+    requests.Session with a default (connect, read) timeout on every call
+    """
+
+    def __init__(self, timeout):
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+def build_session(pool_size=POOL_SIZE, retries=RETRIES, connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT):
+    """
+    New pooled session; most callers want get_session() instead
+    """
+    retry = ResetRetry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=0,
+        allowed_methods=None,
+        backoff_factor=0.1,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = PooledSession((connect_timeout, read_timeout))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """
+    The process-wide session, built on first use
+
+    A module-level singleton rather than st.cache_resource so the delivery
+    worker thread can use it outside of a script run.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = build_session()
+    return _session
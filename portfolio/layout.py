@@ -0,0 +1,90 @@
+"""
+Static page blocks shared by the Streamlit app and the static export
+"""
+
+HEADER_HTML = """<h1 class="main-header">Deven Bhasin</h1>
+<p class="sub-header">AI/Software/Cloud Engineer</p>"""
+
+CONTACT_ROW_HTML = (
+    '<div class="card-grid four">'
+    "<div>📍 <strong>Brisbane, QLD, Australia</strong></div>"
+    '<div>📞 <strong><a href="tel:+610412711759">+61 0412711759</a></strong></div>'
+    '<div>✉️ <strong><a href="mailto:devenbhasin4123@gmail.com">devenbhasin4123@gmail.com</a></strong></div>'
+    '<div class="social-links">🔗 <a href="https://www.linkedin.com/in/devenbhasin/" target="_blank">LinkedIn</a> | '
+    '<a href="https://github.com/dbhasin4123" target="_blank">GitHub</a></div>'
+    "</div>"
+)
+
+RESUME_URL = "https://drive.google.com/file/d/1f07tZ_zD3VcSpMkuMj2zW69mTJgOahxE/view?usp=sharing"
+
+RESUME_HTML = (
+    '<div class="resume-row">'
+    f'<a href="{RESUME_URL}" target="_blank" class="resume-button">📄 View Resume</a>'
+    "</div>"
+)
+
+ABOUT_HTML = (
+    "<p>Curious and adaptable software developer passionate about building reliable, efficient, and user-centric applications. "
+    "Enthusiastic about AI, programming languages, and system design, with a mindset geared toward lifelong learning and impactful problem-solving.</p>"
+    "<p><strong>Key Strengths:</strong></p>"
+    "<ul>"
+    "<li>🤖 <strong>AI/ML Expertise</strong>: Developed models achieving 93% mean IoU, specializing in computer vision and NLP</li>"
+    "<li>☁️ <strong>Cloud Architecture</strong>: AWS certified with hands-on experience in scalable system design</li>"
+    "<li>🔧 <strong>Full-Stack Development</strong>: Built applications from Chrome extensions to mobile apps</li>"
+    "<li>📊 <strong>Data-Driven Solutions</strong>: Automated workflows increasing efficiency by 30%</li>"
+    "<li>🌍 <strong>Languages</strong>: English (Fluent), Hindi (Native), Punjabi (Native)</li>"
+    "</ul>"
+)
+
+CERTIFICATIONS_HTML = (
+    "<h3>🏆 Certifications &amp; Awards</h3>"
+    '<div class="card-grid">'
+    "<div><p><strong>AWS Certifications:</strong></p><ul>"
+    "<li>AWS Cloud Foundations</li><li>AWS Cloud Architecting</li><li>AWS Cloud Developing</li></ul>"
+    "<p><strong>Research &amp; Academic:</strong></p><ul>"
+    "<li>CSIRO Studentship</li><li>Global Connect Scholarship (2023)</li></ul></div>"
+    "<div><p><strong>Technical Certifications:</strong></p><ul>"
+    "<li>Google Python Courses (2x)</li><li>Computer Vision Applications (TIET)</li>"
+    "<li>Mobile App Development (TIET)</li><li>Robotic Arm Development (TIET)</li>"
+    "<li>Handwritten Text Recognition (TIET)</li></ul></div>"
+    "</div>"
+)
+
+CONTACT_INFO_HTML = (
+    "<h3>💼 I'm interested in:</h3><ul>"
+    "<li><strong>Full-time Software Engineering roles</strong></li>"
+    "<li><strong>AI/ML Research positions</strong></li>"
+    "<li><strong>Cloud Engineering opportunities</strong></li>"
+    "<li><strong>Collaboration on open source projects</strong></li>"
+    "<li><strong>Technical discussions and mentorship</strong></li></ul>"
+    "<h3>📱 Connect with me:</h3><p>"
+    '<strong>📧 Email:</strong> <a href="mailto:devenbhasin4123@gmail.com">devenbhasin4123@gmail.com</a><br>'
+    '<strong>📱 Phone:</strong> <a href="tel:+610412711759">+61 0412711759</a><br>'
+    '<strong>🔗 LinkedIn:</strong> <a href="https://www.linkedin.com/in/devenbhasin/">linkedin.com/in/devenbhasin</a><br>'
+    '<strong>👨‍💻 GitHub:</strong> <a href="https://github.com/dbhasin4123">github.com/dbhasin4123</a><br>'
+    "<strong>📍 Location:</strong> Brisbane, Queensland, Australia</p>"
+)
+
+FOOTER_HTML = """<div class="footer">
+<p><strong>Built with ❤️ using Streamlit | © 2025 Deven Bhasin</strong></p>
+<p>🚀 Passionate about AI, Software Engineering, and Cloud Computing</p>
+<p>📧 Always open to new opportunities and collaborations</p>
+<div class="footer-links">
+<a href="https://www.linkedin.com/in/devenbhasin/" target="_blank">LinkedIn</a>
+<a href="https://github.com/dbhasin4123" target="_blank">GitHub</a>
+<a href="mailto:devenbhasin4123@gmail.com">Email</a>
+</div>
+</div>"""
+
+SUBJECTS = (
+    "General Inquiry",
+    "Job Opportunity",
+    "Collaboration Proposal",
+    "Technical Discussion",
+    "Project Inquiry",
+    "Other",
+)
+
+
+def section_header(title):
+    return f'<h2 class="section-header">{title}</h2>'
@@ -0,0 +1,266 @@
+"""
+Opt-in render profiling and Prometheus-style metrics
+
+With PORTFOLIO_METRICS=1 every named section of app.py is timed on each
+rerun and every notification sink call records its latency and outcome.
+Aggregates live in fixed-bucket in-process histograms and are served in the
+Prometheus text format, together with the breaker, rate limiter, delivery
+worker, abuse shield, repository cache and analytics counters:
+
+    PORTFOLIO_METRICS=1 streamlit run app.py
+    curl http://127.0.0.1:9108/metrics
+
+When disabled, section() hands back one shared no-op context manager and
+the record functions return immediately.
+"""
+import bisect
+import contextlib
+import threading
+import time
+
+from portfolio.config import get_settings
+
+ENABLED = get_settings().portfolio_metrics
+METRICS_HOST = get_settings().metrics_host
+METRICS_PORT = get_settings().metrics_port
+
+# Upper bounds in seconds, from sub-millisecond markdown calls to webhook timeouts
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_DISABLED = contextlib.nullcontext()
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram (Prometheus semantics)
+    """
+
+    __slots__ = ("counts", "sum", "count", "_lock")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        i = bisect.bisect_left(BUCKETS, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+            self.count += 1
+
+    def samples(self):
+        """
+        (le, cumulative count) pairs, then the sum and count
+        """
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        cumulative, running = [], 0
+        for bound, n in zip(BUCKETS + (float("inf"),), counts):
+            running += n
+            cumulative.append(("+Inf" if bound == float("inf") else repr(bound), running))
+        return cumulative, total, count
+
+
+class Registry:
+    """
+    Histograms and counters keyed by metric name and label values
+    """
+
+    def __init__(self):
+        self._histograms = {}
+        self._counters = {}
+        self._help = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name, help_text, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, Histogram())
+                self._help.setdefault(name, help_text)
+        return histogram
+
+    def inc(self, name, help_text, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+            self._help.setdefault(name, help_text)
+
+    def clear(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def render(self):
+        lines = []
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+        seen = set()
+        for (name, labels), histogram in histograms:
+            if name not in seen:
+                seen.add(name)
+                lines += [f"# HELP {name} {self._help[name]}", f"# TYPE {name} histogram"]
+            buckets, total, count = histogram.samples()
+            for le, n in buckets:
+                lines.append(f"{name}_bucket{_labels(labels + (('le', le),))} {n}")
+            lines.append(f"{name}_sum{_labels(labels)} {total:.6f}")
+            lines.append(f"{name}_count{_labels(labels)} {count}")
+        for (name, labels), value in counters:
+            if name not in seen:
+                seen.add(name)
+                lines += [f"# HELP {name} {self._help[name]}", f"# TYPE {name} counter"]
+            lines.append(f"{name}{_labels(labels)} {value}")
+        return lines
+
+
+def _labels(pairs):
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+registry = Registry()
+
+
+class _Section:
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+
+def section(name):
+    """
+    Time a named part of the script run (a shared no-op when disabled)
+    """
+    if not ENABLED:
+        return _DISABLED
+    return _Section(registry.histogram("portfolio_section_seconds", "Time spent rendering each page section", section=name))
+
+
+def record_sink(sink, seconds, successes, failures):
+    """
+    Latency and outcome of one notification sink call
+    """
+    if not ENABLED:
+        return
+    registry.histogram("portfolio_notify_seconds", "Notification sink call latency", sink=sink).observe(seconds)
+    if successes:
+        registry.inc("portfolio_notify_total", "Messages handled by notification sinks", successes, sink=sink, outcome="success")
+    if failures:
+        registry.inc("portfolio_notify_total", "Messages handled by notification sinks", failures, sink=sink, outcome="failure")
+
+
+def _gauge(lines, name, help_text, samples):
+    """
+    One gauge family from (labels dict, value) samples
+    """
+    if not samples:
+        return
+    lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+    lines += [f"{name}{_labels(tuple(sorted(labels.items())))} {value}" for labels, value in samples]
+
+
+def render():
+    """
+    Everything in the Prometheus text exposition format
+    """
+    from portfolio import analytics, delivery, ratelimit, repos, resilience, shield
+    from portfolio.resilience import CLOSED, HALF_OPEN, OPEN
+
+    lines = registry.render()
+    breakers = sorted((name, breaker.snapshot()) for name, breaker in list(resilience._breakers.items()))
+    if breakers:
+        states = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+        _gauge(lines, "portfolio_breaker_state", "Circuit breaker state (0 closed, 1 half-open, 2 open)",
+               [({"breaker": name}, states[s["state"]]) for name, s in breakers])
+        _gauge(lines, "portfolio_breaker_transitions", "Circuit breaker state transitions",
+               [({"breaker": name, "transition": t}, n) for name, s in breakers for t, n in sorted(s["transitions"].items())])
+        for key in ("calls", "failures", "rejected"):
+            _gauge(lines, f"portfolio_breaker_{key}", f"Circuit breaker {key}", [({"breaker": name}, s[key]) for name, s in breakers])
+    limiters = [limiter.snapshot() for limiter in list(ratelimit._limiters.values())]
+    if limiters:
+        # Summed over webhooks so URLs (which embed the webhook token) never leak into labels
+        for key in ("sent", "throttled", "gave_up", "waits", "wait_seconds_total", "queue_depth"):
+            _gauge(lines, f"portfolio_ratelimit_{key}", f"Webhook rate limiter {key.replace('_', ' ')}",
+                   [({}, round(sum(s[key] for s in limiters), 6))])
+    worker = delivery._worker
+    if worker is not None:
+        for key, value in sorted(worker.stats.items()):
+            _gauge(lines, f"portfolio_delivery_{key}", f"Delivery worker {key} total", [({}, value)])
+        _gauge(lines, "portfolio_delivery_queue_depth", "Delivery worker wake-up queue depth", [({}, worker.depth())])
+    if shield._shield is not None:
+        s = shield._shield.snapshot()
+        _gauge(lines, "portfolio_shield_submissions", "Contact submissions by abuse shield verdict",
+               [({"verdict": key}, s[key]) for key in ("allowed", "limited_session", "limited_client", "duplicates")])
+        for key in ("entries", "evicted", "expired"):
+            _gauge(lines, f"portfolio_shield_{key}", f"Abuse shield table {key}",
+                   [({"table": name}, n) for name, n in sorted(s[key].items())])
+    if repos._cache is not None:
+        s = repos._cache.snapshot()
+        _gauge(lines, "portfolio_repo_cache_lookups", "Repository metadata lookups by cache state",
+               [({"state": key}, s[key]) for key in ("fresh", "stale", "misses")])
+        for key in ("fetches", "errors", "entries", "inflight"):
+            _gauge(lines, f"portfolio_repo_cache_{key}", f"Repository metadata cache {key}", [({}, s[key])])
+    recorder = analytics._recorder
+    if recorder is not None:
+        for key, value in sorted(recorder.snapshot().items()):
+            _gauge(lines, f"portfolio_analytics_{key}", f"Analytics {key.replace('_', ' ')} total", [({}, value)])
+    return "\n".join(lines) + "\n"
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_server(host=METRICS_HOST, port=METRICS_PORT):
+    """
+    Serve /metrics from a daemon thread, once per process (no-op when disabled)
+    """
+    global _server
+    if not ENABLED:
+        return None
+    with _server_lock:
+        if _server is None:
+            # Imported here: http.server pulls in http.client and email, which
+            # nothing else needs at startup
+            from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+            class MetricsHandler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path.split("?")[0] != "/metrics":
+                        self.send_error(404)
+                        return
+                    body = render().encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, format, *args):
+                    pass
+
+            try:
+                _server = ThreadingHTTPServer((host, port), MetricsHandler)
+            except OSError:
+                # Another process (e.g. a second app instance) already owns the port;
+                # don't retry on every rerun
+                _server = False
+                return None
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, name="metrics", daemon=True).start()
+    return _server or None
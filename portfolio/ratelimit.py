@@ -0,0 +1,245 @@
+"""
+Rate-limit-aware scheduling for webhook posts
+
+Discord allows a handful of posts per webhook every couple of seconds and
+reports the bucket state in X-RateLimit-* headers. Posts go through a token
+bucket that is corrected from those headers; when the bucket is empty or
+Discord answers 429, senders wait for the reset instead of failing. With SHARED_STATE_PATH set,
+every replica draws from one bucket stored in that file.
+"""
+import hashlib
+import threading
+import time
+
+from portfolio.config import get_settings
+from portfolio.resilience import DeadlineExceeded
+
+# Posts allowed per window before Discord's headers tell us otherwise
+BURST = get_settings().webhook_burst
+WINDOW_SECONDS = get_settings().webhook_window_seconds
+# Longest a single post is held for a rate-limit reset before giving up
+MAX_WAIT_SECONDS = get_settings().webhook_max_wait_seconds
+
+
+def _header_float(headers, name):
+    value = headers.get(name)
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def retry_after(response):
+    """
+    Seconds Discord asked us to wait after a 429
+    """
+    seconds = _header_float(response.headers, "Retry-After")
+    if seconds is None:
+        try:
+            seconds = float(response.json().get("retry_after", 0))
+        except Exception:
+            seconds = 0.0
+    return max(seconds, 0.0)
+
+
+class WebhookRateLimiter:
+    """
+    Token bucket for one webhook, kept in step with the response headers
+    """
+
+    def __init__(self, burst=BURST, window=WINDOW_SECONDS, max_wait=MAX_WAIT_SECONDS):
+        self.capacity = float(burst)
+        self.window = window
+        self.max_wait = max_wait
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._waiting = 0
+        self._cond = threading.Condition()
+        self.stats = {
+            "sent": 0,
+            "throttled": 0,
+            "gave_up": 0,
+            "waits": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+            "queue_depth_max": 0,
+        }
+
+    @property
+    def rate(self):
+        return self.capacity / self.window
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, timeout=None):
+        """
+        Block until a post may go out; returns the seconds spent waiting,
+        or None if that would take longer than `timeout`
+        """
+        start = time.monotonic()
+        with self._cond:
+            self._waiting += 1
+            self.stats["queue_depth_max"] = max(self.stats["queue_depth_max"], self._waiting)
+            try:
+                while True:
+                    now = time.monotonic()
+                    if self._take(now):
+                        break
+                    delay = max(self._blocked_until - now, (1 - self._tokens) / self.rate, 0.001)
+                    if timeout is not None and now + delay > start + timeout:
+                        return None
+                    self._cond.wait(delay)
+            finally:
+                self._waiting -= 1
+            waited = time.monotonic() - start
+            if waited > 0.001:
+                self.stats["waits"] += 1
+                self.stats["wait_seconds_total"] += waited
+                self.stats["wait_seconds_max"] = max(self.stats["wait_seconds_max"], waited)
+        return waited
+
+    def _take(self, now):
+        # Called with the condition held: spend a token if one is free
+        self._refill(now)
+        if now >= self._blocked_until and self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    def _apply(self, response, now):
+        # Called with the condition held
+        self._refill(now)
+        headers = response.headers
+        if response.status_code == 429:
+            self.stats["throttled"] += 1
+            self._tokens = 0.0
+            self._blocked_until = max(self._blocked_until, now + retry_after(response))
+        else:
+            limit = _header_float(headers, "X-RateLimit-Limit")
+            remaining = _header_float(headers, "X-RateLimit-Remaining")
+            reset_after = _header_float(headers, "X-RateLimit-Reset-After")
+            if limit and reset_after:
+                self.capacity = limit
+            if remaining is not None:
+                self._tokens = min(self._tokens, remaining)
+                if remaining < 1 and reset_after is not None:
+                    self._blocked_until = max(self._blocked_until, now + reset_after)
+
+    def update(self, response):
+        """
+        Correct the bucket from a webhook response
+        """
+        now = time.monotonic()
+        with self._cond:
+            self._apply(response, now)
+            self._cond.notify_all()
+
+    def send(self, post, deadline=None):
+        """
+        Run post() under the limiter, holding and retrying through 429s
+
+        Gives up and returns the 429 response once the reset would push the
+        total wait past max_wait (or past the deadline, when one is given).
+        """
+        started = time.monotonic()
+        max_wait = self.max_wait if deadline is None else min(self.max_wait, deadline.remaining())
+        while True:
+            if self.acquire(timeout=max_wait - (time.monotonic() - started)) is None:
+                with self._cond:
+                    self.stats["gave_up"] += 1
+                raise DeadlineExceeded("rate limit reset is past the delivery deadline")
+            response = post()
+            self.update(response)
+            with self._cond:
+                if response.status_code != 429:
+                    self.stats["sent"] += 1
+                    return response
+                if time.monotonic() + retry_after(response) - started > max_wait:
+                    self.stats["gave_up"] += 1
+                    return response
+
+    def snapshot(self):
+        """
+        Current queue depth and wait statistics
+        """
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+            return dict(
+                self.stats,
+                queue_depth=self._waiting,
+                tokens=round(self._tokens, 2),
+                blocked_for=round(max(self._blocked_until - now, 0.0), 3),
+            )
+
+
+class SharedRateLimiter(WebhookRateLimiter):
+    """
+    The same bucket kept in the shared-state file, so every replica draws from it
+
+    Each take and correction loads the row, applies the in-memory logic and
+    writes it back in one transaction. Times are time.monotonic(), which is
+    one clock for every process on the host; a row from before a reboot
+    (stamped well in the future) is ignored. Waiters in other processes aren't
+    notified and wake when their computed delay runs out.
+    """
+
+    def __init__(self, key, state, **kwargs):
+        super().__init__(**kwargs)
+        self.key = key
+        self.state = state
+
+    def _load(self, db, now):
+        row = db.execute("SELECT tokens, updated, blocked_until FROM buckets WHERE key = ?", (self.key,)).fetchone()
+        if row is None or row[1] > now + 60:
+            row = (self.capacity, now, 0.0)
+        # Another process may have stamped it a moment after this `now` was read
+        self._tokens, self._updated, self._blocked_until = row[0], min(row[1], now), row[2]
+
+    def _store(self, db):
+        db.execute("INSERT OR REPLACE INTO buckets (key, tokens, updated, blocked_until) VALUES (?, ?, ?, ?)",
+                   (self.key, self._tokens, self._updated, self._blocked_until))
+
+    def _take(self, now):
+        with self.state.transaction() as db:
+            self._load(db, now)
+            taken = super()._take(now)
+            if taken:
+                self._store(db)
+        return taken
+
+    def _apply(self, response, now):
+        with self.state.transaction() as db:
+            self._load(db, now)
+            super()._apply(response, now)
+            self._store(db)
+
+    def snapshot(self):
+        with self._cond:
+            with self.state.transaction() as db:
+                self._load(db, time.monotonic())
+            return super().snapshot()
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(webhook_url):
+    """
+    The process-wide limiter for a webhook URL (shared across replicas with SHARED_STATE_PATH)
+    """
+    with _limiters_lock:
+        if webhook_url not in _limiters:
+            if get_settings().shared_state_path:
+                from portfolio.shared import get_shared_state
+
+                # Keyed by a digest: the URL is a secret
+                key = hashlib.sha256(webhook_url.encode()).hexdigest()[:16]
+                _limiters[webhook_url] = SharedRateLimiter(key, get_shared_state())
+            else:
+                _limiters[webhook_url] = WebhookRateLimiter()
+        return _limiters[webhook_url]
@@ -0,0 +1,201 @@
+"""
+HTML fragments for the content sections, cached across all sessions
+
+Each card and each whole section is rendered once per process and stored
+under its content hash, so a rerun is a handful of dictionary lookups
+instead of rebuilding every card from f-strings. A content file reload
+drops only the edited cards and the grids of their sections.
+"""
+import dataclasses
+import html
+import threading
+
+from portfolio.config import get_settings
+from portfolio.content import content_hash, on_change
+
+# Cards in the first page of a long grid, and in each page loaded after it
+PAGE_SIZE = get_settings().project_page_size
+
+
+def create_skill_tags(skills_list):
+    return "".join(f'<span class="skill-tag">{skill}</span>' for skill in skills_list)
+
+
+def _bullets(items):
+    return "<ul>" + "".join(f"<li>{item}</li>" for item in items) + "</ul>"
+
+
+def metric_card(metric):
+    return (
+        f'<div class="metric-card"><h3>{metric.icon} {metric.title}</h3>'
+        f'<p>{"<br>".join(metric.lines)}<br><strong>{metric.highlight}</strong></p></div>'
+    )
+
+
+def experience_card(experience):
+    return (
+        f'<div class="project-card"><h3>{experience.icon} {experience.role} - {experience.organisation}</h3>'
+        f'<p><strong>{experience.period}</strong></p>{_bullets(experience.bullets)}</div>'
+        f'{create_skill_tags(experience.skills)}'
+    )
+
+
+def repo_meta(repo):
+    """
+    Stars, language and last push of a project's repository ("" until known)
+    """
+    if repo is None:
+        return ""
+    # From the GitHub API, so escaped unlike the trusted content strings
+    parts = [f"⭐ {repo.stars}"] + ([html.escape(repo.language)] if repo.language else [])
+    parts.append(f"updated {repo.pushed_at:%b %Y}")
+    return f'<p class="repo-meta">{" · ".join(parts)}</p>'
+
+
+# Where render_card puts a project's repository metadata
+REPO_SLOT = "<!--repo-->"
+
+
+def project_card(project):
+    return (
+        f'<div class="project-card"><h3>{project.icon} {project.title}</h3>'
+        f'<p><strong>{project.tagline}</strong></p>{REPO_SLOT}{_bullets(project.bullets)}'
+        f'<div class="project-link"><a href="{project.url}" target="_blank" data-project="{project.title}">🔗 {project.link_label}</a></div>'
+        f'</div>{create_skill_tags(project.skills)}'
+    )
+
+
+def skill_group(group):
+    return f"<h3>{group.icon} {group.title}</h3>{create_skill_tags(group.skills)}"
+
+
+def education_card(education):
+    return (
+        f'<div class="info-card"><h4>{education.icon} {education.degree}</h4>'
+        f'<p><strong>{education.field}</strong><br>{education.institution}<br>'
+        f'{education.period}<br><strong>{education.result}</strong></p></div>'
+    )
+
+
+CARD_RENDERERS = {
+    "metrics": metric_card,
+    "experience": experience_card,
+    "projects": project_card,
+    "skills": skill_group,
+    "education": education_card,
+}
+
+# Grid class per section; skills stack their groups in two columns
+GRID_CLASSES = {
+    "metrics": "card-grid three",
+    "experience": "card-grid",
+    "projects": "card-grid",
+    "skills": "card-grid",
+    "education": "card-grid three",
+}
+
+
+class FragmentCache:
+    """
+    Rendered HTML keyed by (kind, content hash), shared by every session
+    """
+
+    def __init__(self):
+        self._fragments = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def get(self, key, render):
+        html = self._fragments.get(key)
+        if html is not None:
+            self.stats["hits"] += 1
+            return html
+        html = render()
+        with self._lock:
+            self._fragments[key] = html
+            self.stats["misses"] += 1
+        return html
+
+    def __len__(self):
+        return len(self._fragments)
+
+    def clear(self):
+        with self._lock:
+            self._fragments.clear()
+
+    def discard(self, match):
+        """
+        Drop the entries whose key satisfies match(key); returns how many
+        """
+        with self._lock:
+            stale = [key for key in self._fragments if match(key)]
+            for key in stale:
+                del self._fragments[key]
+        return len(stale)
+
+
+fragment_cache = FragmentCache()
+
+
+def render_card(kind, item):
+    """
+    Cached HTML for one content item
+
+    Cards are cached as written in the content; repository metadata
+    changes with every star or push, so it is spliced in per render rather
+    than adding a cache entry per value.
+    """
+    repo = getattr(item, "repo", None)
+    if repo is not None:
+        item = dataclasses.replace(item, repo=None)
+    card = fragment_cache.get((kind, content_hash(item)), lambda: CARD_RENDERERS[kind](item))
+    return card.replace(REPO_SLOT, repo_meta(repo), 1) if kind == "projects" else card
+
+
+def _render_section(kind, items):
+    cells = [render_card(kind, item) for item in items]
+    if kind == "skills":
+        # Two columns of groups, first half on the left like the original layout
+        half = (len(cells) + 1) // 2
+        cells = ["".join(cells[:half]), "".join(cells[half:])]
+    return f'<div class="{GRID_CLASSES[kind]}">' + "".join(f"<div>{cell}</div>" for cell in cells) + "</div>"
+
+
+def render_grid(kind, items):
+    """
+    A section's grid for an ad-hoc selection of items (e.g. a skill filter)
+
+    Cards come from the cache; the grid itself isn't cached, since every
+    filter combination would add an entry that is unlikely to be reused.
+    """
+    return _render_section(kind, items)
+
+
+def render_section(kind, items):
+    """
+    Cached HTML for a whole section (kind is a Portfolio field name)
+    """
+    return fragment_cache.get((f"section:{kind}", content_hash(tuple(items))), lambda: _render_section(kind, items))
+
+
+def render_window(kind, items, shown, prefetch=PAGE_SIZE):
+    """
+    HTML for the first `shown` items, with the next `prefetch` cards
+    rendered into the cache so the following page is ready
+
+    Built from cached cards like render_grid: each "Show more" or filter
+    would otherwise cache another copy of the grid, growing with the square
+    of the catalogue. The cost of a rerun depends on how many cards are on
+    screen, not on how many there are.
+    """
+    for item in items[shown:shown + prefetch]:
+        render_card(kind, item)
+    return render_grid(kind, items[:shown])
+
+
+@on_change
+def _invalidate(old, new, changes):
+    # Only the edited cards and the grids of their sections; every other card stays cached
+    cards = {(kind, content_hash(previous)) for kind, items in changes.items() for _, previous, _ in items if previous}
+    sections = {f"section:{kind}" for kind in changes}
+    fragment_cache.discard(lambda key: key in cards or key[0] in sections)
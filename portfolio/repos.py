@@ -0,0 +1,216 @@
+"""
+Live GitHub metadata for the project cards
+
+Each card that links to a repository shows its stars, primary language and
+last push date. Lookups go through a stale-while-revalidate cache:
+
+- fresh (younger than REPO_FRESH_SECONDS): served as is
+- stale (up to REPO_STALE_SECONDS more): served as is, and one background
+  refresh per key is started
+- missing or older: the card renders without metadata while it's fetched
+
+so a page render never waits on GitHub, and a failed fetch is retried only
+after REPO_RETRY_SECONDS, keeping whatever value was there. The fetcher is
+pluggable; GITHUB_API_URL points the default one at a local fixture server
+(benchmarks/stub_github.py) for offline runs, and REPO_METADATA=0 turns the
+lookups off.
+"""
+import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, replace
+from datetime import datetime
+from functools import lru_cache
+
+from portfolio.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+ENABLED = get_settings().repo_metadata
+GITHUB_API_URL = get_settings().github_api_url
+# Optional; raises GitHub's limit from 60 to 5000 requests an hour
+GITHUB_TOKEN = get_settings().github_token
+FRESH_SECONDS = get_settings().repo_fresh_seconds
+STALE_SECONDS = get_settings().repo_stale_seconds
+RETRY_SECONDS = get_settings().repo_retry_seconds
+REFRESH_THREADS = get_settings().repo_refresh_threads
+
+REPO_URL = re.compile(r"https://github\.com/([\w.-]+)/([\w.-]+)")
+
+
+@dataclass(frozen=True)
+class RepoMeta:
+    full_name: str
+    stars: int
+    language: str
+    pushed_at: datetime
+
+
+@lru_cache(maxsize=None)
+def repo_key(url):
+    """
+    "owner/repo" for a GitHub repository URL, else None
+    """
+    match = REPO_URL.match(url)
+    return f"{match.group(1)}/{match.group(2)}" if match else None
+
+
+class GitHubFetcher:
+    """
+    GET /repos/{owner}/{repo}, revalidated with the ETag GitHub sent
+
+    A 304 doesn't count against GitHub's rate limit, so refreshing an
+    unchanged repository is free.
+    """
+
+    def __init__(self, base_url=GITHUB_API_URL, token=GITHUB_TOKEN):
+        self.base_url = base_url.rstrip("/")
+        self.token = token
+        self._etags = {}
+
+    def __call__(self, key):
+        # Imported here: nothing on the page path needs requests (see portfolio.warmup)
+        from portfolio.http import get_session
+
+        headers = {"Accept": "application/vnd.github+json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        previous = self._etags.get(key)
+        if previous:
+            headers["If-None-Match"] = previous[0]
+        response = get_session().get(f"{self.base_url}/repos/{key}", headers=headers)
+        if response.status_code == 304 and previous:
+            return previous[1]
+        response.raise_for_status()
+        data = response.json()
+        meta = RepoMeta(
+            data["full_name"],
+            int(data.get("stargazers_count") or 0),
+            data.get("language") or "",
+            datetime.fromisoformat(data["pushed_at"].replace("Z", "+00:00")),
+        )
+        if response.headers.get("ETag"):
+            self._etags[key] = (response.headers["ETag"], meta)
+        return meta
+
+
+class StaleWhileRevalidateCache:
+    """
+    Values by key from fetch(key), refreshed in the background, one fetch per key at a time
+    """
+
+    def __init__(self, fetch, fresh=FRESH_SECONDS, stale=STALE_SECONDS, retry=RETRY_SECONDS, threads=REFRESH_THREADS):
+        self.fetch = fetch
+        self.fresh = fresh
+        self.stale = stale
+        self.retry = retry
+        self._executor = ThreadPoolExecutor(threads, thread_name_prefix="repo-refresh")
+        self._entries = {}
+        self._failed = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.stats = {"fresh": 0, "stale": 0, "misses": 0, "fetches": 0, "errors": 0}
+
+    def get(self, key):
+        """
+        The cached value (None if there's none worth showing); never blocks on fetch
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            age = now - entry[1] if entry else None
+            if entry and age < self.fresh:
+                self.stats["fresh"] += 1
+                return entry[0]
+            if entry and age < self.fresh + self.stale:
+                self.stats["stale"] += 1
+                value = entry[0]
+            else:
+                self.stats["misses"] += 1
+                value = None
+            self._start(key, now)
+        return value
+
+    def refresh(self, keys, timeout=None):
+        """
+        Start fetches for keys that aren't fresh; with a timeout, wait for them
+        """
+        now = time.monotonic()
+        with self._lock:
+            futures = [self._start(key, now) for key in keys
+                       if key not in self._entries or now - self._entries[key][1] >= self.fresh]
+        futures = [future for future in futures if future is not None]
+        if timeout is not None and futures:
+            wait(futures, timeout)
+
+    def _start(self, key, now):
+        # Called with the lock held
+        if key in self._inflight:
+            return self._inflight[key]
+        if now - self._failed.get(key, float("-inf")) < self.retry:
+            return None
+        future = self._inflight[key] = self._executor.submit(self._fetch, key)
+        return future
+
+    def _fetch(self, key):
+        try:
+            value = self.fetch(key)
+        except Exception as e:
+            logger.warning("Could not fetch %s: %s", key, e)
+            with self._lock:
+                self._failed[key] = time.monotonic()
+                self.stats["errors"] += 1
+                del self._inflight[key]
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._failed.pop(key, None)
+            self.stats["fetches"] += 1
+            del self._inflight[key]
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.stats, entries=len(self._entries), inflight=len(self._inflight))
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_repo_cache():
+    """
+    The process-wide cache in front of the GitHub API
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = StaleWhileRevalidateCache(GitHubFetcher())
+    return _cache
+
+
+@lru_cache(maxsize=32)
+def _with_repos(projects, repos):
+    return tuple(replace(project, repo=repo) if repo else project for project, repo in zip(projects, repos))
+
+
+def enrich(projects):
+    """
+    The projects with whatever repository metadata is cached right now
+    """
+    if not ENABLED:
+        return projects
+    cache = get_repo_cache()
+    keys = [repo_key(project.url) for project in projects]
+    return _with_repos(projects, tuple(cache.get(key) if key else None for key in keys))
+
+
+def prefetch(projects, timeout=None):
+    """
+    Start fetching metadata for every project repository (waiting up to `timeout`)
+    """
+    if ENABLED:
+        keys = [key for key in (repo_key(p.url) for p in projects) if key]
+        get_repo_cache().refresh(keys, timeout)
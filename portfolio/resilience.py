@@ -0,0 +1,171 @@
+"""
+Circuit breaker and deadline budget for outbound notifications
+
+When Discord is down or slow, the breaker opens after a run of failures and
+rejects posts instantly until a half-open probe succeeds. A Deadline caps
+the total time one delivery may spend across all of its attempts.
+"""
+import logging
+import threading
+import time
+
+from portfolio.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Consecutive failures that open the breaker, and seconds before a probe
+BREAKER_FAILURES = get_settings().breaker_failures
+BREAKER_RESET_SECONDS = get_settings().breaker_reset_seconds
+# Total seconds one delivery may spend across all attempts
+NOTIFY_DEADLINE_SECONDS = get_settings().notify_deadline_seconds
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of attempting a call while the breaker is open
+    """
+
+
+class DeadlineExceeded(Exception):
+    """
+    Raised when a delivery has no time budget left for another attempt
+    """
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after `failures` in a row; open -> half-open after `reset_seconds`;
+    one probe at a time while half-open decides whether to close or re-open
+    """
+
+    def __init__(self, name, failures=BREAKER_FAILURES, reset_seconds=BREAKER_RESET_SECONDS):
+        self.name = name
+        self.failures = failures
+        self.reset_seconds = reset_seconds
+        self.state = CLOSED
+        self._consecutive = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "failures": 0, "rejected": 0, "transitions": {}}
+
+    def _move(self, state):
+        key = f"{self.state}->{state}"
+        self.stats["transitions"][key] = self.stats["transitions"].get(key, 0) + 1
+        logger.warning("Circuit breaker %s: %s", self.name, key)
+        self.state = state
+
+    def allow(self):
+        """
+        Whether a call may go ahead now
+        """
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+                self._move(HALF_OPEN)
+            if self.state == CLOSED or (self.state == HALF_OPEN and not self._probing):
+                self._probing = self.state == HALF_OPEN
+                self.stats["calls"] += 1
+                return True
+            self.stats["rejected"] += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._consecutive = 0
+            self._probing = False
+            if self.state != CLOSED:
+                self._move(CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self.stats["failures"] += 1
+            self._consecutive += 1
+            self._probing = False
+            if self.state == HALF_OPEN or (self.state == CLOSED and self._consecutive >= self.failures):
+                self._opened_at = time.monotonic()
+                self._move(OPEN)
+
+    def release(self):
+        """
+        End a call that says nothing about the downstream's health
+        """
+        with self._lock:
+            self._probing = False
+
+    def call(self, func, is_failure=lambda result: False, ignored=(DeadlineExceeded,)):
+        """
+        Run func() under the breaker; exceptions and is_failure(result) count as failures
+
+        `ignored` exceptions (by default our own deadline running out before
+        or while waiting to send) count as neither failure nor success.
+        """
+        if not self.allow():
+            raise CircuitOpenError(f"{self.name} circuit is open")
+        try:
+            result = func()
+        except ignored:
+            self.release()
+            raise
+        except Exception:
+            self.record_failure()
+            raise
+        if is_failure(result):
+            self.record_failure()
+        else:
+            self.record_success()
+        return result
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.stats, state=self.state, consecutive_failures=self._consecutive,
+                        transitions=dict(self.stats["transitions"]))
+
+
+class Deadline:
+    """
+    Time budget shared by every attempt of one delivery
+    """
+
+    def __init__(self, seconds=NOTIFY_DEADLINE_SECONDS):
+        self.expires = time.monotonic() + seconds
+
+    def remaining(self):
+        return max(self.expires - time.monotonic(), 0.0)
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def share(self, attempts):
+        """
+        Sub-deadline for the next of `attempts` remaining attempts (an even split)
+        """
+        child = Deadline(0)
+        child.expires = time.monotonic() + self.remaining() / max(attempts, 1)
+        return child
+
+    def timeout(self, connect, read):
+        """
+        (connect, read) timeout for requests, clipped to the remaining budget
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded("delivery deadline exceeded")
+        return min(connect, remaining), min(read, remaining)
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name):
+    """
+    The process-wide breaker for a named downstream
+    """
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name)
+        return _breakers[name]
@@ -0,0 +1,364 @@
+"""
+Self-hosted resume: the PDF served by this process, with a preview image
+
+With RESUME_PATH set, "View Resume" links to our own copy of the PDF
+instead of Google Drive, and the page shows its first page inline:
+
+- the file is memory-mapped once; every response is a slice of the mapping
+- ETag / If-None-Match answers 304, and Range (with If-Range) answers 206
+  with only the bytes asked for, which is how PDF viewers page through it
+- gzip and brotli variants are compressed once and kept only when they
+  save something; ranges always come from the uncompressed bytes
+- the preview (page 1 as a PNG, via PyMuPDF or poppler's pdftoppm when
+  either is installed) is rendered once per PDF and written to static/
+  under a content-hashed name, like the stylesheet
+
+The Streamlit app serves the PDF from a daemon server on RESUME_HOST:
+RESUME_PORT, and links to it only once RESUME_URL_PREFIX gives that
+server's public address (a loopback default would point every visitor at
+their own machine); without it the page keeps the hosted link.
+portfolio.static_server serves it at /resume.pdf.
+
+Mapping and compressing the PDF and rendering the preview take seconds, so
+app.py starts them on a daemon thread (start_background) and the page shows
+the hosted link until they are done.
+
+    python -m portfolio.resume          (build the preview, print sizes)
+"""
+import argparse
+import glob
+import gzip
+import logging
+import mmap
+import os
+import shutil
+import subprocess
+import threading
+from email.utils import formatdate
+from functools import lru_cache
+
+from portfolio.assets import STATIC_DIR, STYLESHEET_URL_PREFIX, choose_encoding, fingerprint
+from portfolio.config import get_settings
+from portfolio.layout import RESUME_HTML
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+RESUME_PATH = get_settings().resume_path
+RESUME_HOST = get_settings().resume_host
+RESUME_PORT = get_settings().resume_port
+# Public base URL of the resume server; the app links its own copy only when set
+RESUME_URL_PREFIX = get_settings().resume_url_prefix
+PREVIEW_WIDTH = 600
+# A compressed variant is kept only below this share of the original size
+MIN_SAVING = 0.9
+
+
+def parse_range(header, size):
+    """
+    (first, last) byte of a single "bytes=" range, False if it can't be
+    satisfied, or None when the header should be ignored
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip() != "bytes" or "," in spec:
+        # Multiple ranges aren't worth a multipart body here; send the whole file
+        return None
+    first, _, last = spec.strip().partition("-")
+    try:
+        if not first:
+            length = int(last)
+            if length <= 0:
+                return False
+            return max(size - length, 0), size - 1
+        first = int(first)
+        last = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if first >= size:
+        return False
+    if first > last:
+        return None
+    return first, min(last, size - 1)
+
+
+class ResumeFile:
+    """
+    A memory-mapped PDF and its precompressed variants
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self._map)
+        self.size = len(self._map)
+        self.hash = fingerprint(self._map, 16)
+        self.etag = f'"{self.hash}"'
+        self.name = f"resume.{self.hash[:10]}.pdf"
+        self.last_modified = formatdate(os.path.getmtime(path), usegmt=True)
+        self.variants = {}
+        candidates = {"gzip": lambda: gzip.compress(self._map, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            candidates["br"] = lambda: brotli.compress(bytes(self._map), quality=11)
+        for encoding, compress in candidates.items():
+            data = compress()
+            if len(data) < self.size * MIN_SAVING:
+                self.variants[encoding] = data
+
+    def respond(self, headers, immutable=False):
+        """
+        (status, headers, body) for a GET with these request headers
+        """
+        reply = {
+            "Content-Type": "application/pdf",
+            "ETag": self.etag,
+            "Last-Modified": self.last_modified,
+            "Accept-Ranges": "bytes",
+            "Cache-Control": "public, max-age=31536000, immutable" if immutable else "no-cache",
+            "Vary": "Accept-Encoding",
+        }
+        if_none_match = headers.get("If-None-Match", "")
+        if if_none_match.strip() == "*" or self.etag in (tag.strip() for tag in if_none_match.split(",")):
+            return 304, reply, b""
+        range_header = headers.get("Range")
+        if range_header and headers.get("If-Range", self.etag) == self.etag:
+            span = parse_range(range_header, self.size)
+            if span is False:
+                return 416, dict(reply, **{"Content-Range": f"bytes */{self.size}"}), b""
+            if span is not None:
+                first, last = span
+                reply["Content-Range"] = f"bytes {first}-{last}/{self.size}"
+                return 206, reply, self.view[first:last + 1]
+        encoding = choose_encoding(headers.get("Accept-Encoding", ""), self.variants)
+        if encoding == "identity":
+            return 200, reply, self.view
+        reply["Content-Encoding"] = encoding
+        return 200, reply, self.variants[encoding]
+
+
+def send(handler, resume, head=False, immutable=False):
+    """
+    Answer a BaseHTTPRequestHandler GET/HEAD with the resume
+    """
+    status, headers, body = resume.respond(handler.headers, immutable)
+    handler.send_response(status)
+    for name, value in headers.items():
+        handler.send_header(name, value)
+    handler.send_header("Content-Length", str(len(body)))
+    handler.end_headers()
+    if not head and body:
+        handler.wfile.write(body)
+
+
+_resume = None
+_resume_lock = threading.Lock()
+
+
+def get_resume():
+    """
+    The RESUME_PATH file, mapped on first use (None when unset or unreadable)
+    """
+    global _resume
+    with _resume_lock:
+        if _resume is None:
+            _resume = False
+            if RESUME_PATH:
+                try:
+                    _resume = ResumeFile(RESUME_PATH)
+                except (OSError, ValueError):
+                    # ValueError: an empty file can't be mapped
+                    logger.exception("Cannot serve resume %s; linking to the hosted copy", RESUME_PATH)
+    return _resume or None
+
+
+def render_preview(path, width=PREVIEW_WIDTH):
+    """
+    PNG bytes of the first page, or None when no PDF renderer is installed
+    """
+    try:
+        import fitz  # PyMuPDF
+    except ImportError:
+        fitz = None
+    if fitz is not None:
+        with fitz.open(path) as document:
+            page = document[0]
+            zoom = width / page.rect.width
+            return page.get_pixmap(matrix=fitz.Matrix(zoom, zoom)).tobytes("png")
+    pdftoppm = shutil.which("pdftoppm")
+    if pdftoppm:
+        # Without an output root, pdftoppm writes the single page to stdout
+        result = subprocess.run(
+            [pdftoppm, "-png", "-singlefile", "-f", "1", "-l", "1", "-scale-to-x", str(width), "-scale-to-y", "-1", path],
+            capture_output=True, timeout=30,
+        )
+        if result.returncode == 0 and result.stdout:
+            return result.stdout
+    return None
+
+
+def build_preview(resume, directory=STATIC_DIR):
+    """
+    Write the preview for this PDF unless it's there already; returns its file name or None
+    """
+    name = f"resume-preview.{resume.hash[:10]}.png"
+    path = os.path.join(directory, name)
+    if not os.path.exists(path):
+        try:
+            png = render_preview(resume.path)
+        except Exception:
+            logger.exception("Could not render a preview of %s", resume.path)
+            png = None
+        if png is None:
+            return None
+        os.makedirs(directory, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(png)
+        os.replace(tmp, path)
+    for old in glob.glob(os.path.join(directory, "resume-preview.*.png")):
+        if os.path.basename(old) != name:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+    return name
+
+
+@lru_cache(maxsize=None)
+def preview_name():
+    """
+    The preview's file name in static/, rendering it once per process
+    """
+    resume = get_resume()
+    return build_preview(resume) if resume else None
+
+
+@lru_cache(maxsize=None)
+def resume_html(pdf_href=None, static_prefix=STYLESHEET_URL_PREFIX):
+    """
+    The resume row: our own PDF and its preview, or the hosted link without RESUME_PATH
+    """
+    resume = get_resume()
+    if resume is None:
+        return RESUME_HTML
+    if pdf_href is None and not RESUME_URL_PREFIX:
+        return RESUME_HTML
+    href = pdf_href or RESUME_URL_PREFIX + resume.name
+    html = (
+        '<div class="resume-row">'
+        f'<a href="{href}" target="_blank" class="resume-button">📄 View Resume</a></div>'
+    )
+    preview = preview_name()
+    if preview:
+        html += (
+            f'<div class="resume-row"><a href="{href}" target="_blank">'
+            f'<img class="resume-preview" src="{static_prefix}{preview}" alt="First page of the resume" loading="lazy"></a></div>'
+        )
+    return html
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_server(host=RESUME_HOST, port=RESUME_PORT):
+    """
+    Serve the PDF from a daemon thread, once per process (no-op without RESUME_PATH)
+    """
+    global _server
+    resume = get_resume()
+    if resume is None:
+        return None
+    with _server_lock:
+        if _server is None:
+            from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+            class ResumeHandler(BaseHTTPRequestHandler):
+                protocol_version = "HTTP/1.1"
+
+                def do_GET(self, head=False):
+                    path = self.path.split("?")[0]
+                    if path == f"/{resume.name}":
+                        return send(self, resume, head, immutable=True)
+                    if path == "/resume.pdf":
+                        return send(self, resume, head)
+                    self.send_error(404)
+
+                def do_HEAD(self):
+                    self.do_GET(head=True)
+
+                def log_message(self, format, *args):
+                    pass
+
+            try:
+                _server = ThreadingHTTPServer((host, port), ResumeHandler)
+            except OSError:
+                # Another app process already serves it
+                _server = False
+                return None
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, name="resume", daemon=True).start()
+    return _server or None
+
+
+_prepared = threading.Event()
+_background = None
+_background_lock = threading.Lock()
+
+
+def prepare():
+    """
+    Map and compress the PDF, render its preview and start its server
+    """
+    if RESUME_PATH and not RESUME_URL_PREFIX:
+        logger.warning("RESUME_PATH is set without RESUME_URL_PREFIX; linking to the hosted resume")
+    elif get_resume() is not None:
+        preview_name()
+        start_server()
+        resume_html()
+    _prepared.set()
+
+
+def start_background():
+    """
+    Run prepare() on a daemon thread, once per process
+    """
+    global _background
+    with _background_lock:
+        if _background is None:
+            def run():
+                try:
+                    prepare()
+                except Exception:
+                    logger.exception("Could not prepare the resume")
+
+            _background = threading.Thread(target=run, name="resume-prepare", daemon=True)
+            _background.start()
+
+
+def page_html():
+    """
+    The resume row for the Streamlit page: the hosted link until prepare() has finished
+    """
+    return resume_html() if _prepared.is_set() else RESUME_HTML
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the resume preview")
+    parser.add_argument("--out", default=STATIC_DIR)
+    args = parser.parse_args()
+    resume = get_resume()
+    if resume is None:
+        parser.error("set RESUME_PATH to the resume PDF")
+    variants = ", ".join(f"{encoding} {len(data)} B" for encoding, data in resume.variants.items()) or "none smaller"
+    print(f"{resume.path}: {resume.size} B, compressed: {variants}")
+    preview = build_preview(resume, args.out)
+    print(f"preview: {os.path.join(args.out, preview)}" if preview else "preview: install PyMuPDF or poppler-utils")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+State shared by every app replica on this host
+
+A single Streamlit process keeps its abuse-shield windows, duplicate
+digests and webhook rate-limit bucket in memory, which stops meaning
+anything once several replicas serve the site (portfolio.cluster): each
+would allow its own SHIELD_CLIENT_LIMIT and its own webhook burst. With
+SHARED_STATE_PATH set, those live in one WAL-mode SQLite file instead and
+every check is a short BEGIN IMMEDIATE transaction, so replicas see each
+other's writes and two of them can't both take the last slot.
+
+The delivery queue needs nothing here: the outbox is already a SQLite
+file, and workers lease rows before sending them (Outbox.claim).
+"""
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from portfolio.config import get_settings
+
+SHARED_STATE_PATH = get_settings().shared_state_path
+# Seconds between sweeps of expired rows, per process
+PRUNE_SECONDS = 60.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hits (key TEXT NOT NULL, at REAL NOT NULL);
+CREATE INDEX IF NOT EXISTS hits_key ON hits (key, at);
+CREATE INDEX IF NOT EXISTS hits_at ON hits (at);
+CREATE TABLE IF NOT EXISTS seen (digest BLOB PRIMARY KEY, at REAL NOT NULL);
+CREATE INDEX IF NOT EXISTS seen_at ON seen (at);
+CREATE TABLE IF NOT EXISTS buckets (
+    key TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated REAL NOT NULL,
+    blocked_until REAL NOT NULL
+);
+"""
+
+
+class SharedState:
+    """
+    One SQLite connection per process; transactions are serialised across processes
+    """
+
+    def __init__(self, path=SHARED_STATE_PATH, timeout=5.0):
+        self.path = path
+        self._lock = threading.Lock()
+        # timeout: how long a writer waits for another process's transaction
+        self._db = sqlite3.connect(path, timeout=timeout, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        self._pruned = 0.0
+        self.stats = {"transactions": 0, "pruned": 0}
+
+    @contextmanager
+    def transaction(self):
+        """
+        The connection inside BEGIN IMMEDIATE ... COMMIT (ROLLBACK on error)
+        """
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._db
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+            self.stats["transactions"] += 1
+
+    def prune(self, db, hits_before, seen_before):
+        """
+        Drop expired hits and digests, at most once per PRUNE_SECONDS (call inside a transaction)
+        """
+        now = time.monotonic()
+        if now - self._pruned < PRUNE_SECONDS:
+            return
+        self._pruned = now
+        removed = db.execute("DELETE FROM hits WHERE at <= ?", (hits_before,)).rowcount
+        removed += db.execute("DELETE FROM seen WHERE at <= ?", (seen_before,)).rowcount
+        self.stats["pruned"] += removed
+
+    def counts(self):
+        with self._lock:
+            return {table: self._db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                    for table in ("hits", "seen", "buckets")}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_state = None
+_state_lock = threading.Lock()
+
+
+def get_shared_state():
+    """
+    The process's connection to SHARED_STATE_PATH
+    """
+    global _state
+    with _state_lock:
+        if _state is None:
+            _state = SharedState()
+    return _state
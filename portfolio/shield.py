@@ -0,0 +1,279 @@
+"""
+Abuse shield for contact submissions
+
+Every accepted submission ends up as webhook posts, so handle_contact()
+asks the shield first and nothing it turns away touches the outbox or the
+network:
+
+- sliding-window limits: at most SHIELD_SESSION_LIMIT submissions per
+  Streamlit session and SHIELD_CLIENT_LIMIT per client address in any
+  SHIELD_WINDOW_SECONDS (0 turns a limit off)
+- duplicate suppression: a message whose normalised name, email and text
+  hash to one seen in the last SHIELD_DUPLICATE_SECONDS is dropped (0
+  turns this off)
+
+check() records the digest straight away so a double-click can't slip a
+second copy in while the first is being accepted; handle_contact() calls
+forget() when acceptance then fails, so the visitor's retry is not taken
+for a duplicate of a message that was never queued.
+
+Every table is an LRU capped at SHIELD_MAX_KEYS entries whose entries also
+expire, so a flood of distinct clients evicts the oldest instead of
+growing the process: a window is a tuple of at most `limit` timestamps
+and a duplicate entry is a 16-byte digest.
+
+With SHARED_STATE_PATH set (several replicas, see portfolio.cluster),
+SharedShield applies the same rules to tables in that SQLite file so the
+limits hold across processes.
+"""
+import hashlib
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+from portfolio.config import get_settings
+
+SESSION_LIMIT = get_settings().shield_session_limit
+CLIENT_LIMIT = get_settings().shield_client_limit
+WINDOW_SECONDS = get_settings().shield_window_seconds
+DUPLICATE_SECONDS = get_settings().shield_duplicate_seconds
+# Entries kept per table; the least recently used go first
+MAX_KEYS = get_settings().shield_max_keys
+
+# Verdicts
+SESSION = "session"
+CLIENT = "client"
+DUPLICATE = "duplicate"
+
+
+class LruTtlCache:
+    """
+    Mapping bounded by size and age; not thread-safe (the Shield locks it)
+    """
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.evicted = 0
+        self.expired = 0
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, now):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if now - entry[0] > self.ttl:
+            del self._data[key]
+            self.expired += 1
+            return None
+        return entry[1]
+
+    def put(self, key, value, now):
+        self._data[key] = (now, value)
+        self._data.move_to_end(key)
+        self._prune(now)
+
+    def discard(self, key):
+        self._data.pop(key, None)
+
+    def _prune(self, now):
+        # Entries are in touch order, so the expired ones are all at the front
+        data = self._data
+        while data:
+            key, (touched, _) = next(iter(data.items()))
+            if len(data) > self.max_size:
+                self.evicted += 1
+            elif now - touched > self.ttl:
+                self.expired += 1
+            else:
+                break
+            data.popitem(last=False)
+
+
+def normalise(text):
+    """
+    Words only: case, Unicode forms, punctuation and spacing don't count
+    """
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return " ".join(re.findall(r"\w+", text))
+
+
+def fingerprint(submission):
+    """
+    16-byte digest of the normalised name, email and message
+    """
+    parts = (normalise(submission.name), submission.email.strip().casefold(), normalise(submission.message))
+    return hashlib.blake2b("\x00".join(parts).encode(), digest_size=16).digest()
+
+
+class Shield:
+    """
+    Per-session and per-client sliding windows plus a duplicate filter
+    """
+
+    def __init__(self, session_limit=SESSION_LIMIT, client_limit=CLIENT_LIMIT, window=WINDOW_SECONDS,
+                 duplicate_seconds=DUPLICATE_SECONDS, max_keys=MAX_KEYS):
+        self.limits = {SESSION: session_limit, CLIENT: client_limit}
+        self.window = window
+        self.duplicate_seconds = duplicate_seconds
+        self._windows = {SESSION: LruTtlCache(max_keys, window), CLIENT: LruTtlCache(max_keys, window)}
+        self._seen = LruTtlCache(max_keys, duplicate_seconds)
+        self._lock = threading.Lock()
+        self.stats = {"allowed": 0, "limited_session": 0, "limited_client": 0, "duplicates": 0}
+
+    def _retry_after(self, kind, key, now):
+        """
+        Seconds until `key` may submit again, or 0 when it may now
+        """
+        limit = self.limits[kind]
+        if key is None or limit <= 0:
+            return 0.0
+        times = self._windows[kind].get(key, now) or ()
+        if len(times) < limit or now - times[0] >= self.window:
+            return 0.0
+        return self.window - (now - times[0])
+
+    def check(self, submission, session=None, client=None):
+        """
+        None when the submission may go out, else (verdict, retry-after seconds)
+
+        Only submissions let through count against the windows, so a
+        client held back by one limit doesn't use up the other.
+        """
+        now = time.monotonic()
+        digest = fingerprint(submission)
+        with self._lock:
+            for kind, key in ((SESSION, session), (CLIENT, client)):
+                wait = self._retry_after(kind, key, now)
+                if wait > 0:
+                    self.stats[f"limited_{kind}"] += 1
+                    return kind, wait
+            if self.duplicate_seconds > 0 and self._seen.get(digest, now):
+                # Refresh it: a script resending one message stays suppressed
+                self._seen.put(digest, True, now)
+                self.stats["duplicates"] += 1
+                return DUPLICATE, 0.0
+            for kind, key in ((SESSION, session), (CLIENT, client)):
+                if key is not None and self.limits[kind] > 0:
+                    windows = self._windows[kind]
+                    # The last `limit` send times, oldest first; a tuple is far
+                    # smaller than a deque, whose first block holds 64 slots
+                    times = (windows.get(key, now) or ()) + (now,)
+                    windows.put(key, times[-self.limits[kind]:], now)
+            if self.duplicate_seconds > 0:
+                self._seen.put(digest, True, now)
+            self.stats["allowed"] += 1
+        return None
+
+    def forget(self, submission):
+        """
+        Drop the submission's digest (it was let through but not accepted)
+        """
+        digest = fingerprint(submission)
+        with self._lock:
+            self._seen.discard(digest)
+
+    def snapshot(self):
+        """
+        Counters, table sizes and evictions
+        """
+        with self._lock:
+            tables = {"session": self._windows[SESSION], "client": self._windows[CLIENT], "duplicate": self._seen}
+            return dict(
+                self.stats,
+                entries={name: len(table) for name, table in tables.items()},
+                evicted={name: table.evicted for name, table in tables.items()},
+                expired={name: table.expired for name, table in tables.items()},
+            )
+
+
+class SharedShield:
+    """
+    Shield with its windows and digests in the shared-state file
+
+    Windows are rows of (key, time) and digests rows of (digest, time),
+    read and written in one transaction per check; expired rows are swept
+    periodically rather than capped by count.
+    """
+
+    def __init__(self, state, session_limit=SESSION_LIMIT, client_limit=CLIENT_LIMIT, window=WINDOW_SECONDS,
+                 duplicate_seconds=DUPLICATE_SECONDS):
+        self.state = state
+        self.limits = {SESSION: session_limit, CLIENT: client_limit}
+        self.window = window
+        self.duplicate_seconds = duplicate_seconds
+        self._lock = threading.Lock()
+        self.stats = {"allowed": 0, "limited_session": 0, "limited_client": 0, "duplicates": 0}
+
+    def _count(self, stat):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def check(self, submission, session=None, client=None):
+        """
+        None when the submission may go out, else (verdict, retry-after seconds)
+        """
+        # Wall-clock time: the rows outlive this process
+        now = time.time()
+        digest = fingerprint(submission)
+        keys = [(kind, f"{kind}:{key}") for kind, key in ((SESSION, session), (CLIENT, client))
+                if key is not None and self.limits[kind] > 0]
+        with self.state.transaction() as db:
+            self.state.prune(db, now - self.window, now - self.duplicate_seconds)
+            for kind, key in keys:
+                count, oldest = db.execute(
+                    "SELECT COUNT(*), MIN(at) FROM hits WHERE key = ? AND at > ?", (key, now - self.window),
+                ).fetchone()
+                if count >= self.limits[kind]:
+                    self._count(f"limited_{kind}")
+                    return kind, self.window - (now - oldest)
+            if self.duplicate_seconds > 0:
+                # Refreshed when seen, like the in-memory filter
+                if db.execute("UPDATE seen SET at = ? WHERE digest = ? AND at > ?",
+                              (now, digest, now - self.duplicate_seconds)).rowcount:
+                    self._count("duplicates")
+                    return DUPLICATE, 0.0
+                db.execute("INSERT OR REPLACE INTO seen (digest, at) VALUES (?, ?)", (digest, now))
+            db.executemany("INSERT INTO hits (key, at) VALUES (?, ?)", [(key, now) for _, key in keys])
+        self._count("allowed")
+        return None
+
+    def forget(self, submission):
+        """
+        Drop the submission's digest (it was let through but not accepted)
+        """
+        digest = fingerprint(submission)
+        with self.state.transaction() as db:
+            db.execute("DELETE FROM seen WHERE digest = ?", (digest,))
+
+    def snapshot(self):
+        counts = self.state.counts()
+        with self._lock:
+            return dict(self.stats, entries={"windows": counts["hits"], "duplicate": counts["seen"]},
+                        evicted={}, expired={"all": self.state.stats["pruned"]})
+
+
+_shield = None
+_shield_lock = threading.Lock()
+
+
+def get_shield():
+    """
+    The process-wide shield (shared across replicas with SHARED_STATE_PATH)
+    """
+    global _shield
+    if _shield is None:
+        with _shield_lock:
+            if _shield is None:
+                if get_settings().shared_state_path:
+                    from portfolio.shared import get_shared_state
+
+                    _shield = SharedShield(get_shared_state())
+                else:
+                    _shield = Shield()
+    return _shield
@@ -0,0 +1,330 @@
+"""
+Pluggable notification sinks with concurrent fan-out
+
+A sink delivers contact submissions somewhere (Discord, a generic JSON
+webhook, an SMTP relay). The Notifier runs every configured sink at once on
+a shared thread pool, so a slow sink never delays the others:
+
+- "first_success": a submission is done as soon as any sink accepts it
+- "all": wait for every sink; done if at least one accepted it
+
+    NOTIFY_SINKS=discord,webhook,smtp  NOTIFY_POLICY=first_success
+
+Sink targets and the policy are re-read when the settings reload (see
+portfolio.config): the next delivery uses a freshly built notifier.
+"""
+import logging
+import smtplib
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from email.message import EmailMessage
+
+from portfolio import metrics
+from portfolio.config import get_settings, on_reload
+from portfolio.discord import (
+    get_webhook_url,
+    send_discord_digest,
+    send_discord_notification,
+    send_simple_discord_notification,
+)
+from portfolio.http import CONNECT_TIMEOUT, READ_TIMEOUT, get_session
+from portfolio.resilience import Deadline, DeadlineExceeded
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_THREADS = get_settings().notify_threads
+
+POLICIES = ("first_success", "all")
+
+
+class Sink:
+    """
+    Base class: implement send(); override send_many() when a sink can batch
+    """
+    name = "sink"
+
+    def configured(self):
+        """
+        Whether the sink has a target to deliver to
+        """
+        return True
+
+    def send(self, submission, deadline=None):
+        """
+        Deliver one submission; returns (success, message)
+        """
+        raise NotImplementedError
+
+    def send_many(self, submissions, deadline=None):
+        """
+        Deliver several submissions; returns one (success, message) per submission
+        """
+        results = []
+        for submission in submissions:
+            try:
+                results.append(self.send(submission, deadline))
+            except Exception as e:
+                results.append((False, f"{self.name}: {e}"))
+        return results
+
+
+class DiscordEmbedSink(Sink):
+    name = "discord-embed"
+
+    def configured(self):
+        return bool(get_webhook_url())
+
+    def send(self, submission, deadline=None):
+        return send_discord_notification(
+            submission.name, submission.email, submission.subject, submission.message,
+            sent_at=submission.submitted_at, deadline=deadline,
+        )
+
+    def send_many(self, submissions, deadline=None):
+        if len(submissions) == 1:
+            return [self.send(submissions[0], deadline)]
+        results = []
+        for batch, success, msg in send_discord_digest(list(submissions), deadline):
+            results.extend([(success, msg)] * len(batch))
+        return results
+
+
+class DiscordPlainSink(Sink):
+    name = "discord-plain"
+
+    def configured(self):
+        return bool(get_webhook_url())
+
+    def send(self, submission, deadline=None):
+        return send_simple_discord_notification(
+            submission.name, submission.email, submission.subject, submission.message,
+            sent_at=submission.submitted_at, deadline=deadline,
+        )
+
+
+class FallbackSink(Sink):
+    """
+    Try the primary sink and hand only its failures to the fallback
+
+    Used for Discord so the embed and plain posts never both land. With a
+    deadline, the primary gets half the remaining budget and the fallback
+    whatever is left.
+    """
+
+    def __init__(self, primary, fallback, name=None):
+        self.primary = primary
+        self.fallback = fallback
+        self.name = name or f"{primary.name}+{fallback.name}"
+
+    def configured(self):
+        return self.primary.configured() or self.fallback.configured()
+
+    def send(self, submission, deadline=None):
+        return self.send_many([submission], deadline)[0]
+
+    def send_many(self, submissions, deadline=None):
+        results = self.primary.send_many(submissions, deadline and deadline.share(2))
+        failed = [i for i, (success, _) in enumerate(results) if not success]
+        if failed:
+            retried = self.fallback.send_many([submissions[i] for i in failed], deadline)
+            for i, result in zip(failed, retried):
+                results[i] = result
+        return results
+
+
+class WebhookSink(Sink):
+    """
+    POSTs each submission as plain JSON to any HTTP endpoint
+    """
+    name = "webhook"
+
+    def __init__(self, url=None):
+        self.url = get_settings().notify_webhook_url if url is None else url
+
+    def configured(self):
+        return bool(self.url)
+
+    def send(self, submission, deadline=None):
+        if not self.url:
+            return False, "Generic webhook URL not configured"
+        payload = {
+            "name": submission.name,
+            "email": submission.email,
+            "subject": submission.subject,
+            "message": submission.message,
+            "submitted_at": submission.submitted_at.isoformat(),
+        }
+        try:
+            if deadline is None:
+                response = get_session().post(self.url, json=payload)
+            else:
+                response = get_session().post(self.url, json=payload,
+                                              timeout=deadline.timeout(CONNECT_TIMEOUT, READ_TIMEOUT))
+        except Exception as e:
+            return False, f"Error sending webhook notification: {e}"
+        if 200 <= response.status_code < 300:
+            return True, "Webhook notification sent successfully!"
+        return False, f"Webhook returned status code: {response.status_code}"
+
+
+class SmtpSink(Sink):
+    """
+    Emails each submission through an SMTP relay
+    """
+    name = "smtp"
+
+    def __init__(self, host=None, port=None, sender=None, recipient=None, timeout=None):
+        settings = get_settings()
+        self.host = settings.smtp_host if host is None else host
+        self.port = settings.smtp_port if port is None else port
+        self.sender = settings.smtp_from if sender is None else sender
+        self.recipient = settings.smtp_to if recipient is None else recipient
+        self.timeout = settings.smtp_timeout if timeout is None else timeout
+
+    def configured(self):
+        return bool(self.host and self.recipient)
+
+    def send(self, submission, deadline=None):
+        return self.send_many([submission], deadline)[0]
+
+    def send_many(self, submissions, deadline=None):
+        timeout = self.timeout if deadline is None else min(self.timeout, deadline.remaining())
+        try:
+            if timeout <= 0:
+                raise DeadlineExceeded("delivery deadline exceeded")
+            with smtplib.SMTP(self.host, self.port, timeout=timeout) as smtp:
+                for submission in submissions:
+                    smtp.send_message(self.email(submission))
+        except Exception as e:
+            return [(False, f"Error sending email: {e}")] * len(submissions)
+        return [(True, "Email sent successfully!")] * len(submissions)
+
+    def email(self, submission):
+        email = EmailMessage()
+        email["From"] = self.sender
+        email["To"] = self.recipient
+        email["Reply-To"] = submission.email
+        email["Subject"] = f"Portfolio Contact: {submission.subject}"
+        email.set_content(
+            f"Name: {submission.name}\nEmail: {submission.email}\n"
+            f"Sent: {submission.submitted_at:%Y-%m-%d %H:%M:%S}\n\n{submission.message}\n"
+        )
+        return email
+
+
+def build_sink(name):
+    """
+    Sink for a NOTIFY_SINKS entry
+    """
+    if name == "discord":
+        return FallbackSink(DiscordEmbedSink(), DiscordPlainSink(), name="discord")
+    if name == "discord-embed":
+        return DiscordEmbedSink()
+    if name == "discord-plain":
+        return DiscordPlainSink()
+    if name == "webhook":
+        return WebhookSink()
+    if name == "smtp":
+        return SmtpSink()
+    raise ValueError(f"Unknown notification sink: {name!r}")
+
+
+class Notifier:
+    """
+    Runs sinks concurrently under a delivery policy
+    """
+
+    def __init__(self, sinks, policy="first_success", executor=None):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown notification policy: {policy!r}")
+        self.sinks = list(sinks)
+        self.policy = policy
+        self._executor = executor or ThreadPoolExecutor(NOTIFY_THREADS, thread_name_prefix="notify")
+
+    def configured(self):
+        """
+        Whether at least one sink can deliver; otherwise nothing should be queued
+        """
+        return any(sink.configured() for sink in self.sinks)
+
+    def notify(self, submission, deadline=None):
+        return self.notify_many([submission], deadline)[0]
+
+    def notify_many(self, submissions, deadline=None):
+        """
+        One (success, message) per submission, combined across sinks
+
+        Everything shares one Deadline (NOTIFY_DEADLINE_SECONDS by default);
+        sinks still running when it expires count as failed.
+        """
+        if not self.sinks:
+            return [(False, "No notification sinks configured")] * len(submissions)
+        deadline = deadline or Deadline()
+        futures = {self._executor.submit(self._run_sink, sink, submissions, deadline): sink for sink in self.sinks}
+        outcomes = [[] for _ in submissions]
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=deadline.remaining(), return_when=FIRST_COMPLETED)
+            if not done:
+                for future in pending:
+                    for outcome in outcomes:
+                        outcome.append((False, f"{futures[future].name}: delivery deadline exceeded"))
+                break
+            for future in done:
+                for i, result in enumerate(future.result()):
+                    outcomes[i].append(result)
+            if self.policy == "first_success" and all(any(ok for ok, _ in o) for o in outcomes):
+                # Remaining sinks finish in the background
+                break
+        return [self._combine(o) for o in outcomes]
+
+    def _run_sink(self, sink, submissions, deadline):
+        start = time.perf_counter()
+        try:
+            results = sink.send_many(submissions, deadline)
+        except Exception as e:
+            logger.exception("Notification sink %s failed", sink.name)
+            results = [(False, f"{sink.name}: {e}")] * len(submissions)
+        successes = sum(1 for ok, _ in results if ok)
+        metrics.record_sink(sink.name, time.perf_counter() - start, successes, len(results) - successes)
+        return results
+
+    @staticmethod
+    def _combine(results):
+        successes = [msg for ok, msg in results if ok]
+        if successes:
+            return True, successes[0]
+        return False, "; ".join(msg for _, msg in results)
+
+
+_notifier = None
+_notifier_lock = threading.Lock()
+
+
+def get_notifier():
+    """
+    The process-wide notifier built from NOTIFY_SINKS / NOTIFY_POLICY
+    """
+    global _notifier
+    with _notifier_lock:
+        if _notifier is None:
+            settings = get_settings()
+            _notifier = Notifier([build_sink(name) for name in settings.notify_sinks], settings.notify_policy)
+    return _notifier
+
+
+NOTIFIER_SETTINGS = ("notify_sinks", "notify_policy", "notify_webhook_url", "smtp_host", "smtp_port", "smtp_from",
+                     "smtp_to", "smtp_timeout")
+
+
+@on_reload
+def _rebuild_notifier(old, new):
+    """
+    Drop the notifier when its settings change; in-flight sends finish on the
+    old one, whose idle threads exit once it is garbage collected
+    """
+    global _notifier
+    if any(getattr(old, name) != getattr(new, name) for name in NOTIFIER_SETTINGS):
+        with _notifier_lock:
+            _notifier = None
@@ -0,0 +1,149 @@
+"""
+Inverted index from skill tags to the entries that use them
+
+Every experience entry and project gets an integer id when the content is
+loaded, and each skill maps to a bitset of ids held in one Python int:
+bit i is set when entry i lists the skill. An AND query is a chain of `&`,
+an OR query a chain of `|`, so a question like "Python and AWS" costs a
+couple of big-int operations however many entries there are. Ids are
+handed out section by section, so each section is one contiguous run of
+bits and its matches come out as positions in that section's tuple.
+
+Skills match case-insensitively; the first spelling seen is the label.
+When the content file is edited in place, only the edited entries' bits
+move; adding or removing entries renumbers the ids, so that rebuilds.
+"""
+import copy
+import threading
+from functools import reduce
+
+from portfolio.content import load_content, on_change
+
+# Content sections with skill tags, in id order
+SECTIONS = ("experience", "projects")
+
+
+class SkillIndex:
+    """
+    Skill -> bitset of entry ids, built once per content object
+    """
+
+    def __init__(self, sections):
+        self.spans = {}
+        self.labels = {}
+        postings = {}
+        next_id = 0
+        for kind, items in sections.items():
+            self.spans[kind] = (next_id, len(items))
+            for item in items:
+                bit = 1 << next_id
+                for skill in item.skills:
+                    key = skill.casefold()
+                    self.labels.setdefault(key, skill)
+                    postings[key] = postings.get(key, 0) | bit
+                next_id += 1
+        self.size = next_id
+        self.postings = postings
+        self.skills = tuple(sorted(self.labels.values(), key=str.casefold))
+
+    def bits(self, skill):
+        return self.postings.get(skill.casefold(), 0)
+
+    def query(self, skills, match_any=False):
+        """
+        Bitset of the entries with all (or, with match_any, any) of the skills
+        """
+        if not skills:
+            return 0
+        if match_any:
+            return reduce(int.__or__, map(self.bits, skills), 0)
+        result = (1 << self.size) - 1
+        for skill in skills:
+            result &= self.bits(skill)
+            if not result:
+                break
+        return result
+
+    def positions(self, bits, kind):
+        """
+        Indexes into the `kind` section of the entries set in bits, in order
+        """
+        first, count = self.spans[kind]
+        section = (bits >> first) & ((1 << count) - 1)
+        if not section:
+            return []
+        # Lowest bit first; str.find walks the set bits in C instead of one Python step per entry
+        digits = bin(section)[:1:-1]
+        found = []
+        index = digits.find("1")
+        while index != -1:
+            found.append(index)
+            index = digits.find("1", index + 1)
+        return found
+
+    def count(self, bits):
+        return bin(bits).count("1")
+
+    def updated(self, changes):
+        """
+        A copy with the changed entries re-indexed, or None if entries were added or removed
+        """
+        postings = dict(self.postings)
+        labels = dict(self.labels)
+        for kind, items in changes.items():
+            if kind not in self.spans:
+                continue
+            first, _ = self.spans[kind]
+            for position, previous, item in items:
+                if previous is None or item is None:
+                    return None
+                bit = 1 << (first + position)
+                for key in {skill.casefold() for skill in previous.skills}:
+                    postings[key] &= ~bit
+                    if not postings[key]:
+                        del postings[key], labels[key]
+                for skill in item.skills:
+                    key = skill.casefold()
+                    labels.setdefault(key, skill)
+                    postings[key] = postings.get(key, 0) | bit
+        index = copy.copy(self)
+        index.postings = postings
+        index.labels = labels
+        index.skills = tuple(sorted(labels.values(), key=str.casefold))
+        return index
+
+
+def build_index(content):
+    return SkillIndex({kind: getattr(content, kind) for kind in SECTIONS})
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_skill_index(content=None):
+    """
+    The index over `content` (default: the current content), rebuilt only
+    when the content object changes
+
+    Pass the content whose sections the positions will index: a reload
+    between two load_content() calls would otherwise pair them with another.
+    """
+    global _index
+    content = load_content() if content is None else content
+    index = _index
+    if index is None or index[0] is not content:
+        with _index_lock:
+            if _index is None or _index[0] is not content:
+                _index = (content, build_index(content))
+            index = _index
+    return index[1]
+
+
+@on_change
+def _update(old, new, changes):
+    global _index
+    with _index_lock:
+        if _index is not None and _index[0] is old:
+            index = _index[1].updated(changes)
+            _index = (new, index if index is not None else build_index(new))
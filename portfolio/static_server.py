@@ -0,0 +1,152 @@
+"""
+Server for the static export plus a minimal contact endpoint
+
+Serves the bundle built by portfolio.export from memory, with ETag /
+If-None-Match revalidation, precompressed br/gzip variants chosen from
+Accept-Encoding, and long-lived caching for fingerprinted assets.
+POST /contact takes the static page's form (or JSON) and hands it to the
+same code path as the Streamlit form (portfolio.api.handle_contact).
+With RESUME_PATH set, /resume.pdf is served memory-mapped with Range
+support (portfolio.resume).
+
+    python -m portfolio.static_server dist --port 8000
+"""
+import argparse
+import html
+import json
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from portfolio import resume
+from portfolio.api import MAX_BODY_BYTES, handle_contact, parse_fields
+from portfolio.assets import choose_encoding
+
+
+def load_bundle(directory):
+    """
+    Manifest entries with every variant read into memory
+    """
+    with open(os.path.join(directory, "manifest.json")) as f:
+        manifest = json.load(f)
+    bundle = {}
+    for path, entry in manifest.items():
+        bodies = {}
+        for encoding, file in entry["encodings"].items():
+            with open(os.path.join(directory, file.lstrip("/")), "rb") as f:
+                bodies[encoding] = f.read()
+        bundle[path] = dict(entry, bodies=bodies)
+    return bundle
+
+
+def result_page(result):
+    if result["ok"]:
+        body = "<h2>✅ Thank you for your message!</h2><p>I'll get back to you soon, typically within 24 hours.</p>"
+    elif "mailto" in result:
+        body = (
+            f"<h2>⚠️ Discord notification failed</h2><p>{html.escape(result['error'])}.</p>"
+            f'<p><a href="{html.escape(result["mailto"])}">📧 Send Email</a> instead.</p>'
+        )
+    else:
+        body = f"<h2>⚠️ {html.escape(result['error'])}</h2>"
+    return (
+        '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>Deven Bhasin - Portfolio</title></head>'
+        f'<body style="font-family: sans-serif; text-align: center; padding: 3rem;">{body}'
+        '<p><a href="/">← Back to the portfolio</a></p></body></html>'
+    )
+
+
+class StaticHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as separate writes; don't let Nagle hold the body
+    disable_nagle_algorithm = True
+    bundle = {}
+
+    def do_GET(self):
+        self._serve(head=False)
+
+    def do_HEAD(self):
+        self._serve(head=True)
+
+    def _serve(self, head):
+        path = self.path.split("?", 1)[0]
+        if path == "/resume.pdf" and resume.get_resume() is not None:
+            return resume.send(self, resume.get_resume(), head)
+        entry = self.bundle.get("/index.html" if path == "/" else path)
+        if entry is None:
+            return self._reply(404, b"Not found", "text/plain; charset=utf-8")
+        headers = {
+            "ETag": entry["etag"],
+            "Vary": "Accept-Encoding",
+            "Cache-Control": "public, max-age=31536000, immutable" if entry["immutable"] else "no-cache",
+        }
+        if entry["etag"] in self.headers.get("If-None-Match", ""):
+            return self._reply(304, b"", None, headers)
+        encoding = choose_encoding(self.headers.get("Accept-Encoding", ""), entry["bodies"])
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        self._reply(200, entry["bodies"][encoding], entry["content_type"], headers, head)
+
+    def do_POST(self):
+        if self.path.split("?", 1)[0] != "/contact":
+            return self._reply(404, b"Not found", "text/plain; charset=utf-8")
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            return self._reply(400, b"Malformed Content-Length", "text/plain; charset=utf-8")
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            return self._reply(413, b"Request body too large", "text/plain; charset=utf-8")
+        raw = self.rfile.read(length)
+        wants_json = self.headers.get("Content-Type", "").startswith("application/json")
+        try:
+            fields = parse_fields(raw, self.headers.get("Content-Type", ""))
+        except (ValueError, UnicodeDecodeError):
+            return self._reply(400, b"Malformed request body", "text/plain; charset=utf-8")
+        status, result = handle_contact(fields, client=self.client_address[0])
+        headers = {"Retry-After": str(result["retry_after"])} if status == 429 else None
+        if wants_json:
+            self._reply(status, json.dumps(result).encode(), "application/json", headers)
+        else:
+            self._reply(status, result_page(result).encode(), "text/html; charset=utf-8", headers)
+
+    def _reply(self, status, body, content_type, headers=None, head=False):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def make_server(directory, host="127.0.0.1", port=8000):
+    handler = type("Handler", (StaticHandler,), {"bundle": load_bundle(directory)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the static export with a /contact endpoint")
+    parser.add_argument("directory", nargs="?", default="dist")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+    server = make_server(args.directory, args.host, args.port)
+    print(f"Serving {args.directory} on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
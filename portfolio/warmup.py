@@ -0,0 +1,147 @@
+"""
+Cold-start warm-up
+
+The page itself only needs Streamlit plus the content modules; everything
+behind a submit (requests, the outbox, the sinks) is imported on first use.
+Two hooks keep that first use off the visitor's clock:
+
+- start_background(): called by app.py once the first page has rendered;
+  imports the delivery path and builds the HTTP session on a daemon thread
+  (STARTUP_WARMUP=0 turns it off)
+- python -m portfolio.warmup --url http://127.0.0.1:8501: run right after
+  `streamlit run app.py` to open one headless session, so the server has
+  imported the app and filled its caches before the first visitor connects
+"""
+import argparse
+import asyncio
+import logging
+import threading
+import time
+import urllib.request
+
+from portfolio.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+SECTIONS = ("metrics", "experience", "projects", "skills", "education")
+
+
+def build_caches():
+    """
+    The stylesheet build, content model and skill index, every rendered
+    section, the repository metadata fetches the project cards will want,
+    and the resume's compressed variants and preview
+    """
+    from portfolio import resume
+    from portfolio.assets import stylesheet_href
+    from portfolio.content import load_content
+    from portfolio.render import render_section
+    from portfolio.repos import prefetch
+    from portfolio.skill_index import get_skill_index
+
+    stylesheet_href()
+    content = load_content()
+    get_skill_index()
+    prefetch(content.projects)
+    for kind in SECTIONS:
+        render_section(kind, getattr(content, kind))
+    resume.prepare()
+
+
+def import_notifier():
+    """
+    Everything a submit needs: delivery worker, sinks, outbox and HTTP session
+    """
+    from portfolio.delivery import get_delivery_worker
+    from portfolio.http import get_session
+    from portfolio.sinks import get_notifier
+
+    get_session()
+    get_notifier()
+    get_delivery_worker()
+
+
+def warm_up(notifier=True):
+    """
+    Run the warm-up steps in-process; returns seconds per step
+    """
+    timings = {}
+    steps = [("caches", build_caches)] + ([("notifier", import_notifier)] if notifier else [])
+    for name, step in steps:
+        start = time.perf_counter()
+        step()
+        timings[name] = time.perf_counter() - start
+    return timings
+
+
+_started = False
+_started_lock = threading.Lock()
+
+
+def start_background():
+    """
+    Warm the submit path on a daemon thread, once per process
+    """
+    global _started
+    if not get_settings().startup_warmup:
+        return
+    with _started_lock:
+        if _started:
+            return
+        _started = True
+
+    def run():
+        try:
+            logger.info("Warm-up finished: %s", warm_up())
+        except Exception:
+            logger.exception("Warm-up failed")
+
+    threading.Thread(target=run, name="warmup", daemon=True).start()
+
+
+async def _visit(url):
+    import websockets
+    from streamlit.proto.BackMsg_pb2 import BackMsg
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+    stream = url.replace("http", "ws", 1).rstrip("/") + "/_stcore/stream"
+    async with websockets.connect(stream, max_size=None) as ws:
+        message = BackMsg()
+        message.rerun_script.query_string = ""
+        message.rerun_script.page_script_hash = ""
+        await ws.send(message.SerializeToString())
+        while True:
+            forward = ForwardMsg()
+            forward.ParseFromString(await ws.recv())
+            if forward.WhichOneof("type") == "script_finished":
+                return
+
+
+def visit(url, wait=30.0):
+    """
+    Wait for a Streamlit server to come up, then run the script once headlessly
+    """
+    deadline = time.monotonic() + wait
+    while True:
+        try:
+            urllib.request.urlopen(url.rstrip("/") + "/_stcore/health", timeout=2)
+            break
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+    start = time.perf_counter()
+    asyncio.run(asyncio.wait_for(_visit(url), wait))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm a freshly started Streamlit server")
+    parser.add_argument("--url", default="http://127.0.0.1:8501")
+    parser.add_argument("--wait", type=float, default=30.0, help="seconds to wait for the server")
+    args = parser.parse_args()
+    print(f"warm-up run took {visit(args.url, args.wait) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()